@@ -5,7 +5,13 @@ from src.phone_interface import PhoneInterface
 from src.audio_engine import AudioEngine
 from src.music_engine import MusicEngine
 from src.brain import Brain
-from src.config import DECADE_PLAYLISTS, DECADE_VOICES
+from src.prefetch import SpeculativePrefetcher
+from src.timer_scheduler import TimerScheduler
+from src.events import session_cancelled
+from src.phrase_bank import PhraseBank, phrase
+from src.intro_pool import IntroPool
+from src.intent_classifier import timer_command
+from src.config import DECADE_VOICES, PHRASE_BANK_ENABLED, INTRO_POOL_ENABLED, PREFETCH_PLAYLIST_WAIT
 
 # System State
 current_language = "EN" # EN or CZ
@@ -19,6 +25,24 @@ print("Initializing Brain...")
 brain = Brain()
 print("Initializing Music Engine...")
 music = MusicEngine()
+# Ready-made host intros, refilled while nobody is on the line
+intro_pool = IntroPool(brain, audio, is_idle=lambda: phone is not None and not phone.is_off_hook,
+                       language=lambda: current_language) if INTRO_POOL_ENABLED else None
+prefetcher = SpeculativePrefetcher(brain, music, intro_pool)
+timers = TimerScheduler()
+
+def session_alive():
+    """False once the caller hung up or dialed something else (checked by long flows)."""
+    if session_cancelled():
+        return False
+    return not (phone and not phone.is_off_hook)
+
+def play_if_alive(start, *args, **kwargs):
+    """Start music unless this session is over: a pre-empted one must not replace what the new dial plays."""
+    if not session_alive():
+        print("   (Session over: not starting music)")
+        return False
+    return start(*args, **kwargs)
 
 def on_hook_change(is_off_hook):
     if is_off_hook:
@@ -31,22 +55,27 @@ def on_hook_change(is_off_hook):
         except Exception as e:
             print(f"   (Pause Error: {e})")
 
-        # SAFETY: Ensure Handset Audio is free before playing Dial Tone
-        audio.stop_audio()
-        time.sleep(0.2) 
-
-        # Always Play Dial Tone
-        audio.play_sound("dial_tone", block=False)
+        # Always Play Dial Tone (replaces whatever the handset was playing)
+        audio.stop_audio(ready_for="dial_tone")
+        audio.play_sound("dial_tone", loop=True) # Until a number is dialed, however long that takes
     else:
         print("\n📞 HANDSET REPLACED")
+        prefetcher.cancel()
         # Stop Handset Audio (Host/DialTone), but KEEP MUSIC PLAYING (Radio Mode)
         print("   (Silencing handset...)")
         audio.stop_audio()
         # music.pause() # DISABLED for Continuous Playback
 
+def on_dial_prefix(digits):
+    # Partial number: start intro/playlist work before the last digit lands
+    prefetcher.on_prefix(digits, current_language)
+
 def on_dial_complete(number):
     global current_language, current_year
     print(f"\n🔢 DIALED: {number}")
+
+    # Take over (or drop) speculative work started while dialing
+    speculative = prefetcher.commit(number, current_language)
     
     # Stop Dial Tone if it's playing
     audio.stop_audio()
@@ -54,12 +83,10 @@ def on_dial_complete(number):
     # --- LANGUAGE TOGGLE (9) ---
     if number == 9:
         op_voice = DECADE_VOICES["OPERATOR"]
-        if current_language == "EN":
-            current_language = "CZ"
-            audio.speak("Switching to Czech Mode.", voice_id=op_voice['id'], voice_settings=op_voice['settings'], model_id=op_voice['model'])
-        else:
-            current_language = "EN"
-            audio.speak("Přepínám do angličtiny.", voice_id=op_voice['id'], voice_settings=op_voice['settings'], model_id=op_voice['model'])
+        announcement = phrase("switch_language", current_language)
+        current_language = "CZ" if current_language == "EN" else "EN"
+        audio.set_language(current_language)
+        audio.speak(announcement, voice_id=op_voice['id'], voice_settings=op_voice['settings'], model_id=op_voice['model'])
         print(f"   >>> LANGUAGE SET TO: {current_language}")
         return
 
@@ -79,42 +106,39 @@ def on_dial_complete(number):
         audio.play_sound("click")
         
         op_voice = DECADE_VOICES["OPERATOR"]
-        intro_text = "Operator here. How may I help?" if current_language == "EN" else "Tady centrála. Jak vám mohu pomoci?"
-        audio.speak(intro_text, voice_id=op_voice['id'], voice_settings=op_voice['settings'], model_id=op_voice['model'])
+        intro_text = phrase("operator_intro", current_language)
+        audio.speak(intro_text, voice_id=op_voice['id'], voice_settings=op_voice['settings'], model_id=op_voice['model'], barge_in=True)
         
         while True: # Interaction Loop
             # HANGUP CHECK
-            if phone and not phone.is_off_hook:
+            if not session_alive():
                  print("   (Operator: Hung up)")
                  break
 
             query = audio.listen(duration=8)
             
             # HANGUP CHECK (Post-listen)
-            if phone and not phone.is_off_hook:
+            if not session_alive():
                  print("   (Operator: Hung up)")
                  break
 
             if query:
                 print(f"   User asked: {query}")
                 
-                # INTENT CHECK (Added for Music Support)
-                intent = brain.classify_intent(query)
-                print(f"   🧠 Intent Classified: {intent}")
+                # INTENT, SEARCH QUERY AND CONFIRMATION (one round trip)
+                # Operator context is usually 1950, but for music, we might want to respect the user's era or just default.
+                # Using 1950 for Operator persona consistency.
+                request = brain.interpret_request(query, 1950, current_language)
+                print(f"   🧠 Intent Classified: {request.intent}")
                 
-                if intent == "MUSIC":
+                if request.intent == "MUSIC":
                     print("   (Operator: Music request detected...)")
-                    
-                    # 1. GET SEARCH QUERY
-                    # Operator context is usually 1950, but for music, we might want to respect the user's era or just default.
-                    # Using 1950 for Operator persona consistency.
-                    search_query, search_type = brain.get_music_search_query(query, 1950, current_language)
+                    search_query, search_type = request.search_query, request.search_type
                     
                     if search_query:
-                        # 2. SMART CONFIRMATION
-                        confirm_txt = brain.get_dj_confirmation(1950, search_query, current_language)
+                        # SMART CONFIRMATION
                         try:
-                            audio.speak(confirm_txt, voice_id=op_voice['id'], voice_settings=op_voice['settings'], model_id=op_voice['model'])
+                            audio.speak(request.confirmation, voice_id=op_voice['id'], voice_settings=op_voice['settings'], model_id=op_voice['model'], barge_in=True)
                         except: pass
                         
                         # 3. CORRECTION WINDOW
@@ -122,14 +146,14 @@ def on_dial_complete(number):
                         if correction and len(correction) > 2:
                             negatives = ["no", "stop", "wait", "wrong", "ne", "špatně"]
                             if any(w in correction.lower() for w in negatives):
-                                apology = "Apologies. Who did you want?" if current_language == "EN" else "Omlouvám se. Koho?"
-                                audio.speak(apology, voice_id=op_voice['id'], voice_settings=op_voice['settings'], model_id=op_voice['model'])
+                                apology = phrase("operator_apology", current_language)
+                                audio.speak(apology, voice_id=op_voice['id'], voice_settings=op_voice['settings'], model_id=op_voice['model'], barge_in=True)
                                 new_q = audio.listen(duration=5)
                                 if new_q:
-                                    search_query, search_type = brain.get_music_search_query(new_q, 1950, current_language)
+                                    request = brain.interpret_request(new_q, 1950, current_language, music=True)
+                                    search_query, search_type = request.search_query, request.search_type
                                     # Re-confirm
-                                    confirm_txt = brain.get_dj_confirmation(1950, search_query, current_language)
-                                    audio.speak(confirm_txt, voice_id=op_voice['id'], voice_settings=op_voice['settings'], model_id=op_voice['model'])
+                                    audio.speak(request.confirmation, voice_id=op_voice['id'], voice_settings=op_voice['settings'], model_id=op_voice['model'])
 
                         # 4. EXECUTE PLAY
                         print(f"   (Operator Search: {search_query} | Type: {search_type})")
@@ -139,20 +163,20 @@ def on_dial_complete(number):
                         # We just need to map types correctly.
                         
                         if search_type == "TRACK":
-                            music.search_and_play(search_query, type='track')
+                            play_if_alive(music.search_and_play, search_query, type='track')
                         elif search_type == "ALBUM":
-                            music.search_and_play(search_query, type='album')
+                            play_if_alive(music.search_and_play, search_query, type='album')
                         elif search_type == "ARTIST":
-                            music.search_and_play(search_query, type='artist')
+                            play_if_alive(music.search_and_play, search_query, type='artist')
                         else:
-                            music.search_and_play(search_query, type='playlist')
+                            play_if_alive(music.search_and_play, search_query, type='playlist')
                             
                         return # Exit Operator
                 
-                response = brain.ask_operator(query, language=current_language)
-                audio.speak(response, voice_id=op_voice['id'], voice_settings=op_voice['settings'], model_id=op_voice['model'])
+                response = brain.ask_operator_stream(query, language=current_language)
+                audio.speak_stream(response, voice_id=op_voice['id'], voice_settings=op_voice['settings'], model_id=op_voice['model'], barge_in=True)
             else:
-                 audio.speak("I didn't hear anything. Disconnecting." if current_language == "EN" else "Nemohu vás momentálně spojit.",
+                 audio.speak(phrase("operator_no_input", current_language),
                              voice_id=op_voice['id'], voice_settings=op_voice['settings'], model_id=op_voice['model'])
                  break
         return
@@ -191,41 +215,46 @@ def on_dial_complete(number):
 
             # Get Voice Data (Dict)
             print(f"   (Selecting Voice for {target_year}...)")
-            voice_data = brain.get_voice_for_year(target_year)
-            
-            # Static (Threaded to cover latency)
-            print("   (Playing Time Travel Static...)")
-            stop_static = threading.Event()
-            
-            def play_static_loop():
-                # Loop static until event is set
-                while not stop_static.is_set():
-                    audio.play_sound("static_long", block=True)
-            
-            # Start static in background
-            static_thread = threading.Thread(target=play_static_loop, daemon=True)
-            static_thread.start()
-            
-            # Host Intro (Latency here)
-            print("   (Generating Host Intro...)")
-            intro = brain.get_host_intro(target_year, language=current_language)
-            
-            # Stop Static & Speak
-            stop_static.set()
-            audio.stop_audio()
-            time.sleep(0.5)
-            
-            print(f"   HOST SAYS: {intro}")
-            audio.speak(intro, voice_id=voice_data['id'], voice_settings=voice_data['settings'], model_id=voice_data['model'], year=target_year)
+            voice_data = speculative.get("voice") or brain.get_voice_for_year(target_year)
+
+            pooled = intro_pool.take(target_year, current_language) if intro_pool else None
+            if pooled:
+                # Written and rendered for this decade while the phone was idle: no wait at all
+                print("   (Using Pooled Host Intro)")
+                intro = pooled.text
+                if session_alive():
+                    brain.start_host_session(intro)
+                print(f"   HOST SAYS: {intro}")
+                audio.speak(intro, voice_id=voice_data['id'], voice_settings=voice_data['settings'], model_id=voice_data['model'], year=target_year, barge_in=True, rendered=pooled.pcm)
+            elif speculative.get("intro"):
+                # Written while the last digit was still being dialed
+                print("   (Using Prefetched Host Intro)")
+                intro = speculative["intro"]
+                if session_alive():
+                    brain.start_host_session(intro)
+                print(f"   HOST SAYS: {intro}")
+                audio.speak(intro, voice_id=voice_data['id'], voice_settings=voice_data['settings'], model_id=voice_data['model'], year=target_year, barge_in=True)
+            else:
+                # Static (gapless loop in the mixer, covers latency)
+                print("   (Playing Time Travel Static...)")
+                audio.play_sound("static_long", loop=True)
+                
+                # Host Intro, spoken while it is written; the static stops at the first word
+                print("   (Generating Host Intro...)")
+                intro_stream = brain.get_host_intro_stream(target_year, language=current_language)
+                intro = audio.speak_stream(intro_stream, voice_id=voice_data['id'], voice_settings=voice_data['settings'], model_id=voice_data['model'], year=target_year, barge_in=True)
+                audio.stop_audio() # Static is still looping if nothing was said (hung up)
+                print(f"   HOST SAYS: {intro}")
             
             # Interactive Conversation Loop
             in_chat_mode = True
             music_query = None
+            music_request = None
             last_host_response = intro # Keep track of context
 
             while in_chat_mode:
                 # HANGUP CHECK
-                if phone and not phone.is_off_hook:
+                if not session_alive():
                     print("   (Host: Hung up)")
                     break
 
@@ -233,7 +262,7 @@ def on_dial_complete(number):
                 cmd = audio.listen(duration=8) 
                 
                 # HANGUP CHECK (Post-listen)
-                if phone and not phone.is_off_hook:
+                if not session_alive():
                     print("   (Host: Hung up)")
                     break
 
@@ -245,31 +274,31 @@ def on_dial_complete(number):
                     
                 print(f"   User said: {cmd}")
                 
-                # Check intent with AI (Semantic Understanding)
-                intent = brain.classify_intent(cmd)
-                print(f"   🧠 Intent Classified: {intent}")
+                # Check intent with AI (Semantic Understanding); a music request comes back
+                # with its search query and confirmation from the same call
+                request = brain.interpret_request(cmd, target_year, current_language)
+                print(f"   🧠 Intent Classified: {request.intent}")
                 
-                if intent == "MUSIC":
+                if request.intent == "MUSIC":
                     print("   (Music request detected. Exiting chat...)")
-                    
-                    # DIRECT SEARCH (Smart Brain handles context now)
-                    print("   (Passing request to Smart Brain...)")
                     music_query = cmd
+                    music_request = request
                         
                     start_music = True
                     break
                 
                 # Otherwise, treat as a chat question
                 print("   (Chatting with Host...)")
-                response = brain.chat_with_host(cmd, target_year, language=current_language)
+                response_stream = brain.chat_with_host_stream(cmd, target_year, language=current_language)
+                response = audio.speak_stream(response_stream, voice_id=voice_data['id'], voice_settings=voice_data['settings'], model_id=voice_data['model'], year=target_year, barge_in=True)
                 last_host_response = response
-                audio.speak(response, voice_id=voice_data['id'], voice_settings=voice_data['settings'], model_id=voice_data['model'], year=target_year)
                 # Loop continues...
         else:
             # --- DIRECT PLAY (SHORTCUT) ---
             print(f"   (Direct Play: Skipping Host for {target_year}s)")
             start_music = True
             music_query = None
+            music_request = None
 
             # Optional: Play short static even for shortcuts?
             # audio.play_sound("static_short") 
@@ -278,18 +307,18 @@ def on_dial_complete(number):
             music_started = False
             
             # 1. Smart Search (if specific request)
-            if music_query and len(music_query) > 2:
+            if music_request and len(music_query) > 2:
                 print(f"   (Detected Specific Request: '{music_query}')")
                 
-                # A. GET SEARCH QUERY FIRST
-                search_query, search_type = brain.get_music_search_query(music_query, target_year, current_language)
+                # A. SEARCH QUERY (already extracted with the intent)
+                search_query, search_type = music_request.search_query, music_request.search_type
                 
-                # B. GENERATE SPECIFIC CONFIRMATION (Reassuring Loop)
-                # Use the extracted query (e.g. "The Beatles") so the host sounds accurate
-                confirm_txt = brain.get_dj_confirmation(target_year, search_query or music_query, current_language)
+                # B. SPECIFIC CONFIRMATION (Reassuring Loop)
+                # Written for the extracted query (e.g. "The Beatles") so the host sounds accurate
                 try:
-                    print(f"   HOST CONFIRMS: {confirm_txt}")
-                    audio.speak(confirm_txt, voice_id=voice_data['id'], voice_settings=voice_data['settings'], model_id=voice_data['model'], year=target_year)
+                    if music_request.confirmation: # Empty for "any music" (the fixed phrase below)
+                        print(f"   HOST CONFIRMS: {music_request.confirmation}")
+                        audio.speak(music_request.confirmation, voice_id=voice_data['id'], voice_settings=voice_data['settings'], model_id=voice_data['model'], year=target_year, barge_in=True)
                 except Exception as e:
                     print(f"   Confirmation Error: {e}")
 
@@ -302,10 +331,10 @@ def on_dial_complete(number):
                     negatives = ["no", "stop", "wait", "wrong", "not that", "change", "ne", "špatně", "počkej"]
                     if any(w in correction.lower() for w in negatives):
                         print(f"   (Correction Detected: '{correction}')")
-                        apology = "Apologies. Who did you want to hear?" if current_language == "EN" else "Omlouvám se. Koho chcete slyšet?"
+                        apology = phrase("host_apology", current_language)
                         
                         try:
-                            audio.speak(apology, voice_id=voice_data['id'], voice_settings=voice_data['settings'], model_id=voice_data['model'], year=target_year)
+                            audio.speak(apology, voice_id=voice_data['id'], voice_settings=voice_data['settings'], model_id=voice_data['model'], year=target_year, barge_in=True)
                         except: pass
                         
                         # Listen for the correction
@@ -313,12 +342,12 @@ def on_dial_complete(number):
                         if new_query:
                             print(f"   (New Query: '{new_query}')")
                             music_query = new_query
-                            # Re-parse once:
-                            search_query, search_type = brain.get_music_search_query(music_query, target_year, current_language)
+                            # Re-parse once (query and confirmation together):
+                            music_request = brain.interpret_request(music_query, target_year, current_language, music=True)
+                            search_query, search_type = music_request.search_query, music_request.search_type
                             # Re-confirm briefly
-                            confirm_txt = brain.get_dj_confirmation(target_year, search_query or music_query, current_language)
                             try:
-                                audio.speak(confirm_txt, voice_id=voice_data['id'], voice_settings=voice_data['settings'], model_id=voice_data['model'], year=target_year)
+                                audio.speak(music_request.confirmation, voice_id=voice_data['id'], voice_settings=voice_data['settings'], model_id=voice_data['model'], year=target_year)
                             except: pass
                 
                 if search_query:
@@ -326,31 +355,30 @@ def on_dial_complete(number):
                      
                      # Prioritize based on AI Classification
                      if search_type == "TRACK":
-                         if music.search_and_play(search_query, type='track'):
+                         if play_if_alive(music.search_and_play, search_query, type='track'):
                              music_started = True
-                         elif music.search_and_play(search_query, type='playlist'):
+                         elif play_if_alive(music.search_and_play, search_query, type='playlist'):
                              music_started = True
                      elif search_type == "ALBUM":
-                         if music.search_and_play(search_query, type='album'):
+                         if play_if_alive(music.search_and_play, search_query, type='album'):
                              music_started = True
-                         elif music.search_and_play(search_query, type='playlist'):
+                         elif play_if_alive(music.search_and_play, search_query, type='playlist'):
                              music_started = True
                      elif search_type == "ARTIST":
-                         if music.search_and_play(search_query, type='artist'):
+                         if play_if_alive(music.search_and_play, search_query, type='artist'):
                              music_started = True
-                         elif music.search_and_play(search_query, type='playlist'):
+                         elif play_if_alive(music.search_and_play, search_query, type='playlist'):
                              music_started = True
                      elif search_type == "PLAYLIST":
                          # Default/Playlist priority
-                         if music.search_and_play(search_query, type='playlist'):
+                         if play_if_alive(music.search_and_play, search_query, type='playlist'):
                              music_started = True
-                         elif music.search_and_play(search_query, type='track'):
+                         elif play_if_alive(music.search_and_play, search_query, type='track'):
                              music_started = True
                      
                      if not music_started:
                          print("   (Specific Search Failed.)")
-                         fail_txt = "I couldn't find that specific record, so here is the radio instead."
-                         if current_language == "CZ": fail_txt = "Tu skladbu nemohu najít, ale pustím vám rádio."
+                         fail_txt = phrase("record_not_found", current_language)
                          
                          try:
                              audio.speak(fail_txt, voice_id=voice_data['id'], voice_settings=voice_data['settings'], model_id=voice_data['model'], year=target_year)
@@ -359,24 +387,33 @@ def on_dial_complete(number):
                 elif search_type == "DEFAULT":
                      print("   (Generic Request -> Playing Default Era Playlist)")
                      # Host confirms generic request
-                     confirm_txt = "Coming right up!" if current_language == "EN" else "Už to hraje!"
+                     confirm_txt = phrase("coming_up", current_language)
                      audio.speak(confirm_txt, voice_id=voice_data['id'], voice_settings=voice_data['settings'], model_id=voice_data['model'], year=target_year)
                      # music_started remains False, so it falls through to Era Playlist
 
             # 2. Fallback to Era Playlist
-            if not music_started:
+            if not music_started and session_alive():
                 decade_key = int(str(target_year)[:3] + "0")
-                playlists = DECADE_PLAYLISTS.get(decade_key)
+
+                # Resolved while dialing? Otherwise resolve now ('search:' entries are cached).
+                if "playlist" in speculative:
+                    uri, query = speculative["playlist"]
+                else:
+                    uri, query = None, None
+                    if "playlist_future" in speculative:
+                        try:
+                            uri, query = speculative["playlist_future"].result(timeout=PREFETCH_PLAYLIST_WAIT)
+                        except Exception as e:
+                            print(f"   (Prefetched playlist not ready: {e or 'timeout'})")
+                    if uri is None and query is None:
+                        uri, query = music.get_decade_playlist(decade_key, current_language)
                 
-                if playlists:
-                    uri = playlists.get(current_language, playlists["EN"])
+                if uri:
                     print(f"   >>> PLAYING DEFAULT ERA PLAYLIST: {uri}")
-                    
-                    if uri.startswith("search:"):
-                        query = uri.replace("search:", "").strip()
-                        music.search_and_play(query, type='playlist')
-                    else:
-                        music.play_playlist(uri)
+                    play_if_alive(music.play_playlist, uri)
+                elif query:
+                    print(f"   >>> PLAYING DEFAULT ERA PLAYLIST: search:{query}")
+                    play_if_alive(music.search_and_play, query, type='playlist')
                 else:
                     print(f"   (No playlist found for {decade_key}s)")
         
@@ -395,13 +432,28 @@ def handle_timer_mode():
     # 1. Intro
     # audio.SPEAK_lock.acquire() # Locked internally by speak now? No, but let's be safe or just call speak. 
     # Actually speak() handles locking usually.
-    audio.speak("Timer mode. How long should I set it for?", voice_id=op_voice['id'], voice_settings=op_voice['settings'], model_id=op_voice['model'])
+    audio.speak(phrase("timer_intro", current_language), voice_id=op_voice['id'], voice_settings=op_voice['settings'], model_id=op_voice['model'], barge_in=True)
     
     # 2. Listen
     user_text = audio.listen(duration=5)
     
     if not user_text:
-        audio.speak("I didn't hear a duration. Timer cancelled.", voice_id=op_voice['id'], voice_settings=op_voice['settings'], model_id=op_voice['model'])
+        audio.speak(phrase("timer_no_input", current_language), voice_id=op_voice['id'], voice_settings=op_voice['settings'], model_id=op_voice['model'])
+        return
+
+    # 2b. Manage existing timers ("cancel my timers", "how many timers?")
+    command = timer_command(user_text)
+    if command == "CANCEL":
+        count = timers.cancel_all()
+        audio.speak(phrase("timers_cancelled", current_language, count=count), voice_id=op_voice['id'], voice_settings=op_voice['settings'], model_id=op_voice['model'])
+        return
+    if command == "LIST":
+        pending = timers.list()
+        if pending:
+            msg = phrase("timers_pending", current_language, count=len(pending), seconds=int(pending[0]['remaining']))
+        else:
+            msg = phrase("timer_none", current_language)
+        audio.speak(msg, voice_id=op_voice['id'], voice_settings=op_voice['settings'], model_id=op_voice['model'])
         return
 
     # 3. Parse
@@ -409,34 +461,42 @@ def handle_timer_mode():
     
     if seconds:
         print(f"⏰ Setting Timer: {seconds}s")
-        audio.speak(f"Setting timer for {seconds} seconds.", voice_id=op_voice['id'], voice_settings=op_voice['settings'], model_id=op_voice['model'])
-        
-        # 4. Start Thread
-        def timer_callback():
-            print(f"⏰ TIMER EXPIRED ({seconds}s)")
-            phone.ring_bell(duration=2.0)
+        audio.speak(phrase("timer_set", current_language, seconds=seconds), voice_id=op_voice['id'], voice_settings=op_voice['settings'], model_id=op_voice['model'])
         
-        t = threading.Timer(seconds, timer_callback)
-        t.daemon = True # Ensure it dies if app dies
-        t.start()
+        # 4. Schedule (persisted, survives restarts; rings via the "ring" action)
+        timers.add(seconds, action="ring", label=user_text)
         
     else:
-        audio.speak("I couldn't understand the time. Please try again.", voice_id=op_voice['id'], voice_settings=op_voice['settings'], model_id=op_voice['model'])
+        audio.speak(phrase("timer_not_understood", current_language), voice_id=op_voice['id'], voice_settings=op_voice['settings'], model_id=op_voice['model'])
 
 def main():
     print("========================================")
     print("      TIME TRAVEL RADIO - v1.0")
     print("========================================")
     
+    audio.set_language(current_language)
+
     # --- HARDWARE SETUP ---
     global phone
     phone = PhoneInterface(
         on_hook_change=on_hook_change,
-        on_dial_complete=on_dial_complete
+        on_dial_complete=on_dial_complete,
+        on_dial_prefix=on_dial_prefix,
+        on_preempt=audio.interrupt # Hang-up / re-dial cuts the running conversation's audio
     )
-    # Start the GPIO polling thread
+    # Start the GPIO sampling thread (and the event dispatcher that runs the callbacks)
     phone.start_interface()
 
+    # Timers (666) ring the bell; pending ones were restored from disk
+    timers.register("ring", lambda timer: phone.ring_bell(duration=2.0))
+    timers.start()
+
+    # Pre-render fixed lines while nobody is on the line
+    if PHRASE_BANK_ENABLED:
+        PhraseBank(audio, is_idle=lambda: not phone.is_off_hook).start()
+    if intro_pool:
+        intro_pool.start()
+
     print("SYSTEM READY. Lift handset to begin.")
     
     # --- MAIN LOOP ---
@@ -449,9 +509,8 @@ def main():
             
     except KeyboardInterrupt:
         print("\nStopping...")
-        phone.cleanup()
-        music.stop()
-        GPIO.cleanup()
+        phone.cleanup() # Also releases GPIO
+        music.pause()
 
 if __name__ == "__main__":
     main()
@@ -1,10 +1,40 @@
 import os
+import io
 import time
+import queue
+import threading
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from openai import OpenAI
 from elevenlabs.client import ElevenLabs
-from elevenlabs import save, VoiceSettings
-from .config import OPENAI_API_KEY, ELEVENLABS_API_KEY, AUDIO_DEVICE_ID, DEFAULT_VOLUME, DECADE_EFFECTS
+from elevenlabs import VoiceSettings
+from .config import OPENAI_API_KEY, ELEVENLABS_API_KEY, AUDIO_DEVICE_ID, DEFAULT_VOLUME
+from .config import TTS_STREAMING, TTS_STREAM_FORMAT, TTS_SAMPLE_RATE, TTS_PIPELINE, TTS_WORKERS
+from .config import VAD_FRAME_MS, VAD_ONSET_TIMEOUT, STT_SEGMENTED, STT_WORKERS
+from .config import BARGE_IN_ENABLED, BARGE_IN_COUPLING_DB, BARGE_IN_HANDOFF_MAX
+from .config import MIXER_BUFFER_PERIODS
+from .events import session_cancelled, bind_session
+from .vintage_fx import build_presets, decade_preset
+from .tts_cache import TTSCache
+from .mixer import Mixer, load_wav
+from .tone_synth import ToneSynth
+from .vad import StreamingVAD, MicCapture, wait_capture_free
+from .stt import SegmentedTranscriber
+from .speech_text import split_sentences, TextChunker
+from .barge_in import BargeInMonitor
+
+# Mixer channel per sound (default: "tone"). Effects briefly mute tones; speech mutes both.
+SOUND_CHANNELS = {"click": "fx", "static_short": "fx"}
+
+# Fixed sleeps the old per-sound process path needed before these steps (seconds).
+# stop_audio(ready_for=...) waits for the real device state instead and reports the difference.
+# (Static hands over to the host inside speak_stream: the speech stream mutes it at the first word.)
+LEGACY_SLEEPS = {"dial_tone": 0.2, "listen": 0.5}
+
+class _StreamNotStarted(Exception):
+    """Streaming TTS failed before any audio reached the handset."""
+
 
 class AudioEngine:
     def __init__(self):
@@ -12,177 +42,640 @@ class AudioEngine:
         self.openai_client = OpenAI(api_key=OPENAI_API_KEY)
         self.eleven_client = ElevenLabs(api_key=ELEVENLABS_API_KEY)
         
-        # Audio Process Tracking
-        self.current_process = None
+        # Audio Process Tracking (playback goes through the mixer)
+        self.capture_process = None
         
         # Paths
         self.sounds_dir = os.path.join(os.path.dirname(__file__), "../sounds")
         if not os.path.exists(self.sounds_dir):
             os.makedirs(self.sounds_dir)
             
-        self.temp_audio_path = "/tmp/retro_temp_audio.wav"
-        self.temp_speech_path = "/tmp/retro_tts.mp3"
-        self.temp_processed_path = "/tmp/retro_tts_processed.mp3"
+        # Speech-to-text (segments upload in parallel; language is a prompt hint for Whisper)
+        self.stt_executor = ThreadPoolExecutor(max_workers=STT_WORKERS)
+        self.language = None
+        self.stt_calls = 0
+        self.stt_skipped = 0 # Whisper calls avoided by the speech-presence gate
+
+        # Persistent output stream; sounds are decoded into memory once
+        self.mixer = Mixer(rate=TTS_SAMPLE_RATE)
+        self.mixer.preload(self.sounds_dir)
+        self.mixer.start()
+        self.tones = ToneSynth(TTS_SAMPLE_RATE) # Dial tone, static, clicks: generated live
+
+        # Device readiness waits since the last report: [(step, seconds waited)]
+        self.turn_waits = []
+        self.total_saved = 0.0
+        self.reported_underruns = 0
+
+        # Decade FX chains (filter kernels are computed once, here)
+        self.fx_presets = build_presets(TTS_SAMPLE_RATE)
+        self.tts_cache = TTSCache()
+
+        # Sentence pipeline: later sentences of a line render here while the first plays
+        self.tts_executor = ThreadPoolExecutor(max_workers=TTS_WORKERS)
+        self.ttfa = {"whole": [], "pipelined": [], "cached": [], "streamed": []} # Time to first audio per path (seconds)
+        self._utterance = None # (path, start time) until the line's first audio is written
+
+        # Barge-in: mic monitor of the line being spoken, and a barged-in turn waiting for listen()
+        self.barge_monitor = None
+        self.barge_pending = None
+        self.echo_coupling_db = BARGE_IN_COUPLING_DB # Learned per handset, carried across lines
+        self.barge_ins = 0
+
+    def set_language(self, language):
+        """Current UI language ("EN"/"CZ"), a hint for Whisper (forced only with STT_FORCE_LANGUAGE)."""
+        self.language = language
+
+    def stop_audio(self, ready_for=None):
+        """
+        Stop any currently playing audio (sound effects/speech initiated by this engine). Takes effect within one mixer period.
+        :param ready_for: Next step (a LEGACY_SLEEPS key). Waits until the devices are actually ready for it.
+        """
+        self.mixer.stop()
+        if ready_for:
+            self._wait_ready(ready_for)
+
+    def _wait_ready(self, step):
+        start = time.monotonic()
+        if step == "listen":
+            # The mic must not hear the tail of the last sound, and the capture device must be closed
+            self.mixer.wait_drained()
+            wait_capture_free()
+        # Playback after playback: the mixer switches sources at the next period, nothing to wait for
+        self.turn_waits.append((step, time.monotonic() - start))
+
+    def turn_report(self):
+        """Print (and reset) how long this turn waited for devices vs the old fixed sleeps, and mixer underruns."""
+        underruns = self.mixer.underruns
+        if underruns > self.reported_underruns:
+            print(f"   ⚠️ Mixer underruns: {underruns - self.reported_underruns} this turn, {underruns} total "
+                  f"({self.mixer.period} frames x {MIXER_BUFFER_PERIODS} periods; raise MIXER_PERIOD/MIXER_BUFFER_PERIODS)")
+            self.reported_underruns = underruns
+        if not self.turn_waits:
+            return 0.0
+        waited = sum(w for _, w in self.turn_waits)
+        legacy = sum(LEGACY_SLEEPS.get(step, 0.0) for step, _ in self.turn_waits)
+        saved = legacy - waited
+        self.total_saved += saved
+        steps = ", ".join(f"{step} {w * 1000:.0f} ms" for step, w in self.turn_waits)
+        print(f"   (Device waits: {steps} | fixed sleeps {legacy:.1f}s -> saved {saved:.2f}s, {self.total_saved:.1f}s total)")
+        self.turn_waits = []
+        return saved
 
-    def stop_audio(self):
-        """Stop any currently playing audio (sound effects/music initiated by this engine)."""
-        if self.current_process:
+    def interrupt(self):
+        """Cut playback AND an in-progress recording (session pre-empted by hang-up/re-dial)."""
+        self.stop_audio()
+        self._drop_barge_in()
+        proc = self.capture_process
+        if proc:
             try:
-                self.current_process.terminate()
-                try:
-                    self.current_process.wait(timeout=2) # Ensure process acts on the signal
-                except subprocess.TimeoutExpired:
-                    self.current_process.kill() # Force kill if stubborn
-                self.current_process = None
+                proc.terminate()
             except Exception as e:
-                print(f"Error stopping audio: {e}")
+                print(f"Error stopping capture: {e}")
 
-    def play_sound(self, sound_name, block=False):
+    def play_sound(self, sound_name, block=False, loop=False):
         """
-        Play a sound effect.
+        Play a sound effect (synthesized live, else a preloaded wav from sounds/).
         :param block: If True, wait for sound to finish. If False, play in background.
+        :param loop: Repeat gaplessly until stop_audio() (never combine with block).
         """
-        path = os.path.join(self.sounds_dir, f"{sound_name}.wav")
-        if os.path.exists(path):
-            self._play_file(path, block=block)
+        if session_cancelled():
+            return
+        channel = SOUND_CHANNELS.get(sound_name, "tone")
+        if sound_name in self.tones:
+            playback = self.mixer.play_generator(channel, self.tones.source(sound_name, loop=loop))
+        elif sound_name in self.mixer.sounds:
+            playback = self.mixer.play(channel, sound_name, loop=loop)
         else:
-            print(f"Warning: Sound {sound_name} not found at {path}")
+            print(f"Warning: Sound {sound_name} not found in {self.sounds_dir}")
+            return
+        if block and not loop:
+            self._wait(playback)
 
-    def speak(self, text, voice_id="JBFqnCBsd6RMkjVDRZzb", voice_settings=None, model_id="eleven_turbo_v2_5", year=None):
+    def speak(self, text, voice_id="JBFqnCBsd6RMkjVDRZzb", voice_settings=None, model_id="eleven_turbo_v2_5", year=None,
+              barge_in=False, rendered=None):
+        """
+        Say a line (blocking).
+        :param barge_in: Keep the mic open; if the caller talks over the line it stops at once
+                         and what they say is returned by the next listen(). Use it only when a
+                         listen() follows. Off with BARGE_IN_ENABLED = False.
+        :param rendered: The line's finished audio, if it was made ahead (intro pool): no TTS at all.
+        """
+        if session_cancelled():
+            return # Caller hung up or re-dialed; this session must stay silent
         print(f"🗣️ Speaking: {text}")
         self.stop_audio() # Stop any background sounds
+        self._drop_barge_in() # Left over from a line nobody listened after
+
+        if barge_in and BARGE_IN_ENABLED:
+            self._start_barge_in()
+        try:
+            if rendered:
+                print("   (Pre-rendered line)")
+                if not self._barged():
+                    self._play_pcm(rendered)
+            else:
+                self._speak(text, voice_id, voice_settings, model_id, year)
+        finally:
+            self._release_barge_in()
+
+    def _speak(self, text, voice_id, voice_settings, model_id, year):
+        sentences = split_sentences(text) if TTS_PIPELINE else [text]
+        cache_key = self.cache_key(text, voice_id, voice_settings, model_id, year)
+        # Multi-sentence lines are cached per sentence; a whole-line entry only exists from the phrase bank
+        cached = self.tts_cache.get(cache_key) if len(sentences) == 1 else self.tts_cache.load(cache_key)
+        if cached is not None:
+            stats = self.tts_cache.stats()
+            print(f"   (TTS cache hit | {stats['hits']} hits, {stats['misses']} misses)")
+            if not self._barged():
+                self._play_pcm(cached)
+            return
         
         try:
-            # Prepare Settings Object if provided
-            v_settings = None
-            if voice_settings:
-                v_settings = VoiceSettings(
-                    stability=voice_settings.get('stability', 0.5),
-                    similarity_boost=voice_settings.get('similarity_boost', 0.75),
-                    style=voice_settings.get('style', 0.0),
-                    use_speaker_boost=True
-                )
-
-            # Generate Audio
-            audio_generator = self.eleven_client.text_to_speech.convert(
-                text=text,
-                voice_id=voice_id,
-                model_id=model_id,
-                voice_settings=v_settings
-            )
-            save(audio_generator, self.temp_speech_path)
-            
-            # Post-Production (SoX)
-            final_path = self.temp_speech_path
-            if year:
-                 final_path = self._apply_vintage_effects(self.temp_speech_path, self.temp_processed_path, year)
+            v_settings = self._voice_settings(voice_settings)
+
+            if len(sentences) > 1:
+                self._utterance = ("pipelined", time.monotonic())
+                self._speak_pipelined(sentences, voice_id, voice_settings, v_settings, model_id, year)
+                return
+
+            self._utterance = ("whole", time.monotonic())
+            if TTS_STREAMING:
+                try:
+                    pcm = self._speak_stream(text, voice_id, v_settings, model_id, year)
+                    if pcm:
+                        self.tts_cache.put(cache_key, pcm)
+                    return
+                except _StreamNotStarted as e:
+                    print(f"   (Streaming TTS unavailable: {e}. Synthesizing the whole clip.)")
 
-            self._play_file(final_path, block=True) # Speak is always blocking
+            pcm = self._synthesize(text, voice_id, v_settings, model_id, year)
+            self.tts_cache.put(cache_key, pcm)
+            if not self._barged():
+                self._first_audio()
+                self._play_pcm(pcm) # Speak is always blocking
             
         except Exception as e:
             print(f"❌ TTS Error: {e}")
-            os.system(f"espeak '{text}'")
+            self._espeak(text)
+        finally:
+            self._utterance = None
 
-    def _apply_vintage_effects(self, input_path, output_path, year):
-        """Apply SoX effects based on the decade."""
-        effects = DECADE_EFFECTS.get(year)
-        if not effects:
-            return input_path # No effects for this year
-            
-        print(f"   🎛️ Applying FX ({year}): {effects}")
-        # Command: AUDIODRIVER=alsa sox input.mp3 output.mp3 <effects>
-        # Note: sox needs libsox-fmt-mp3 for mp3 support
-        cmd = f"AUDIODRIVER=alsa sox '{input_path}' '{output_path}' {effects}"
-        
+    def _speak_pipelined(self, sentences, voice_id, voice_settings, v_settings, model_id, year):
+        """
+        One TTS request per sentence. The first streams into the handset while the
+        others render on the TTS pool; they are appended to the same playback strictly
+        in order, so there is no gap between sentences. Each sentence is cached on its own.
+        """
+        print(f"   (TTS pipeline: {len(sentences)} sentences)")
+        keys = [self.cache_key(t, voice_id, voice_settings, model_id, year) for t in sentences]
+        jobs = [self.tts_executor.submit(self._render_sentence, t, key, voice_id, v_settings, model_id, year)
+                for t, key in zip(sentences[1:], keys[1:])]
+        stream = self.mixer.open_stream("speech")
+        interrupted = lambda: session_cancelled() or stream.stopped or self._barged()
         try:
-            res = os.system(cmd)
-            if res == 0:
-                return output_path
-            else:
-                print("   ❌ SoX failed (check if installed). Playing raw.")
-                return input_path
+            pcm = self.tts_cache.get(keys[0])
+            if pcm is not None and self._utterance:
+                self._utterance = ("cached", self._utterance[1]) # Not a pipeline timing
+            if pcm is None and TTS_STREAMING:
+                try:
+                    pcm, complete = self._stream_into(stream, sentences[0], voice_id, v_settings, model_id, year)
+                    if complete:
+                        self.tts_cache.put(keys[0], pcm)
+                    pcm = None # Already written
+                except _StreamNotStarted as e:
+                    print(f"   (Streaming TTS unavailable: {e}. Synthesizing the whole sentence.)")
+                    pcm = self._render_sentence(sentences[0], keys[0], voice_id, v_settings, model_id, year)
+            elif pcm is None:
+                pcm = self._render_sentence(sentences[0], keys[0], voice_id, v_settings, model_id, year)
+            if pcm and not interrupted():
+                self._first_audio()
+                stream.write(pcm)
+
+            for number, job in enumerate(jobs, 2):
+                if interrupted():
+                    break
+                try:
+                    pcm = job.result()
+                except Exception as e:
+                    print(f"   (Sentence {number} failed: {e})")
+                    continue
+                if interrupted():
+                    break
+                self._first_audio()
+                stream.write(pcm)
+        finally:
+            for job in jobs:
+                job.cancel()
+            stream.close()
+        if interrupted():
+            stream.stop()
+        self._wait(stream)
+
+    def speak_stream(self, text_stream, voice_id="JBFqnCBsd6RMkjVDRZzb", voice_settings=None, model_id="eleven_turbo_v2_5",
+                     year=None, barge_in=False):
+        """
+        Say a reply while the model is still writing it (blocking). text_stream yields text
+        pieces (Brain.*_stream); they are cut into chunks at sentence ends and clause breaks
+        (TextChunker), each chunk is synthesized as soon as it is complete and played in order.
+        Whatever plays on lower channels (static while waiting) keeps going until the first word.
+        Returns the full reply text (what arrived before a barge-in or hang-up cut it off,
+        after which the stream is closed). barge_in: as in speak().
+        """
+        if session_cancelled():
+            return ""
+        self._drop_barge_in()
+        if barge_in and BARGE_IN_ENABLED:
+            self._start_barge_in()
+        try:
+            self._speak_chunks(text_stream, voice_id, voice_settings, model_id, year)
+        finally:
+            self._release_barge_in()
+            self._utterance = None
+        return getattr(text_stream, "text", "").strip()
+
+    def _speak_chunks(self, text_stream, voice_id, voice_settings, model_id, year):
+        """
+        The first chunk streams into the handset like a single sentence; later ones render on
+        the TTS pool while earlier ones play (as in _speak_pipelined) and are appended in order.
+        """
+        v_settings = self._voice_settings(voice_settings)
+        self._utterance = ("streamed", time.monotonic())
+        stream = self.mixer.open_stream("speech", exclusive=True)
+        interrupted = lambda: session_cancelled() or stream.stopped or self._barged()
+        chunks = queue.Queue() # (text, cache key, TTS pool job or None for the first chunk); None = end
+        jobs = []
+
+        def produce():
+            chunker = TextChunker()
+            first = True
+            def queue_chunk(text):
+                nonlocal first
+                print(f"🗣️ Speaking: {text}")
+                key = self.cache_key(text, voice_id, voice_settings, model_id, year)
+                job = None
+                if not first:
+                    job = self.tts_executor.submit(self._render_sentence, text, key, voice_id, v_settings, model_id, year)
+                    jobs.append(job)
+                first = False
+                chunks.put((text, key, job))
+            try:
+                for piece in text_stream:
+                    if interrupted():
+                        return
+                    for text in chunker.feed(piece):
+                        queue_chunk(text)
+                rest = chunker.flush()
+                if rest:
+                    queue_chunk(rest)
+            except Exception as e:
+                print(f"❌ Reply Stream Error: {e}")
+            finally:
+                try:
+                    text_stream.close() # Cut off: the reply still ends (history keeps what was said)
+                except Exception as e:
+                    print(f"❌ Reply Stream Error: {e}")
+                chunks.put(None)
+
+        producer = threading.Thread(target=bind_session(produce), daemon=True) # on_done sees a pre-empted session
+        producer.start()
+        played = False
+        try:
+            while True:
+                item = chunks.get()
+                if item is None or interrupted():
+                    break
+                text, key, job = item
+                try:
+                    if job is None:
+                        pcm = self._first_chunk(stream, text, key, voice_id, v_settings, model_id, year)
+                    else:
+                        pcm = job.result()
+                except Exception as e:
+                    print(f"   (Chunk failed: {e})")
+                    continue
+                if pcm is None:
+                    played = True # Streamed straight into the handset
+                    continue
+                if interrupted():
+                    break
+                self._first_audio()
+                stream.write(pcm)
+                played = True
+        finally:
+            for job in jobs:
+                job.cancel()
+            stream.close()
+        if interrupted():
+            stream.stop()
+        self._wait(stream)
+        producer.join(timeout=1.0) # Let an interrupted reply close before the caller moves on
+        if not played and not interrupted() and getattr(text_stream, "text", "").strip():
+            self._espeak(text_stream.text) # No TTS at all: at least say it
+
+    def _first_chunk(self, stream, text, cache_key, voice_id, v_settings, model_id, year):
+        """Audio for the first chunk of a streamed reply, or None if it was streamed into `stream` already."""
+        pcm = self.tts_cache.get(cache_key)
+        if pcm is None and TTS_STREAMING:
+            try:
+                pcm, complete = self._stream_into(stream, text, voice_id, v_settings, model_id, year)
+                if complete:
+                    self.tts_cache.put(cache_key, pcm)
+                return None
+            except _StreamNotStarted as e:
+                print(f"   (Streaming TTS unavailable: {e}. Synthesizing the whole chunk.)")
+        if pcm is None:
+            pcm = self._render_sentence(text, cache_key, voice_id, v_settings, model_id, year)
+        return pcm
+
+    def _render_sentence(self, text, cache_key, voice_id, v_settings, model_id, year):
+        """Processed audio for one sentence: from the cache, else synthesized and cached (TTS pool)."""
+        pcm = self.tts_cache.get(cache_key)
+        if pcm is None:
+            pcm = self._synthesize(text, voice_id, v_settings, model_id, year, verbose=False)
+            self.tts_cache.put(cache_key, pcm)
+        return pcm
+
+    def _first_audio(self):
+        """Record time to first audio for the line being spoken (once per line)."""
+        if self._utterance is None:
+            return
+        path, start = self._utterance
+        self._utterance = None
+        ttfa = time.monotonic() - start
+        self.ttfa[path].append(ttfa)
+        averages = ", ".join(f"{p} {sum(v) / len(v) * 1000:.0f} ms ({len(v)})" for p, v in self.ttfa.items() if v)
+        print(f"   (TTS first audio after {ttfa * 1000:.0f} ms, {path} | avg {averages})")
+
+    def _espeak(self, text):
+        """Offline fallback voice: espeak's wav comes back over a pipe and plays through the mixer."""
+        try:
+            result = subprocess.run(["espeak", "--stdout", text], capture_output=True, timeout=10, check=True)
+            samples = load_wav(io.BytesIO(result.stdout), self.mixer.rate)
         except Exception as e:
-            print(f"   ❌ SoX Error: {e}")
-            return input_path
+            print(f"❌ espeak Error: {e}")
+            return
+        if not self._barged() and not session_cancelled():
+            self._wait(self.mixer.play("speech", samples))
 
-    def listen(self, duration=15):
+    def _start_barge_in(self):
+        transcriber = SegmentedTranscriber(self.openai_client, self.stt_executor, self.language)
+        self.barge_monitor = BargeInMonitor(self.mixer, transcriber, lambda: self.mixer.stop("speech"),
+                                            coupling_db=self.echo_coupling_db)
+        self.barge_monitor.start()
+
+    def _barged(self):
+        """True once the caller has talked over the line being spoken."""
+        monitor = self.barge_monitor
+        return monitor is not None and monitor.barged
+
+    def _release_barge_in(self):
+        """Line finished: close the mic, or keep the barged-in turn for listen()."""
+        monitor, self.barge_monitor = self.barge_monitor, None
+        if monitor is None:
+            return
+        self.echo_coupling_db = monitor.coupling_db
+        if monitor.release():
+            self.barge_ins += 1
+            self.barge_pending = monitor
+
+    def _drop_barge_in(self):
+        for monitor in (self.barge_monitor, self.barge_pending):
+            if monitor:
+                monitor.stop()
+        self.barge_monitor = self.barge_pending = None
+
+    def _take_barge_in(self):
+        """The barged-in turn for this listen(), or None (none, or stale)."""
+        monitor, self.barge_pending = self.barge_pending, None
+        if monitor and monitor.finished and time.monotonic() - monitor.end_t > BARGE_IN_HANDOFF_MAX:
+            return None
+        return monitor
+
+    def render(self, text, voice_id="JBFqnCBsd6RMkjVDRZzb", voice_settings=None, model_id="eleven_turbo_v2_5", year=None, pin=False):
         """
-        Smart Listening (VAD):
-        - recording starts when you speak (noise > 1%)
-        - recording stops when you stop (silence > 2.0s)
-        - failsafe timeout of 15s
+        Synthesize a line into the TTS cache without playing it (phrase bank).
+        Returns "cached" if it was already there, "rendered" if it was just made, None on error.
+        pin=True also keeps the audio in memory.
         """
-        self.stop_audio() # Silence before listening
-        time.sleep(0.5) # Give the audio card a moment to release (Race Condition Fix)
+        cache_key = self.cache_key(text, voice_id, voice_settings, model_id, year)
+        pcm = self.tts_cache.load(cache_key)
+        status = "cached"
+        if pcm is None:
+            try:
+                pcm = self._synthesize(text, voice_id, self._voice_settings(voice_settings), model_id, year, verbose=False)
+            except Exception as e:
+                print(f"   (Render failed for '{text}': {e})")
+                return None
+            self.tts_cache.put(cache_key, pcm)
+            status = "rendered"
+        if pin:
+            self.tts_cache.pin(cache_key, pcm)
+        return status
 
-        print("👂 Listening (Smart VAD)...")
-        
-        # VAD Command using SoX
-        # 1. silence 1 0.1 1%  -> Remove silence at start until 0.1s of sound > 1%
-        # 2. 1 2.0 1%          -> Stop recording after 2.0s of silence < 1%
-        # timeout 15           -> Hard limit to prevent hanging
-        
-        # Explicitly force AUDIODRIVER=alsa to hush Jack errors
-        # Fix: AUDIODRIVER=alsa must be BEFORE timeout or passed via env to work
-        cmd = (
-            f"AUDIODRIVER=alsa timeout {duration} sox -q -t alsa plughw:{AUDIO_DEVICE_ID},0 "
-            f"{self.temp_audio_path} silence 1 0.1 1% 1 2.0 1%"
+    def cache_key(self, text, voice_id, voice_settings, model_id, year):
+        fx = self._fx_preset(year)
+        return self.tts_cache.key(text, voice_id, voice_settings, model_id, fx.spec if fx else "", TTS_STREAM_FORMAT)
+
+    def _voice_settings(self, voice_settings):
+        """VoiceSettings object from a DECADE_VOICES settings dict (None if not given)."""
+        if not voice_settings:
+            return None
+        return VoiceSettings(
+            stability=voice_settings.get('stability', 0.5),
+            similarity_boost=voice_settings.get('similarity_boost', 0.75),
+            style=voice_settings.get('style', 0.0),
+            use_speaker_boost=True
         )
-        
-        res = os.system(cmd) 
-        
-        # Check if file exists and has size (timeout might kill it without creating valid header sometimes)
-        if not os.path.exists(self.temp_audio_path) or os.path.getsize(self.temp_audio_path) < 100:
-             # If SoX failed or timed out with just silence, we might get an empty/truncated file.
-             return ""
 
-        # Proceed to Transcribe...
+    def _synthesize(self, text, voice_id, v_settings, model_id, year, verbose=True):
+        """Whole clip as processed PCM (no streaming, no playback)."""
+        audio_generator = self.eleven_client.text_to_speech.convert(
+            text=text,
+            voice_id=voice_id,
+            model_id=model_id,
+            voice_settings=v_settings,
+            output_format=TTS_STREAM_FORMAT
+        )
+        pcm = b"".join(audio_generator)
+
+        # Post-Production (in-process FX)
+        fx = self._fx_stream(year, verbose=verbose)
+        if fx:
+            pcm = fx.process_pcm16(pcm) + fx.flush_pcm16()
+        return pcm
 
-        print("📝 Transcribing...")
+    def _speak_stream(self, text, voice_id, v_settings, model_id, year):
+        """
+        Play TTS while it downloads (see _stream_into) on a fresh speech playback.
+        Raises _StreamNotStarted if nothing was played, so speak() can fall back.
+        Blocking, like the whole-clip path. Returns the processed audio if it played
+        to the end (for the cache), else None.
+        """
+        stream = self.mixer.open_stream("speech")
         try:
-            with open(self.temp_audio_path, "rb") as audio_file:
-                transcription = self.openai_client.audio.transcriptions.create(
-                    model="whisper-1", 
-                    file=audio_file,
-                    prompt="User is speaking to a radio host about music, news, life, or the year. The language is likely English or Czech.",
-                    language=None # Auto-detect
-                )
-            text = transcription.text.strip()
-            
-            # Anti-Hallucination Filters (Whisper bugs on silence)
-            hallucinations = [
-                "ご視聴ありがとうございました", 
-                "Thanks for watching", 
-                "MBC", 
-                "Amara.org"
-            ]
-            if any(h in text for h in hallucinations) or len(text) < 2:
-                print(f"   (Filtered Hallucination: '{text}')")
-                return ""
-
-            print(f"   You said: '{text}'")
-            return text
+            pcm, complete = self._stream_into(stream, text, voice_id, v_settings, model_id, year)
+        except _StreamNotStarted:
+            stream.stop()
+            raise
+        finally:
+            stream.close()
+        if session_cancelled() or self._barged():
+            stream.stop()
+        self._wait(stream)
+
+        if complete and not stream.stopped and not session_cancelled():
+            return pcm
+        return None
+
+    def _stream_into(self, stream, text, voice_id, v_settings, model_id, year):
+        """
+        One streaming TTS request into an open mixer playback (left open): raw PCM
+        chunks run through the decade FX in-process and are written as they arrive.
+        Raises _StreamNotStarted if nothing was written. Returns (processed audio, complete);
+        complete is False if the download broke off or playback was stopped.
+        """
+        try:
+            chunks = self.eleven_client.text_to_speech.stream(
+                text=text,
+                voice_id=voice_id,
+                model_id=model_id,
+                voice_settings=v_settings,
+                output_format=TTS_STREAM_FORMAT
+            )
         except Exception as e:
-            print(f"❌ STT Error: {e}")
+            raise _StreamNotStarted(e)
+        fx = self._fx_stream(year)
+
+        total = 0
+        played = []
+        try:
+            for chunk in chunks:
+                if session_cancelled() or stream.stopped or self._barged():
+                    return b"".join(played), False # Hung up / interrupted / talked over: stop downloading too
+                if not chunk:
+                    continue
+                if not total:
+                    self._first_audio()
+                out = fx.process_pcm16(chunk) if fx else chunk
+                stream.write(out)
+                played.append(out)
+                total += len(chunk)
+            if fx and total:
+                out = fx.flush_pcm16() # Reverb/filter tail
+                stream.write(out)
+                played.append(out)
+        except Exception as e:
+            if not total:
+                raise _StreamNotStarted(e)
+            print(f"   (TTS stream broke after {total} bytes: {e})") # Don't replay what was heard
+            return b"".join(played), False
+
+        if not total and not session_cancelled() and not self._barged():
+            raise _StreamNotStarted("no audio received")
+        return b"".join(played), bool(total)
+
+    def _play_pcm(self, pcm):
+        """Play in-memory TTS-format PCM on the speech channel (blocking)."""
+        self._wait(self.mixer.play("speech", np.frombuffer(pcm[:len(pcm) - len(pcm) % 2], dtype="<i2")))
+
+    def _wait(self, playback):
+        """Block until a mixer playback ends (or the mixer thread died)."""
+        while not playback.wait(0.5):
+            if not self.mixer.is_alive():
+                print("❌ Mixer is not running")
+                return
+
+    def _fx_preset(self, year):
+        """VintageFX chain for this year's decade, or None (no year / raw decade)."""
+        return self.fx_presets.get(decade_preset(year))
+
+    def _fx_stream(self, year, verbose=True):
+        """Fresh FX processor for one utterance, or None."""
+        fx = self._fx_preset(year)
+        if fx:
+            if verbose:
+                print(f"   🎛️ FX {decade_preset(year)}: {fx.spec}")
+            return fx.stream()
+        return None
+
+    def listen(self, duration=15):
+        """
+        Smart Listening (VAD, in-process on a live capture stream):
+        - recording starts when you speak (adaptive noise floor, see src/vad.py)
+        - recording stops VAD_HANGOVER after you stop
+        - gives up after VAD_ONSET_TIMEOUT if nobody speaks
+        - `duration` is the hard cap for the whole turn
+        If the caller barged in on the last line, that capture (already running) is the turn.
+        """
+        if session_cancelled():
             return ""
+        barge = self._take_barge_in()
+        if barge:
+            print(f"👂 Listening (barged in, {barge.vad.speech_seconds:.1f}s captured so far)...")
+            vad, transcriber, start = barge.vad, barge.transcriber, barge.start_t
+            self.capture_process = barge.capture # interrupt() still ends it on hang-up
+            barge.join(duration)
+            barge.stop()
+            self.capture_process = None
+            return self._finish_listen(vad, transcriber, start)
 
-    def _play_file(self, path, block=True):
-        """Play audio file using aplay (wav) or mpg123 (mp3)."""
-        self.stop_audio() # Stop previous
-        
-        cmd = []
-        if path.endswith(".mp3"):
-            # Use specific hardware device for Voice/Handset (USB Audio)
-            cmd = ["mpg123", "-q", "-a", f"plughw:{AUDIO_DEVICE_ID},0", path]
-        else:
-            cmd = ["aplay", "-q", "-D", f"plughw:{AUDIO_DEVICE_ID},0", path]
-            
-        # Unified Process Launch (Allows killing blocking processes too)
+        self.stop_audio(ready_for="listen") # Silence before listening; waits only until the devices are really free
+
+        print("👂 Listening (Smart VAD)...")
+        vad = StreamingVAD(onset_timeout=min(VAD_ONSET_TIMEOUT, duration))
+        transcriber = SegmentedTranscriber(self.openai_client, self.stt_executor, self.language)
+        capture = MicCapture()
+        max_frames = int(duration * 1000 / VAD_FRAME_MS)
+        start = time.monotonic()
+
+        # Tracked so interrupt() can end the recording on hang-up
         try:
-            self.current_process = subprocess.Popen(cmd)
-            
-            if block:
-                self.current_process.wait()
-                self.current_process = None # Clear after finish
+            self.capture_process = capture
+            capture.start()
+            for _ in range(max_frames):
+                frame = capture.read()
+                if frame is None or vad.feed(frame):
+                    break
+                if STT_SEGMENTED:
+                    segment = vad.take_segment()
+                    if segment is not None:
+                        transcriber.submit(segment, vad.noise_db) # Caller is pausing; transcribe while they go on
         except Exception as e:
-            print(f"Error play_file: {e}")
+            print(f"❌ Capture Error: {e}")
+            return ""
+        finally:
+            capture.close()
+            self.capture_process = None
+
+        return self._finish_listen(vad, transcriber, start)
+
+    def _finish_listen(self, vad, transcriber, start):
+        """End of a captured turn: report, send the last piece, return the transcript."""
+        if session_cancelled():
+            return ""
+
+        end_of_speech = time.monotonic()
+        reason = vad.result or ("cap" if vad.started else "no_onset")
+        print(f"   (VAD: {reason} after {end_of_speech - start:.1f}s, speech {vad.speech_seconds:.1f}s, "
+              f"floor {vad.noise_db if vad.noise_db is not None else float('nan'):.0f} dBFS)")
+        self.turn_report()
+        remainder = vad.remainder()
+        if remainder is not None:
+            transcriber.submit(remainder, vad.noise_db)
+        self.stt_calls += len(transcriber.futures)
+        self.stt_skipped += transcriber.skipped
+        if transcriber.skipped:
+            print(f"   (Whisper calls avoided: {self.stt_skipped} of {self.stt_calls + self.stt_skipped})")
+        if not transcriber.futures:
+            return ""
+
+        # Proceed to Transcribe...
+        print(f"📝 Transcribing ({len(transcriber.futures)} segment(s))...")
+        text = transcriber.result()
+        print(f"   (Transcript ready {(time.monotonic() - end_of_speech) * 1000:.0f} ms after end of speech)")
+        if session_cancelled() or len(text) < 2:
+            return ""
+
+        print(f"   You said: '{text}'")
+        return text
@@ -0,0 +1,117 @@
+import time
+import threading
+from .config import VAD_FRAME_MS, STT_SEGMENTED
+from .config import BARGE_IN_COUPLING_DB, BARGE_IN_CALIBRATION, BARGE_IN_MARGIN_DB, BARGE_IN_START_FRAMES
+from .config import BARGE_IN_PREROLL, BARGE_IN_MAX_TURN
+from .vad import StreamingVAD, MicCapture, wait_capture_free
+
+class BargeInMonitor(threading.Thread):
+    """
+    Listens on the handset mic while the phone is talking.
+    Each mic frame is compared with the echo we expect from our own output
+    (mixer level over the last frame + speaker->mic coupling + a margin). Speech above
+    that for BARGE_IN_START_FRAMES frames calls on_barge_in() (which cuts the speech
+    channel), and the capture simply carries on as the caller's next turn: VAD and
+    segmented transcription run exactly as in AudioEngine.listen(), which picks them up.
+    """
+    def __init__(self, mixer, transcriber, on_barge_in, coupling_db=BARGE_IN_COUPLING_DB):
+        super().__init__()
+        self.daemon = True
+        self.mixer = mixer
+        self.transcriber = transcriber
+        self.on_barge_in = on_barge_in
+        self.coupling_db = coupling_db
+
+        self.vad = StreamingVAD(onset_timeout=24 * 3600, start_frames=BARGE_IN_START_FRAMES,
+                                preroll=BARGE_IN_PREROLL)
+        self.capture = MicCapture()
+        self.lock = threading.Lock()
+        self.armed = True # Playback still running; cleared by release()
+        self.barged = False
+        self.stopped = False
+        self.start_t = None # Capture start (listen() reports the turn from here)
+        self.barge_t = None
+        self.end_t = None
+
+    def run(self):
+        frame_s = VAD_FRAME_MS / 1000
+        try:
+            wait_capture_free()
+            if self.stopped:
+                return
+            self.capture.start()
+            self.start_t = time.monotonic()
+            max_frames = None
+            frames = 0
+            while not self.stopped:
+                frame = self.capture.read()
+                if frame is None:
+                    break
+                now = time.monotonic()
+                output_db = self.mixer.output_level_db(window=2 * frame_s, at=now)
+                echo_db = output_db + self.coupling_db + BARGE_IN_MARGIN_DB
+                result = self.vad.feed(frame, echo_db=echo_db)
+                frames += 1
+
+                if not self.vad.started:
+                    if not self.vad.run: # Only frames that don't look like the caller
+                        self._learn_coupling(self.vad.last_level, output_db, frames * frame_s)
+                    continue
+                if not self.barged and not self._barge_in(output_db):
+                    break # Playback ended first: nothing to hand over
+                if result:
+                    break
+                if max_frames is None:
+                    max_frames = frames + int(BARGE_IN_MAX_TURN / frame_s)
+                elif frames >= max_frames:
+                    break
+                if STT_SEGMENTED:
+                    segment = self.vad.take_segment()
+                    if segment is not None:
+                        self.transcriber.submit(segment, self.vad.noise_db)
+        except Exception as e:
+            print(f"❌ Barge-In Capture Error: {e}")
+        finally:
+            self.capture.close()
+            self.end_t = time.monotonic()
+
+    def _learn_coupling(self, mic_db, output_db, elapsed):
+        """
+        Track mic level minus output level while the phone talks and the caller doesn't.
+        Starts high (BARGE_IN_COUPLING_DB) and settles down onto the real echo path.
+        """
+        if output_db < -45:
+            return # Too quiet to tell echo from room noise
+        rate = 0.2 if elapsed < BARGE_IN_CALIBRATION else 0.02
+        self.coupling_db += (mic_db - output_db - self.coupling_db) * rate
+
+    def _barge_in(self, output_db):
+        with self.lock:
+            if not self.armed:
+                return False
+            self.barged = True
+        self.barge_t = time.monotonic()
+        print(f"✋ Barge-in after {self.barge_t - self.start_t:.1f}s (mic {self.vad.last_level:.0f} dBFS, "
+              f"output {output_db:.0f} dBFS, coupling {self.coupling_db:.0f} dB)")
+        self.on_barge_in()
+        return True
+
+    def release(self):
+        """
+        Playback is over. Returns True if the caller barged in (the capture keeps
+        running for listen()); otherwise the mic is closed.
+        """
+        with self.lock:
+            self.armed = False
+            if self.barged:
+                return True
+        self.stop()
+        return False
+
+    def stop(self):
+        self.stopped = True
+        self.capture.terminate()
+
+    @property
+    def finished(self):
+        return self.end_t is not None
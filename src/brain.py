@@ -1,11 +1,113 @@
 from openai import OpenAI
+import re
+import json
 import random
-from .config import OPENAI_API_KEY, DECADE_VOICES, DECADE_PLAYLISTS
+from collections import namedtuple
+from .config import OPENAI_API_KEY, DECADE_VOICES, DECADE_PLAYLISTS, INTENT_LOCAL
+from .intent_classifier import IntentClassifier
+from .events import session_cancelled
+
+# Stands in for the exact year in intros generated before the last digit is dialed
+YEAR_PLACEHOLDER = "[YEAR]"
+
+# What a host intro talks about (one picked per intro, to keep them fresh)
+INTRO_TOPICS = {
+    "EN": [
+        "breaking news headline",
+        "latest technology or invention",
+        "fashion trend or celebrity gossip",
+        "the weather and general mood in the streets",
+        "a new hit song or musical trend",
+        "a philosophical thought about this modern era"
+    ],
+    "CZ": [
+        "hlavní zprávu dne",
+        "nejnovější technický vynález nebo trend",
+        "módu nebo drby o celebritách",
+        "počasí a náladu na ulicích",
+        "nový hudební hit nebo styl",
+        "filosofickou myšlenku o této moderní době"
+    ],
+}
+
+# Czech decade names (stem, "from" and "in" prepositions): 1960 -> "ze šedesátých let".
+# Decades without a common name are said as a range ("z let 1900–1909").
+CZ_DECADES = {
+    1920: ("dvacát", "ze", "ve"), 1930: ("třicát", "ze", "ve"), 1940: ("čtyřicát", "ze", "ve"),
+    1950: ("padesát", "z", "v"), 1960: ("šedesát", "ze", "v"), 1970: ("sedmdesát", "ze", "v"),
+    1980: ("osmdesát", "z", "v"), 1990: ("devadesát", "z", "v"),
+}
+
+def czech_decade(decade):
+    """(name, from, in, locative): ('šedesátá léta', 'ze šedesátých let', 'v šedesátých letech', 'šedesátých letech')"""
+    if decade in CZ_DECADES:
+        stem, z, v = CZ_DECADES[decade]
+        return f"{stem}á léta", f"{z} {stem}ých let", f"{v} {stem}ých letech", f"{stem}ých letech"
+    years = f"{decade}–{decade + 9}"
+    return f"léta {years}", f"z let {years}", f"v letech {years}", f"letech {years}"
+
+# Music librarian rules, written as 'TYPE: Query' (get_music_search_query, interpret_request)
+MUSIC_QUERY_RULES = (
+    "Rules:\n"
+    "0. If user says generic affirmation like 'Spin the records', 'Play music', 'Yes', 'Lets do it' -> return 'DEFAULT: None'.\n"
+    "1. If user asks for a specific song (e.g. 'Play Here in My Heart'), use 'TRACK: Song Artist year:XXXX'.\n"
+    "2. If user refers to a song in context (e.g. 'Play that', 'Play the trailer'), resolve it to the full title mentioned in Context.\n"
+    "3. If user explicitly asks for an ALBUM (e.g. 'Play album Abbey Road'), use 'ALBUM: Album Name Artist'.\n"
+    "4. If user asks for music BY or FROM a specific artist (e.g. 'Play Bing Crosby', 'Songs from Elvis'), use 'ARTIST: Artist Name'.\n"
+    "5. If user names a famous entity without identifying type (e.g. 'Play Beatles' vs 'Play Bohemian Rhapsody'), USE YOUR WORLD KNOWLEDGE to infer if it is an ARTIST or TRACK.\n"
+    "   - 'Play Beatles' -> 'ARTIST: The Beatles'\n"
+    "   - 'Play Bohemian Rhapsody' -> 'TRACK: Bohemian Rhapsody Queen'\n"
+    "6. If user asks for a genre, mood, or artist collection (e.g. 'Play Rock', 'Jazz music'), use 'PLAYLIST: Query'. Do NOT use 'year:XXXX' for playlists.\n"
+    "7. Limit query to 3-4 keywords.\n"
+    "8. IMPORTANT: Correct any spelling errors or typos in proper names to their canonical local form (e.g. 'Vladimir Myšík' -> 'Vladimír Mišík', 'Vteřině' -> 'Vteřiny').\n"
+)
+
+SEARCH_TYPES = ("TRACK", "ALBUM", "ARTIST", "PLAYLIST", "DEFAULT")
+
+# interpret_request(): what the caller wants, in one round trip.
+# search_type/search_query are None unless intent is "MUSIC"; search_type "DEFAULT" = any era music.
+CallerRequest = namedtuple("CallerRequest", "intent search_type search_query confirmation")
+
+REQUEST_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "intent": {"type": "string", "enum": ["MUSIC", "CHAT"]},
+        "search_type": {"type": "string", "enum": list(SEARCH_TYPES) + ["NONE"]},
+        "search_query": {"type": "string"},
+        "confirmation": {"type": "string"},
+    },
+    "required": ["intent", "search_type", "search_query", "confirmation"],
+    "additionalProperties": False,
+}
+
+class TextStream:
+    """
+    A reply as it is being generated: iterate for text pieces as they arrive
+    (AudioEngine.speak_stream does); .text holds everything received so far.
+    close() stops a reply that is no longer wanted (barge-in, hang-up).
+    """
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.text = ""
+
+    def __iter__(self):
+        for piece in self.pieces:
+            self.text += piece
+            yield piece
+
+    def close(self):
+        """End the reply here; must be called from the thread that iterates it."""
+        close = getattr(self.pieces, "close", None)
+        if close:
+            close()
+
 
 class Brain:
     def __init__(self):
         self.client = OpenAI(api_key=OPENAI_API_KEY)
         self.chat_history = [] # Stateful conversation memory
+        self.intents = IntentClassifier() # On-device intent check before any LLM call
+        self.intent_calls = {"local": 0, "llm": 0}
         
         # Persona Prompts
         self.operator_prompt_en = """
@@ -27,22 +129,66 @@ class Brain:
         """
         Ask the Operator a question.
         """
-        system_prompt = self.operator_prompt_en if language == "EN" else self.operator_prompt_cz
-        
         try:
             response = self.client.chat.completions.create(
                 model="gpt-5.2-2025-12-11", # The Ultimate Upgrade
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": query}
-                ],
+                messages=self._operator_messages(query, language),
                 max_completion_tokens=150,
                 timeout=5.0 # Prevent hanging on bad network
             )
             return response.choices[0].message.content
         except Exception as e:
             print(f"🧠 Brain Error: {e}")
-            return "I am unable to connect you at this time." if language == "EN" else "Nemohu vás momentálně spojit."
+            return self._operator_fallback(language)
+
+    def ask_operator_stream(self, query, language="EN"):
+        """ask_operator() as a TextStream."""
+        return self._stream_reply(self._operator_messages(query, language), self._operator_fallback(language),
+                                  max_completion_tokens=150, timeout=5.0)
+
+    def _operator_messages(self, query, language):
+        system_prompt = self.operator_prompt_en if language == "EN" else self.operator_prompt_cz
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": query}
+        ]
+
+    def _operator_fallback(self, language):
+        return "I am unable to connect you at this time." if language == "EN" else "Nemohu vás momentálně spojit."
+
+    def _stream_reply(self, messages, fallback, on_done=None, **options):
+        """
+        TextStream over a chat completion while it is generated. If the request fails
+        before any text arrived, `fallback` is the reply. on_done(text) runs once the
+        model has finished, or with the text so far if the stream is closed early
+        (not for the fallback).
+        """
+        def pieces():
+            text = ""
+            response = None
+            try:
+                try:
+                    response = self.client.chat.completions.create(
+                        model="gpt-5.2-2025-12-11",
+                        messages=messages,
+                        stream=True,
+                        **options
+                    )
+                    for chunk in response:
+                        piece = chunk.choices[0].delta.content if chunk.choices else None
+                        if piece:
+                            text += piece
+                            yield piece
+                except Exception as e:
+                    print(f"🧠 Brain Stream Error: {e}")
+                if not text.strip():
+                    yield fallback
+            finally:
+                if response is not None:
+                    response.close() # Stop downloading a reply nobody listens to
+                if on_done and text.strip():
+                    on_done(text)
+        return TextStream(pieces())
 
     def get_voice_for_year(self, year):
         # Round to decade (e.g. 1955 -> 1950)
@@ -101,67 +247,102 @@ class Brain:
         Generate a randomized intro for a specific year's radio host. 
         """
         # Clear history on new intro/year change
-        self.chat_history = []
-        
+        if not session_cancelled():
+            self.chat_history = []
+
+        content = self.generate_host_intro(year, language)
+        if content is None:
+            return f"Welcome to {year}."
+
+        # Init History
+        self.start_host_session(content)
+        return content
+
+    def get_host_intro_stream(self, year, language="EN"):
+        """get_host_intro() as a TextStream; the chat session starts with the intro once it ends (or is cut off)."""
+        if not session_cancelled():
+            self.chat_history = []
+        return self._stream_reply(self._intro_messages(year, language), f"Welcome to {year}.",
+                                  on_done=self.start_host_session, max_completion_tokens=200, timeout=6.0)
+
+    def start_host_session(self, intro):
+        """Reset chat memory to a fresh session that starts with `intro` (not from a pre-empted dial session)."""
+        if session_cancelled():
+            return
+        self.chat_history = [{"role": "assistant", "content": intro}]
+
+    def generate_host_intro(self, year, language="EN", template=False, topic=None, decade=False):
+        """
+        Intro text only (no chat history changes), safe to call from prefetch threads.
+        template=True: `year` is just the decade; the exact year is written as YEAR_PLACEHOLDER
+        so the text can be generated before the last digit is dialed (see fill_intro_template).
+        decade=True: `year` is the decade and the text fits any year in it (intro pool).
+        topic: index into INTRO_TOPICS[language] (default: random).
+        Returns None on error.
+        """
+        try:
+            # Fallback (which shouldn't happen now we verified the model)
+            response = self.client.chat.completions.create(
+                model="gpt-5.2-2025-12-11",
+                messages=self._intro_messages(year, language, template, topic, decade),
+                max_completion_tokens=200,
+                timeout=6.0
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            print(f"❌ Intro Error: {e}") # Debug log
+            return None
+
+    def _intro_messages(self, year, language="EN", template=False, topic=None, decade=False):
         style = self.get_persona_style(year, language)
         
         # RANDOMIZATION: Pick a topic to keep it fresh
-        topics_en = [
-            "breaking news headline",
-            "latest technology or invention",
-            "fashion trend or celebrity gossip",
-            "the weather and general mood in the streets",
-            "a new hit song or musical trend",
-            "a philosophical thought about this modern era"
-        ]
-        topics_cz = [
-            "hlavní zprávu dne",
-            "nejnovější technický vynález nebo trend",
-            "módu nebo drby o celebritách",
-            "počasí a náladu na ulicích",
-            "nový hudební hit nebo styl",
-            "filosofickou myšlenku o této moderní době"
-        ]
-        
-        topic = random.choice(topics_en) if language == "EN" else random.choice(topics_cz)
+        topics = INTRO_TOPICS.get(language, INTRO_TOPICS["CZ"])
+        topic = topics[topic] if topic is not None else random.choice(topics)
+
+        year_text = YEAR_PLACEHOLDER if template else year
         
         if language == "EN":
+            when = f"the {year}s" if decade else year_text
             prompt = f"""
-            You are a Radio DJ from {year}. 
-            Year: {year}.
+            You are a Radio DJ from {when}. 
+            Year: {when}.
             **Persona/Style**: {style}
             Context: Talk briefly about: {topic}.
-            Goal: Introduce yourself and ask the user: "Shall we spin the records, or do you want to chat more about {year}?"
+            Goal: Introduce yourself and ask the user: "Shall we spin the records, or do you want to chat more about {when}?"
             Keep it under 3 sentences. Stay strictly in character.
             """
+            if template:
+                prompt += f"The exact year is somewhere in the {year}s. Write it ONLY as the literal token {YEAR_PLACEHOLDER}.\n"
+            if decade:
+                prompt += "Speak about the decade as a whole. Never name an exact year.\n"
         else:
+            name, from_decade, in_decade, about_decade = czech_decade(int(year) // 10 * 10)
+            if decade:
+                origin, when, about = from_decade, f"Desetiletí: {name}", about_decade
+            else:
+                origin, when, about = f"z roku {year_text}", f"Rok: {year_text}", f"roce {year_text}"
             prompt = f"""
-            Jste rádiový moderátor z roku {year}.
-            Rok: {year}.
+            Jste rádiový moderátor {origin}.
+            {when}.
             **Styl/Osobnost**: {style}
             Kontext: Krátce zmiňte: {topic}.
-            Cíl: Uvítejte posluchače a zeptejte se: "Mám pustit hudbu, nebo si chcete povídat o roce {year}?"
+            Cíl: Uvítejte posluchače a zeptejte se: "Mám pustit hudbu, nebo si chcete povídat o {about}?"
             Max 3 věty. Držte se role.
             """
+            if template:
+                prompt += f"Přesný rok leží {in_decade}. Pište ho POUZE jako doslovný token {YEAR_PLACEHOLDER}.\n"
+            if decade:
+                prompt += f"Mluvte o desetiletí jako celku ({name}). Nikdy neuvádějte konkrétní rok.\n"
 
-        try:
-            # Fallback (which shouldn't happen now we verified the model)
-            response = self.client.chat.completions.create(
-                model="gpt-5.2-2025-12-11",
-                messages=[
-                    {"role": "system", "content": prompt},
-                    {"role": "user", "content": "Intro the show!"}
-                ],
-                max_completion_tokens=200,
-                timeout=6.0
-            )
-            content = response.choices[0].message.content
-            # Init History
-            self.chat_history.append({"role": "assistant", "content": content})
-            return content
-        except Exception as e:
-            print(f"❌ Intro Error: {e}") # Debug log
-            return f"Welcome to {year}."
+        return [
+            {"role": "system", "content": prompt},
+            {"role": "user", "content": "Intro the show!"}
+        ]
+
+    def fill_intro_template(self, template, year):
+        """Turn a speculative decade intro into the intro for the dialed year."""
+        return template.replace(YEAR_PLACEHOLDER, str(year))
 
     def extract_timer_duration(self, user_text):
         """
@@ -219,6 +400,34 @@ class Brain:
         """
         Interactive chat with the Host Persona.
         """
+        try:
+            response = self.client.chat.completions.create(
+                model="gpt-5.2-2025-12-11", 
+                messages=self._host_chat_messages(query, year, language),
+                max_completion_tokens=150,
+                timeout=5.0
+            )
+            
+            reply = response.choices[0].message.content
+            self._remember_turn(query, reply)
+            return reply
+        except Exception as e:
+             return "Signal lost..."
+
+    def chat_with_host_stream(self, query, year, language="EN"):
+        """chat_with_host() as a TextStream; the turn is added to the history once it ends (or is cut off)."""
+        return self._stream_reply(self._host_chat_messages(query, year, language), "Signal lost...",
+                                  on_done=lambda reply: self._remember_turn(query, reply),
+                                  max_completion_tokens=150, timeout=5.0)
+
+    def _remember_turn(self, query, reply):
+        # Update History (a pre-empted session's late reply belongs to nobody now)
+        if session_cancelled():
+            return
+        self.chat_history.append({"role": "user", "content": query})
+        self.chat_history.append({"role": "assistant", "content": reply})
+
+    def _host_chat_messages(self, query, year, language):
         style = self.get_persona_style(year, language)
         
         if language == "EN":
@@ -236,28 +445,12 @@ class Brain:
             Stručně (2 věty).
             """
             
-        try:
-            # Construct messages with history
-            messages = [{"role": "system", "content": prompt}]
-            # Add up to last 4 turns of history to keep context but save tokens
-            messages.extend(self.chat_history[-4:]) 
-            messages.append({"role": "user", "content": query})
-
-            response = self.client.chat.completions.create(
-                model="gpt-5.2-2025-12-11", 
-                messages=messages,
-                max_completion_tokens=150,
-                timeout=5.0
-            )
-            
-            reply = response.choices[0].message.content
-            # Update History
-            self.chat_history.append({"role": "user", "content": query})
-            self.chat_history.append({"role": "assistant", "content": reply})
-            
-            return reply
-        except Exception as e:
-             return "Signal lost..."
+        # Construct messages with history
+        messages = [{"role": "system", "content": prompt}]
+        # Add up to last 4 turns of history to keep context but save tokens
+        messages.extend(self.chat_history[-4:]) 
+        messages.append({"role": "user", "content": query})
+        return messages
 
     def get_music_search_query(self, user_text, year, language="EN"):
         """
@@ -275,18 +468,7 @@ class Brain:
             f"--- CONTEXT ---\n{history_text}\n"
             f"--- END CONTEXT ---\n"
             "Format: 'TYPE: Query'\n"
-            "Rules:\n"
-            "0. If user says generic affirmation like 'Spin the records', 'Play music', 'Yes', 'Lets do it' -> return 'DEFAULT: None'.\n"
-            "1. If user asks for a specific song (e.g. 'Play Here in My Heart'), use 'TRACK: Song Artist year:XXXX'.\n"
-            "2. If user refers to a song in context (e.g. 'Play that', 'Play the trailer'), resolve it to the full title mentioned in Context.\n"
-            "3. If user explicitly asks for an ALBUM (e.g. 'Play album Abbey Road'), use 'ALBUM: Album Name Artist'.\n"
-            "4. If user asks for music BY or FROM a specific artist (e.g. 'Play Bing Crosby', 'Songs from Elvis'), use 'ARTIST: Artist Name'.\n"
-            "5. If user names a famous entity without identifying type (e.g. 'Play Beatles' vs 'Play Bohemian Rhapsody'), USE YOUR WORLD KNOWLEDGE to infer if it is an ARTIST or TRACK.\n"
-            "   - 'Play Beatles' -> 'ARTIST: The Beatles'\n"
-            "   - 'Play Bohemian Rhapsody' -> 'TRACK: Bohemian Rhapsody Queen'\n"
-            "6. If user asks for a genre, mood, or artist collection (e.g. 'Play Rock', 'Jazz music'), use 'PLAYLIST: Query'. Do NOT use 'year:XXXX' for playlists.\n"
-            "7. Limit query to 3-4 keywords.\n"
-            "8. IMPORTANT: Correct any spelling errors or typos in proper names to their canonical local form (e.g. 'Vladimir Myšík' -> 'Vladimír Mišík', 'Vteřině' -> 'Vteřiny').\n"
+            + MUSIC_QUERY_RULES +
             "Example: 'TRACK: Here in My Heart Al Martino'"
         )
         
@@ -303,36 +485,32 @@ class Brain:
             raw_result = response.choices[0].message.content.strip().replace('"', '')
             print(f"🧠 Raw Music Algo: {raw_result}")
             
-            # Parse
-            if ":" in raw_result:
-                parts = raw_result.split(":", 1)
-                s_type = parts[0].strip().upper()
-                s_query = parts[1].strip()
-                if "DEFAULT" in s_type:
-                    return None, "DEFAULT"
-                return s_query, s_type
-            else:
-                return raw_result, "PLAYLIST" # Default fallback for unformatted
+            return self._parse_search(raw_result)
 
         except Exception as e:
             print(f"Error generating music query: {e}")
             return f"top hits {year}", "PLAYLIST"
 
+    def _parse_search(self, raw_result):
+        """'TYPE: Query' -> (query, type); (None, "DEFAULT") for any-music requests."""
+        if ":" in raw_result:
+            parts = raw_result.split(":", 1)
+            s_type = parts[0].strip().upper()
+            s_query = parts[1].strip()
+            if "DEFAULT" in s_type:
+                return None, "DEFAULT"
+            return s_query, s_type
+        else:
+            return raw_result, "PLAYLIST" # Default fallback for unformatted
+
     def get_dj_confirmation(self, year, query, language="EN"):
         """
         Generate a short snippet where the DJ confirms and ANNOUNCES what they are about to play.
         """
-        style = self.get_persona_style(year, language)
-        prompt = (
-            f"You are a Radio DJ from {year}. Style: {style}\n"
-            f"User request (Search Term): '{query}'.\n"
-            f"Confirm you found it and are playing it now. Mention the artist/song name clearly.\n"
-            f"Example: 'The Beatles? Excellent choice. Coming right up!' or 'Streaming that track now.'"
-        )
         try:
             response = self.client.chat.completions.create(
                 model="gpt-5.2-2025-12-11",
-                messages=[{"role": "system", "content": prompt}],
+                messages=self._dj_confirmation_messages(year, query, language),
                 max_completion_tokens=50,
                 temperature=0.7
             )
@@ -341,13 +519,34 @@ class Brain:
                 raise ValueError("Empty response from DJ")
             return content
         except Exception as e:
-            fallback = "Coming right up!" if language == "EN" else "Už to hraju!"
-            return fallback
+            return self._dj_fallback(language)
 
-    def classify_intent(self, user_text):
+    def get_dj_confirmation_stream(self, year, query, language="EN"):
+        """get_dj_confirmation() as a TextStream."""
+        return self._stream_reply(self._dj_confirmation_messages(year, query, language), self._dj_fallback(language),
+                                  max_completion_tokens=50, temperature=0.7)
+
+    def _dj_confirmation_messages(self, year, query, language):
+        style = self.get_persona_style(year, language)
+        prompt = (
+            f"You are a Radio DJ from {year}. Style: {style}\n"
+            f"User request (Search Term): '{query}'.\n"
+            f"Confirm you found it and are playing it now. Mention the artist/song name clearly.\n"
+            f"Example: 'The Beatles? Excellent choice. Coming right up!' or 'Streaming that track now.'"
+        )
+        return [{"role": "system", "content": prompt}]
+
+    def _dj_fallback(self, language):
+        return "Coming right up!" if language == "EN" else "Už to hraju!"
+
+    def classify_intent(self, user_text, local=INTENT_LOCAL):
         """
         Determine if the user wants to CHAT, PLAY_MUSIC (explicit), or NAVIGATE.
+        local=True: obvious cases are decided on the device (see _local_intent).
         """
+        guess = self._local_intent(user_text) if local else None
+        if guess:
+            return guess.intent
         prompt = (
             f"Classify the following user input into exactly one category:\n"
             f"1. 'MUSIC': User explicitly wants to start playing music NOW (e.g. 'Play X', 'Start music', 'I want to hear X').\n"
@@ -366,3 +565,110 @@ class Brain:
             return response.choices[0].message.content.strip().upper()
         except:
              return "CHAT"
+
+    def interpret_request(self, user_text, year, language="EN", music=False):
+        """
+        classify_intent + get_music_search_query + get_dj_confirmation in a single call:
+        returns a CallerRequest. The reply is strict JSON (REQUEST_SCHEMA); if it still
+        can't be read, _parse_request falls back to the old line formats.
+        music=True: the intent is known to be MUSIC (e.g. the caller is correcting a request).
+        With INTENT_LOCAL, chat and "any music" requests the device is sure about need no
+        call at all; a sure music request still needs one for its query and confirmation.
+        """
+        guess = self._local_intent(user_text) if INTENT_LOCAL and not music else None
+        if guess and guess.intent == "CHAT":
+            return CallerRequest("CHAT", None, None, None)
+        if guess and guess.generic:
+            return CallerRequest("MUSIC", "DEFAULT", None, "") # main.py says a fixed phrase
+        music = music or (guess is not None and guess.intent == "MUSIC") # Rule hits only (IntentClassifier.confident)
+
+        history_text = "\n".join([f"{m['role'].upper()}: {m['content']}" for m in self.chat_history[-4:]])
+        style = self.get_persona_style(year, language)
+        prompt = (
+            f"You are a Radio DJ from {year} taking a caller's request. Style: {style}\n"
+            f"User Language: {language}.\n"
+            f"--- CONTEXT ---\n{history_text}\n"
+            f"--- END CONTEXT ---\n"
+            f"1. intent: 'MUSIC' if the user explicitly wants to start playing music NOW (e.g. 'Play X', 'Start music', 'I want to hear X'); "
+            f"'CHAT' if they are asking a question, chatting, or asking ABOUT music (e.g. 'What is popular?', 'Who is the singer?', 'Tell me about X').\n"
+            f"2. search_type and search_query (music librarian for the year {year}; only for MUSIC, else 'NONE' and ''). "
+            f"The rules below write them as 'TYPE: Query'.\n"
+            + MUSIC_QUERY_RULES +
+            f"3. confirmation (only for MUSIC, else ''): confirm you found it and are playing it now, in {language}. "
+            f"Mention the artist/song name clearly. One or two short sentences.\n"
+            f"Example: 'The Beatles? Excellent choice. Coming right up!' or 'Streaming that track now.'"
+        )
+        if music:
+            prompt += "\nThe user wants music now: intent is MUSIC."
+        try:
+            response = self.client.chat.completions.create(
+                model="gpt-5.2-2025-12-11",
+                messages=[
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": user_text}
+                ],
+                response_format={
+                    "type": "json_schema",
+                    "json_schema": {"name": "caller_request", "strict": True, "schema": REQUEST_SCHEMA}
+                },
+                max_completion_tokens=120,
+                temperature=0.3,
+                timeout=5.0
+            )
+            raw_result = response.choices[0].message.content or ""
+        except Exception as e:
+            print(f"🧠 Request Error: {e}")
+            return CallerRequest("MUSIC", "PLAYLIST", f"top hits {year}", self._dj_fallback(language)) if music \
+                else CallerRequest("CHAT", None, None, None)
+        request = self._parse_request(raw_result, language, music)
+        print(f"🧠 Request: {request.intent} | {request.search_type}: {request.search_query}")
+        return request
+
+    def _parse_request(self, raw_result, language="EN", music=False):
+        """CallerRequest from the model's reply: JSON (validated), else 'INTENT'/'TYPE: Query' lines."""
+        text = re.sub(r"^```(?:json)?|```$", "", raw_result.strip()).strip()
+        try:
+            data = json.loads(text)
+            if not isinstance(data, dict):
+                raise ValueError("not an object")
+            intent = str(data.get("intent", "")).strip().upper()
+            s_type = str(data.get("search_type", "")).strip().upper()
+            s_query = str(data.get("search_query") or "").strip()
+            confirmation = str(data.get("confirmation") or "").strip()
+        except ValueError:
+            print(f"🧠 Unstructured Request Reply: {raw_result!r}")
+            intent, s_type, s_query, confirmation = "", "", "", ""
+            for line in text.splitlines():
+                key, _, value = line.partition(":")
+                key = key.strip().strip("'\"").upper()
+                if key in ("MUSIC", "CHAT") and not value.strip():
+                    intent = key
+                elif key == "INTENT":
+                    intent = value.strip().upper()
+                elif key in SEARCH_TYPES:
+                    s_query, s_type = self._parse_search(line.strip().replace('"', ''))
+                    s_query = s_query or ""
+                elif key == "CONFIRMATION":
+                    confirmation = value.strip().strip('"')
+            if s_type and not intent:
+                intent = "MUSIC"
+
+        if music:
+            intent = "MUSIC"
+        if intent != "MUSIC":
+            return CallerRequest("CHAT", None, None, None)
+        if s_type not in SEARCH_TYPES:
+            s_type = "PLAYLIST" if s_query else "DEFAULT"
+        if s_type == "DEFAULT" or not s_query or s_query.lower() == "none":
+            s_type, s_query = "DEFAULT", None
+        return CallerRequest("MUSIC", s_type, s_query, confirmation or self._dj_fallback(language))
+
+    def _local_intent(self, user_text):
+        """The on-device IntentGuess if it is confident enough, else None (ask the LLM). Counts both."""
+        guess = self.intents.classify(user_text)
+        sure = self.intents.confident(guess)
+        self.intent_calls["local" if sure else "llm"] += 1
+        local, total = self.intent_calls["local"], sum(self.intent_calls.values())
+        print(f"🧠 Local Intent: {guess.intent} {guess.confidence:.2f} ({guess.source}) -> "
+              f"{'decided here' if sure else 'asking the LLM'} | {local}/{total} decided locally")
+        return guess if sure else None
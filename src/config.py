@@ -6,6 +6,50 @@ DIAL_PIN = 27
 BELL_PINS = (23, 24)
 BELL_SPEED = 0.1 # Seconds (0.1 verified good for mechanical hammer)
 
+# Ring Cadences: [(on_seconds, off_seconds), ...] repeated for the ring duration
+RING_CADENCES = {
+    "CZ": [(1.0, 4.0)],
+    "DE": [(1.0, 4.0)],
+    "UK": [(0.4, 0.2), (0.4, 2.0)], # Double ring
+    "US": [(2.0, 4.0)],
+    "BURST": [(1.0, 0.0)], # Continuous (timer alarm, bell test)
+}
+DEFAULT_RING_CADENCE = "CZ"
+
+# Timer Mode (666): pending timers are persisted so they survive restarts
+TIMER_STATE_FILE = os.path.expanduser("~/RetroPhone/timers.json")
+TIMER_LATE_GRACE = 600 # Seconds. Timers that expired while offline still ring if this recent.
+
+# Input Backend: "edge" (GPIO interrupts), "poll" (legacy 1ms sampling),
+# "sim" / "sim-poll" (software only, for running without a Pi)
+INPUT_BACKEND = os.getenv("RETRO_INPUT_BACKEND", "edge")
+POLL_INTERVAL = 0.001 # Seconds (poll mode only)
+
+# Dial Sessions: a re-dial waits this long for the pre-empted session to wind down
+# (it may be stuck in a network call), then starts anyway
+SESSION_HANDOFF_TIMEOUT = 1.0 # Seconds
+
+# Rotary Decoder Timings (Seconds). Overridden per phone by tools/pulse_replay.py --calibrate
+HOOK_DEBOUNCE = 0.2 # Hook must be stable this long
+PULSE_DEBOUNCE = 0.025 # Ignore rising edges closer than this (contact bounce)
+DIGIT_GAP = 0.7 # Silence after last pulse that ends a digit
+GHOST_LOCKOUT = 0.8 # Ignore pulses right after lifting the handset
+DIAL_CALIBRATION_FILE = os.path.expanduser("~/RetroPhone/dial_calibration.json")
+
+# End-of-Number Detection (how long to wait for another digit)
+# Unambiguous numbers (0, 9, 666, 1965...) are submitted immediately. Ambiguous ones
+# ("1" vs 19xx, "6" vs 666) wait a timeout learned from this phone's inter-digit pauses.
+DIAL_END_DEFAULT = 2.5 # Seconds, until enough pauses have been observed
+DIAL_END_MIN = 0.8
+DIAL_END_MAX = 4.0 # Also the wait mid-number (e.g. after "19")
+DIAL_TIMING_FILE = os.path.expanduser("~/RetroPhone/dial_timing.json")
+
+# Speculative Prefetch (work started while the number is still being dialed)
+PREFETCH_WORKERS = 3
+PREFETCH_MAX_PLAYLISTS = 3 # Prefixes that still allow more decades than this ("1", "19") warm nothing
+PREFETCH_INTRO_WAIT = 6.0 # Max seconds to wait for an in-flight intro (same as the intro timeout)
+PREFETCH_PLAYLIST_WAIT = 5.0 # Max seconds to wait for an in-flight playlist resolve, then resolve again
+
 # --- AUDIO CONFIGURATION ---
 # Volume settings, device IDs, etc.
 DEFAULT_VOLUME = 80
@@ -16,6 +60,130 @@ AUDIO_DEVICE_ID = 1 # USB Audio (Conversation Mic/Speaker)
 # Production: Music will go to Headphone Jack (Card 1 or 0).
 # This is controlled by /etc/raspotify/conf, NOT this file.
 
+# Speech Output: stream ElevenLabs PCM chunks into the handset as they arrive.
+# False (or any streaming failure before the first chunk) synthesizes the whole clip first.
+TTS_STREAMING = os.getenv("RETRO_TTS_STREAMING", "1") != "0"
+TTS_STREAM_FORMAT = "pcm_22050" # Raw signed 16-bit mono
+TTS_SAMPLE_RATE = 22050
+
+# Sentence Pipeline: multi-sentence lines are synthesized one sentence per request on a
+# small pool; the first plays (streamed) while the rest render behind it, in order.
+TTS_PIPELINE = os.getenv("RETRO_TTS_PIPELINE", "1") != "0"
+TTS_WORKERS = 3
+TTS_SENTENCE_MIN_CHARS = 12 # Shorter pieces are joined to a neighbour
+# Streamed replies (speak_stream): text is cut while the model is still writing it, at a
+# sentence end, or at a clause break (, ; : -) once this many characters have gathered.
+TTS_CLAUSE_FIRST_MIN = 24 # First piece: short, so the host starts talking sooner
+TTS_CLAUSE_MIN = 80
+
+# TTS Cache: finished (FX-processed) lines, so repeated phrases need no network call
+TTS_CACHE_DIR = os.path.expanduser("~/RetroPhone/tts_cache")
+TTS_CACHE_MAX_BYTES = 200 * 1024 * 1024 # ~75 minutes of 22 kHz speech
+
+# Local Intent Check (src/intent_classifier.py): obvious requests ("play Elvis", "yes",
+# "what's the news?") are classified on the device; the LLM only decides below this confidence.
+INTENT_LOCAL = os.getenv("RETRO_INTENT_LOCAL", "1") != "0"
+INTENT_CONFIDENCE = 0.85
+
+# Phrase Bank: fixed lines (src/phrase_bank.py) rendered in the background after boot
+PHRASE_BANK_ENABLED = os.getenv("RETRO_PHRASE_BANK", "1") != "0"
+PHRASE_BANK_START_DELAY = 10 # Seconds after start
+
+# Intro Pool (src/intro_pool.py): host intros written for a whole decade and rendered ahead,
+# per decade x language x topic, refilled while the phone is idle. A dial into a decade
+# with a ready intro starts talking at once (no LLM, no TTS, no static).
+INTRO_POOL_ENABLED = os.getenv("RETRO_INTRO_POOL", "1") != "0"
+INTRO_POOL_FILE = os.path.expanduser("~/RetroPhone/intro_pool.json") # Index; the audio lives in the TTS cache
+INTRO_POOL_PER_TOPIC = 1
+INTRO_POOL_MAX_BYTES = 64 * 1024 * 1024 # Audio of ready intros (~25 minutes), part of TTS_CACHE_MAX_BYTES
+INTRO_POOL_MEMORY_BYTES = 16 * 1024 * 1024 # Of that, held in memory (the rest is read from disk on dial)
+INTRO_POOL_START_DELAY = 20 # Seconds after start (the phrase bank goes first)
+
+# Output Mixer: one persistent stream on the handset device (sounds, tones and speech)
+# A mix that takes longer than the whole buffer is an underrun (a click); AudioEngine.turn_report
+# prints them, so if they show up on the device raise these two (cost: start/stop latency).
+MIXER_PERIOD = 256 # Frames per write (~12 ms at TTS_SAMPLE_RATE); start/stop latency
+MIXER_BUFFER_PERIODS = 4 # Device buffer depth in periods (4 x 256 frames: ~46 ms worst-case start)
+
+# Call-Progress Tones (synthesized live by src/tone_synth.py, any length, no loop seams)
+# tone -> (frequencies in Hz, [(on_seconds, off_seconds), ...]); an empty cadence is a continuous tone.
+TONE_PLANS = {
+    "CLASSIC": { # The tone this phone always had
+        "dial": ((425,), [(0.5, 0.5)]),
+        "busy": ((425,), [(0.33, 0.33)]),
+        "ringback": ((425,), [(1.0, 4.0)]),
+    },
+    "CZ": {
+        "dial": ((425,), [(0.33, 0.33), (0.66, 0.66)]),
+        "busy": ((425,), [(0.33, 0.33)]),
+        "ringback": ((425,), [(1.0, 4.0)]),
+    },
+    "DE": {
+        "dial": ((425,), []),
+        "busy": ((425,), [(0.48, 0.48)]),
+        "ringback": ((425,), [(1.0, 4.0)]),
+    },
+    "UK": {
+        "dial": ((350, 450), []),
+        "busy": ((400,), [(0.375, 0.375)]),
+        "ringback": ((400, 450), [(0.4, 0.2), (0.4, 2.0)]),
+    },
+    "US": {
+        "dial": ((350, 440), []),
+        "busy": ((480, 620), [(0.5, 0.5)]),
+        "ringback": ((440, 480), [(2.0, 4.0)]),
+    },
+}
+DEFAULT_TONE_PLAN = os.getenv("RETRO_TONE_PLAN", "CLASSIC")
+
+# Listening (in-process VAD on a live 16 kHz capture)
+VAD_SAMPLE_RATE = 16000 # Whisper's native rate
+VAD_FRAME_MS = 20
+VAD_THRESHOLD_DB = 10 # Speech = this far above the adaptive noise floor...
+VAD_MIN_THRESHOLD_DB = -50 # ...but never below this (dBFS), so a dead-quiet line can't trigger on hiss
+VAD_START_FRAMES = 4 # Voiced frames in a row that count as speech onset (80 ms)
+VAD_HANGOVER = 0.45 # Seconds of silence that end the turn (endpointing delay)
+VAD_ONSET_TIMEOUT = 5.0 # Give up early if nobody starts talking (capped by listen(duration))
+VAD_PREROLL = 0.3 # Seconds kept before onset (soft word starts)
+VAD_TRAIL = 0.2 # Seconds of trailing silence kept for the transcriber
+
+# Segmented STT: long turns are cut at pauses and transcribed while the caller keeps talking
+STT_SEGMENTED = True
+STT_SEGMENT_MIN = 2.0 # Seconds of speech before a pause may cut a segment (short ones transcribe badly)
+STT_SEGMENT_PAUSE = 0.2 # Pause that allows a cut (must be shorter than VAD_HANGOVER)
+STT_WORKERS = 3
+# The UI language (9 toggles it) only steers Whisper through the prompt; callers may still answer
+# in the other language. True passes it as Whisper's `language`, which forces that decoding.
+STT_FORCE_LANGUAGE = os.getenv("RETRO_STT_FORCE_LANGUAGE", "0") == "1"
+
+# Upload Encoding: trimmed 16 kHz mono, "flac" (lossless), "opus" (speech codec, smallest) or "wav".
+# flac/opus need the soundfile package; without it uploads fall back to wav.
+STT_UPLOAD_FORMAT = os.getenv("RETRO_STT_FORMAT", "flac")
+STT_UPLOAD_RATE = 16000
+
+# Speech-Presence Gate: captures that clearly hold no speech (line noise, breathing)
+# return "" without a Whisper call. A 20 ms frame is "voiced" if it is loud enough
+# above the line's noise floor (the VAD's estimate) and has a speech-like zero-crossing rate (hiss/breath is higher).
+STT_GATE_ENABLED = True
+STT_GATE_MIN_PEAK_DB = -40 # dBFS; nothing louder than this = no speech
+STT_GATE_VOICED_DB = 12 # Frame must be this far above the noise floor
+STT_GATE_FLOOR_DB = -55 # dBFS; noise floor assumed when the VAD's estimate isn't passed in
+STT_GATE_MAX_ZCR = 0.25 # Zero crossings per sample
+STT_GATE_MIN_VOICED = 0.2 # Seconds of voiced frames
+STT_GATE_MIN_RATIO = 0.1 # Voiced share of the capture
+
+# Barge-In: the mic stays open while the phone talks (full duplex on the USB handset).
+# Speech clearly louder than the echo of what is playing cuts the line short and becomes the next listen().
+# Echo estimate = recent mixer output level + coupling (speaker -> mic, learned while the phone talks).
+BARGE_IN_ENABLED = os.getenv("RETRO_BARGE_IN", "1") != "0"
+BARGE_IN_COUPLING_DB = 0 # Starting guess (conservative: echo as loud as the output)
+BARGE_IN_CALIBRATION = 0.5 # Seconds at the start of each line used to learn the coupling
+BARGE_IN_MARGIN_DB = 6 # Speech must beat the echo estimate by this much
+BARGE_IN_START_FRAMES = 8 # Voiced frames in a row to cut playback (160 ms; longer than VAD_START_FRAMES)
+BARGE_IN_PREROLL = 0.1 # Shorter than VAD_PREROLL: the pre-roll is mostly echo
+BARGE_IN_MAX_TURN = 15 # Seconds of capture after a barge-in
+BARGE_IN_HANDOFF_MAX = 3.0 # A barge-in not picked up by listen() within this is dropped
+
 # --- API KEYS ---
 # SECURITY WARNING: Never commit actual keys to GitHub!
 # Load from Environment Variables
@@ -0,0 +1,88 @@
+import os
+import json
+from .config import DIAL_TIMING_FILE, DIAL_END_DEFAULT, DIAL_END_MIN, DIAL_END_MAX
+
+# Everything main.py reacts to: decade shortcuts 1-8, language 9, operator 0,
+# timer 666 and exact years 1900-2030.
+VALID_NUMBERS = {str(d) for d in range(10)} | {"666"} | {str(y) for y in range(1900, 2031)}
+VALID_PREFIXES = {n[:i] for n in VALID_NUMBERS for i in range(1, len(n))}
+
+# Prefix classes
+COMPLETE = "complete" # Valid, nothing longer starts with it -> flush now
+AMBIGUOUS = "ambiguous" # Valid, but could also be the start of a longer number
+PARTIAL = "partial" # Not valid yet, a longer number is still possible
+INVALID = "invalid" # Can never become valid -> flush now (nothing to wait for)
+
+def classify(prefix):
+    valid = prefix in VALID_NUMBERS
+    extendable = prefix in VALID_PREFIXES
+    if valid and extendable:
+        return AMBIGUOUS
+    if valid:
+        return COMPLETE
+    if extendable:
+        return PARTIAL
+    return INVALID
+
+
+class EndOfNumberPredictor:
+    """
+    Decides how long to wait after a digit before submitting the buffer.
+    Only ambiguous prefixes ("1", "2", "6") need a timeout; it is learned from
+    this phone's own inter-digit gaps (last digit end -> next digit's first pulse).
+    """
+    WINDOW = 50 # Recent gaps kept
+    MIN_SAMPLES = 5 # Below this, use DIAL_END_DEFAULT
+    MARGIN = 1.5 # Timeout = p95 gap * MARGIN
+
+    def __init__(self, gaps=None, path=DIAL_TIMING_FILE):
+        self.path = path
+        self.gaps = list(gaps or [])[-self.WINDOW:]
+        self._unsaved = 0
+
+    @classmethod
+    def load(cls, path=DIAL_TIMING_FILE):
+        try:
+            with open(path) as f:
+                return cls(json.load(f).get("gaps", []), path=path)
+        except FileNotFoundError:
+            return cls(path=path)
+        except Exception as e:
+            print(f"   ⚠️ Bad dial timing file ({e}). Starting fresh.")
+            return cls(path=path)
+
+    def ambiguous_timeout(self):
+        if len(self.gaps) < self.MIN_SAMPLES:
+            return DIAL_END_DEFAULT
+        ordered = sorted(self.gaps)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return min(DIAL_END_MAX, max(DIAL_END_MIN, p95 * self.MARGIN))
+
+    def timeout_for(self, prefix):
+        """Seconds to wait after the last digit of `prefix` before flushing."""
+        kind = classify(prefix)
+        if kind in (COMPLETE, INVALID):
+            return 0.0
+        if kind == AMBIGUOUS:
+            return self.ambiguous_timeout()
+        return DIAL_END_MAX # Mid-number (e.g. "19"): the caller is still dialing
+
+    def observe_gap(self, seconds):
+        """Record the pause between two digits of one number."""
+        if seconds <= 0 or seconds > DIAL_END_MAX:
+            return
+        self.gaps.append(seconds)
+        self.gaps = self.gaps[-self.WINDOW:]
+        self._unsaved += 1
+        if self._unsaved >= 5:
+            self.save()
+
+    def save(self):
+        try:
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump({"gaps": self.gaps}, f)
+            os.replace(tmp, self.path)
+            self._unsaved = 0
+        except Exception as e:
+            print(f"   (Could not save dial timing: {e})")
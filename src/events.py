@@ -0,0 +1,132 @@
+import queue
+import threading
+from collections import namedtuple
+from .config import SESSION_HANDOFF_TIMEOUT
+
+# Typed events posted by the GPIO sampling thread (t = monotonic timestamp)
+HookEvent = namedtuple("HookEvent", "off_hook t")
+DialEvent = namedtuple("DialEvent", "number t")
+PrefixEvent = namedtuple("PrefixEvent", "digits t")
+
+_local = threading.local()
+
+def current_session():
+    """The Session running on this thread, or None (dispatcher/main/other threads)."""
+    return getattr(_local, "session", None)
+
+def session_cancelled():
+    """True if called from a session that has been pre-empted (hang-up or re-dial)."""
+    session = current_session()
+    return session is not None and session.cancelled.is_set()
+
+def bind_session(fn):
+    """fn, run as part of the calling thread's Session (for helper threads a session starts)."""
+    session = current_session()
+    def run(*args, **kwargs):
+        _local.session = session
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _local.session = None
+    return run
+
+
+class Session:
+    """One dial handler run. Cancelled when the caller hangs up or dials again."""
+    def __init__(self, name):
+        self.name = name
+        self.cancelled = threading.Event()
+        self.done = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+
+class EventDispatcher(threading.Thread):
+    """
+    Runs phone callbacks away from the sampling thread.
+    - Hook and prefix events are short and run right here, in order.
+    - Dial events start a Session on its own thread, so conversations
+      (LLM, TTS, listening) never block edge detection.
+    - Hang-up or a new dial pre-empts the running Session: it is flagged as
+      cancelled and on_preempt() (e.g. AudioEngine.interrupt) cuts its audio.
+      The next Session waits up to `handoff_timeout` for it to return, then
+      starts regardless (a blocking network call can't hold up a re-dial).
+      So a pre-empted Session may still run for a while: anything with lasting
+      effects (music, chat history) checks session_cancelled() right before acting.
+    """
+    def __init__(self, on_hook_change=None, on_dial_complete=None, on_dial_prefix=None, on_preempt=None,
+                 handoff_timeout=SESSION_HANDOFF_TIMEOUT):
+        super().__init__()
+        self.daemon = True
+        self.on_hook_change = on_hook_change
+        self.on_dial_complete = on_dial_complete
+        self.on_dial_prefix = on_dial_prefix
+        self.on_preempt = on_preempt
+
+        self.handoff_timeout = handoff_timeout
+
+        self.events = queue.Queue()
+        self.session = None
+        self.running = True
+
+    def post(self, event):
+        """Called from the sampling thread. Never blocks."""
+        self.events.put(event)
+
+    def run(self):
+        while self.running:
+            try:
+                event = self.events.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                self._dispatch(event)
+            except Exception as e:
+                print(f"❌ Event Handler Error ({type(event).__name__}): {e}")
+
+    def _dispatch(self, event):
+        if isinstance(event, HookEvent):
+            if not event.off_hook:
+                self.preempt("hang-up")
+            if self.on_hook_change: self.on_hook_change(event.off_hook)
+        elif isinstance(event, PrefixEvent):
+            if self.on_dial_prefix: self.on_dial_prefix(event.digits)
+        elif isinstance(event, DialEvent):
+            previous = self.session
+            self.preempt("re-dial")
+            if self.on_dial_complete:
+                session = Session(f"dial {event.number}")
+                self.session = session
+                threading.Thread(target=self._run_session, args=(session, previous, self.on_dial_complete, event.number),
+                                 daemon=True).start()
+
+    def preempt(self, reason):
+        session = self.session
+        if session and not session.cancelled.is_set():
+            print(f"   (Pre-empting session '{session.name}': {reason})")
+            session.cancel()
+            if self.on_preempt:
+                try:
+                    self.on_preempt()
+                except Exception as e:
+                    print(f"   (Pre-empt Error: {e})")
+
+    def _run_session(self, session, previous, fn, *args):
+        if previous and not previous.done.wait(self.handoff_timeout):
+            print(f"   (Session '{previous.name}' still winding down. Starting '{session.name}' anyway.)")
+        _local.session = session
+        try:
+            if not session.cancelled.is_set(): # Pre-empted again while waiting
+                fn(*args)
+        except Exception as e:
+            print(f"❌ Session Error ({session.name}): {e}")
+        finally:
+            _local.session = None
+            session.done.set()
+            if self.session is session:
+                self.session = None
+
+    def stop(self):
+        self.running = False
+        self.preempt("shutdown")
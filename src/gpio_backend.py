@@ -0,0 +1,245 @@
+import abc
+import time
+import queue
+import threading
+from .config import HOOK_PIN, DIAL_PIN, POLL_INTERVAL
+
+# Edge tuples are (pin, level, timestamp) with timestamps from time.monotonic().
+# Every backend feeds the same queue, so PhoneInterface never knows whether
+# the edges came from a GPIO interrupt, a polling thread or a synthetic trace.
+
+class InputBackend(abc.ABC):
+    """
+    Base class for PhoneInterface input backends.
+    Subclasses implement setup/read/output and push edges with _push().
+    """
+    def __init__(self, mode="edge"):
+        self.mode = mode # "edge" (interrupts) or "poll" (sampling thread)
+        self.edges = queue.Queue()
+        self.running = True
+        self.input_pins = ()
+        self._poll_thread = None
+
+        # Stats (edge -> consumer latency, i.e. how late the sampling thread saw it)
+        self.edge_count = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.poll_cycles = 0
+
+    def now(self):
+        return time.monotonic()
+
+    # --- Interface ---
+    @abc.abstractmethod
+    def setup(self, input_pins, output_pins=()):
+        pass
+
+    @abc.abstractmethod
+    def read(self, pin):
+        pass
+
+    @abc.abstractmethod
+    def output(self, pins, level):
+        pass
+
+    def cleanup(self):
+        self.running = False
+
+    def wait_edge(self, timeout=None):
+        """Block until the next edge (pin, level, t) or return None on timeout."""
+        try:
+            edge = self.edges.get(timeout=timeout) if timeout is None or timeout > 0 else self.edges.get_nowait()
+        except queue.Empty:
+            return None
+
+        latency = self.now() - edge[2]
+        self.edge_count += 1
+        self.latency_sum += latency
+        if latency > self.latency_max:
+            self.latency_max = latency
+        return edge
+
+    def stats(self):
+        avg = (self.latency_sum / self.edge_count) if self.edge_count else 0.0
+        return {
+            "backend": type(self).__name__,
+            "mode": self.mode,
+            "edges": self.edge_count,
+            "latency_avg_ms": avg * 1000,
+            "latency_max_ms": self.latency_max * 1000,
+            "poll_cycles": self.poll_cycles,
+        }
+
+    # --- Helpers ---
+    def _push(self, pin, level, t=None):
+        self.edges.put((pin, level, self.now() if t is None else t))
+
+    def _start_polling(self):
+        """Fallback: sample the inputs in a thread and synthesize edges on change."""
+        def poll_loop():
+            last = {pin: self.read(pin) for pin in self.input_pins}
+            while self.running:
+                for pin in self.input_pins:
+                    val = self.read(pin)
+                    if val != last[pin]:
+                        last[pin] = val
+                        self._push(pin, val)
+                self.poll_cycles += 1
+                time.sleep(POLL_INTERVAL)
+
+        self._poll_thread = threading.Thread(target=poll_loop, daemon=True)
+        self._poll_thread.start()
+
+
+class GPIOBackend(InputBackend):
+    """
+    Raspberry Pi GPIO. In "edge" mode edges are timestamped inside the
+    RPi.GPIO callback; if edge detection can't be added we fall back to polling.
+    """
+    def __init__(self, mode="edge"):
+        super().__init__(mode)
+        import RPi.GPIO as GPIO # Imported here so the simulator runs without a Pi
+        self.GPIO = GPIO
+
+    def setup(self, input_pins, output_pins=()):
+        GPIO = self.GPIO
+        self.input_pins = tuple(input_pins)
+
+        GPIO.setmode(GPIO.BCM)
+        for pin in self.input_pins:
+            GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+        if output_pins:
+            GPIO.setup(list(output_pins), GPIO.OUT)
+            GPIO.output(list(output_pins), GPIO.LOW)
+
+        if self.mode == "edge":
+            try:
+                for pin in self.input_pins:
+                    # No bouncetime: debouncing is done by PhoneInterface on timestamps
+                    GPIO.add_event_detect(pin, GPIO.BOTH, callback=self._on_edge)
+                return
+            except RuntimeError as e:
+                print(f"   ⚠️ Edge detection unavailable ({e}). Falling back to polling.")
+                self.mode = "poll"
+
+        self._start_polling()
+
+    def _on_edge(self, pin):
+        # Timestamp first, then sample the level (bounces may have moved on already)
+        t = self.now()
+        self._push(pin, self.GPIO.input(pin), t)
+
+    def read(self, pin):
+        return self.GPIO.input(pin)
+
+    def output(self, pins, level):
+        self.GPIO.output(pins, self.GPIO.HIGH if level else self.GPIO.LOW)
+
+    def cleanup(self):
+        super().cleanup()
+        self.GPIO.cleanup()
+
+
+class SimulatedBackend(InputBackend):
+    """
+    Pure software backend. Replays synthetic edges in real time so the whole
+    PhoneInterface runs on a plain Linux box. Outputs (bell) are just logged.
+    """
+    def __init__(self, mode="edge", hook_pin=HOOK_PIN, dial_pin=DIAL_PIN):
+        super().__init__(mode)
+        self.hook_pin = hook_pin
+        self.dial_pin = dial_pin
+        # Idle phone: handset on hook (1), dial contact closed (0)
+        self.levels = {hook_pin: 1, dial_pin: 0}
+        self.output_log = []
+        self._lock = threading.Lock()
+
+    def setup(self, input_pins, output_pins=()):
+        self.input_pins = tuple(input_pins)
+        for pin in self.input_pins:
+            self.levels.setdefault(pin, 1)
+        for pin in output_pins:
+            self.levels[pin] = 0
+        if self.mode == "poll":
+            self._start_polling()
+
+    def read(self, pin):
+        return self.levels.get(pin, 1)
+
+    def output(self, pins, level):
+        if isinstance(pins, int):
+            pins = (pins,)
+        with self._lock:
+            for pin in pins:
+                self.levels[pin] = level
+                self.output_log.append((self.now(), pin, level))
+
+    def set_level(self, pin, level):
+        """Drive an input pin. In edge mode this fires an edge like an interrupt would."""
+        if self.levels.get(pin) == level:
+            return
+        self.levels[pin] = level
+        if self.mode == "edge":
+            self._push(pin, level)
+
+    def play(self, edges, block=False):
+        """
+        Replay a list of (offset_seconds, pin, level) relative to now.
+        Runs on its own thread unless block=True.
+        """
+        def feeder():
+            start = self.now()
+            for offset, pin, level in sorted(edges):
+                delay = start + offset - self.now()
+                if delay > 0:
+                    time.sleep(delay)
+                if not self.running:
+                    return
+                self.set_level(pin, level)
+
+        if block:
+            feeder()
+            return None
+        t = threading.Thread(target=feeder, daemon=True)
+        t.start()
+        return t
+
+    # --- Synthetic Edge Builders ---
+    def lift_edges(self, at=0.0):
+        return [(at, self.hook_pin, 0)]
+
+    def hangup_edges(self, at=0.0):
+        return [(at, self.hook_pin, 1)]
+
+    def dial_edges(self, number, at=0.0, break_ms=60, make_ms=40, gap=1.0, bounce_ms=0):
+        """
+        Rotary dial pulse train for `number` (str or int), 10 pps by default.
+        Each pulse opens the contact (1) for break_ms and closes it (0) for make_ms.
+        bounce_ms > 0 adds a contact bounce after every opening edge.
+        """
+        edges = []
+        t = at
+        for ch in str(number):
+            pulses = int(ch) or 10
+            for _ in range(pulses):
+                edges.append((t, self.dial_pin, 1))
+                if bounce_ms:
+                    b = bounce_ms / 1000
+                    edges.append((t + b / 2, self.dial_pin, 0))
+                    edges.append((t + b, self.dial_pin, 1))
+                t += break_ms / 1000
+                edges.append((t, self.dial_pin, 0))
+                t += make_ms / 1000
+            t += gap
+        return edges
+
+
+def create_backend(name="edge"):
+    """Build a backend by config name: "edge", "poll", "sim" or "sim-poll"."""
+    if name == "sim":
+        return SimulatedBackend(mode="edge")
+    if name == "sim-poll":
+        return SimulatedBackend(mode="poll")
+    if name == "poll":
+        return GPIOBackend(mode="poll")
+    return GPIOBackend(mode="edge")
@@ -0,0 +1,158 @@
+import re
+import math
+import unicodedata
+from collections import namedtuple, Counter
+from .config import INTENT_CONFIDENCE
+
+# On-device MUSIC/CHAT check for what the caller just said (EN and CZ), so obvious
+# requests don't wait for an LLM round trip. Text is compared without case, punctuation
+# or diacritics ("Pusť" = "pust"), which also absorbs Whisper's spelling variants.
+# Keyword rules decide the clear cases; a tiny naive Bayes model, trained here on
+# TRAINING_EXAMPLES when the classifier is created, scores the rest. Only rule hits
+# are ever confident enough to skip the LLM: the model also rates sentences that merely
+# share music words ("stop the music", "I want to chat") as MUSIC, so its confidence is
+# capped at MODEL_MAX_CONFIDENCE and it only ranks (tools/intent_eval.py).
+# Below INTENT_CONFIDENCE the caller should ask the LLM instead.
+# tools/intent_eval.py measures both against an evaluation set.
+
+# generic: "yes" / "spin the records" - music, but no particular record (search type DEFAULT)
+IntentGuess = namedtuple("IntentGuess", "intent confidence source generic")
+
+_POLITE = (r"(?:(?:please|can you|could you|would you|will you|i want you to|lets|ok|okay|now|so|then|and|just|"
+           r"prosim|muzete|muzes|mohl byste|mohla byste|mohl bys|mohla bys|tak|ted|a|jen|hned)\s+)*")
+_PLAY = (r"(?:play|put on|spin|queue|start playing|i want to hear|i wanna hear|id like to hear|i would like to hear|"
+         r"lets hear|let me hear|pust|pustte|pustit|pustis|zahraj|zahrajte|zahrat|zahrajes|hraj|hrajte|spust|spustte|"
+         r"chci slyset|chtel bych slyset|chtela bych slyset)")
+_ANY_MUSIC = (r"(?:(?:some|the|a|any|more|nejakou|nejake|neco|trochu|nejaky)\s+)?"
+              r"(?:music|records?|tunes|songs?|radio|something|hudbu|hudba|muziku|desky|desku|radio|pisnicky|neco)")
+
+# (pattern on normalized text, intent, confidence, generic), first match wins
+RULES = [
+    # Nothing but agreement, or "play (some) music": any record will do
+    (re.compile(r"^(?:(?:yes|yeah|yep|sure|ok|okay|alright|of course|go ahead|lets do it|do it|why not|absolutely|"
+                r"definitely|please|go on|ano|jo|jasne|urcite|klidne|dobre|tak jo|prosim|sem s tim|do toho|"
+                r"pojdme na to)\s*)+$"), "MUSIC", 0.95, True),
+    (re.compile(rf"^{_POLITE}{_PLAY}(?:\s+{_ANY_MUSIC})?(?:\s+(?:please|now|prosim|ted|hned))*$"), "MUSIC", 0.97, True),
+    # A play command naming something
+    (re.compile(rf"^{_POLITE}{_PLAY}\s+\w"), "MUSIC", 0.95, False),
+]
+
+# Questions and small talk, unless a play verb appears anywhere ("what song did they play").
+# Suggestions ("how about some Motown", "co takhle Olympic") are left to the model.
+CHAT_RULE = re.compile(
+    r"^(?!(?:how|what) about\b|co (?:takhle|treba)\b)"
+    r"(?:what|whats|who|whos|why|when|where|how|hows|which|tell me|do you|did you|are you|is there|is it|have you|explain|describe|hello|hi|hey|good (?:morning|evening|afternoon|night)|thank you|thanks|news|"
+    r"co|cos|kdo|proc|kdy|kde|jak|jaky|jaka|jake|ktery|ktera|ktere|kolik|rekni|reknete|povez|povezte|vypravej|"
+    r"vypravejte|znas|znate|ahoj|dobry den|dobry vecer|dekuji|dekuju|diky|zpravy|novinky)\b")
+CHAT_CONFIDENCE = 0.9
+_PLAY_ANYWHERE = re.compile(rf"\b{_PLAY}\b")
+
+# "Don't play that", "no more music", "vypni to": never started by a rule
+NEGATION = re.compile(r"\b(?:dont|do not|not|never|no more|stop|enough|nechci|nehraj|nehrajte|nepoustej|nepoustejte|"
+                      r"vypni|vypnete|zastav|zastavte|prestan|prestante|dost)\b")
+MODEL_MAX_CONFIDENCE = 0.8 # Always under INTENT_CONFIDENCE: a model guess goes to the LLM
+
+# Timer mode: managing the timers instead of giving a duration. The command word must open the
+# sentence, so "ten minutes, which is when the pasta is done" is still a duration.
+TIMER_COMMANDS = [
+    (re.compile(rf"^{_POLITE}(?:cancel|stop|clear|zrus|zruste|zrusit|zastav|zastavte)\b"), "CANCEL"),
+    (re.compile(rf"^{_POLITE}(?:list|how many|which|kolik|jake|ktere)\b"), "LIST"),
+]
+
+# Model training data: (utterance, intent). Phrasings here are kept out of the evaluation set.
+TRAINING_EXAMPLES = [
+    ("play elvis presley", "MUSIC"), ("play some jazz", "MUSIC"), ("i want to hear the beatles", "MUSIC"),
+    ("put on something by frank sinatra", "MUSIC"), ("can you play hound dog", "MUSIC"),
+    ("spin a record by buddy holly", "MUSIC"), ("lets have some rock and roll", "MUSIC"),
+    ("music please", "MUSIC"), ("start the music", "MUSIC"), ("i would like to listen to abba", "MUSIC"),
+    ("how about some disco", "MUSIC"), ("give us a song by the rolling stones", "MUSIC"),
+    ("the beatles please", "MUSIC"), ("something by queen", "MUSIC"), ("bohemian rhapsody", "MUSIC"),
+    ("let me listen to thriller", "MUSIC"), ("i feel like some swing music", "MUSIC"),
+    ("yes play it", "MUSIC"), ("sounds good lets hear it", "MUSIC"), ("play that song you mentioned", "MUSIC"),
+    ("yes that one", "MUSIC"), ("go on then", "MUSIC"), ("the radio please", "MUSIC"),
+    ("pust elvise", "MUSIC"), ("zahraj beatles", "MUSIC"), ("chci slyset karla gotta", "MUSIC"),
+    ("pustte mi neco od olympicu", "MUSIC"), ("dejte mi nejaky jazz", "MUSIC"), ("hudbu prosim", "MUSIC"),
+    ("neco od waldemara matusky", "MUSIC"), ("mohl byste pustit semafor", "MUSIC"), ("zahrajte rock", "MUSIC"),
+    ("chtel bych si poslechnout abbu", "MUSIC"), ("ano pustte to", "MUSIC"), ("jo tu pisnicku", "MUSIC"),
+    ("poslechnu si marthu a tenu", "MUSIC"), ("tak sem s muzikou", "MUSIC"), ("hraj neco veseleho", "MUSIC"),
+    ("what is popular right now", "CHAT"), ("who is the president", "CHAT"), ("tell me about the moon landing", "CHAT"),
+    ("whats the news today", "CHAT"), ("what happened this year", "CHAT"), ("who sings that song", "CHAT"),
+    ("how are you doing", "CHAT"), ("what is the weather like", "CHAT"), ("is it true that elvis joined the army", "CHAT"),
+    ("what do people do for fun", "CHAT"), ("what is your name", "CHAT"), ("where are you broadcasting from", "CHAT"),
+    ("what was the number one hit", "CHAT"), ("tell me a joke", "CHAT"), ("that is interesting", "CHAT"),
+    ("i love that era", "CHAT"), ("what did you have for breakfast", "CHAT"), ("who won the world cup", "CHAT"),
+    ("how much does a car cost", "CHAT"), ("what movies are in the cinema", "CHAT"), ("no thank you", "CHAT"),
+    ("co je noveho", "CHAT"), ("kdo je prezident", "CHAT"), ("rekni mi neco o tom roce", "CHAT"),
+    ("jake je pocasi", "CHAT"), ("co se ted posloucha", "CHAT"), ("kdo zpiva tu pisen", "CHAT"),
+    ("jak se mate", "CHAT"), ("co se stalo v tomhle roce", "CHAT"), ("kolik stoji chleba", "CHAT"),
+    ("co davaji v kine", "CHAT"), ("to je zajimave", "CHAT"), ("povezte mi vtip", "CHAT"),
+    ("jaka je nejznamejsi kapela", "CHAT"), ("odkud vysilate", "CHAT"), ("ne dekuji", "CHAT"),
+]
+
+
+def normalize(text):
+    """'Pusť mi Beatles, prosím!' -> 'pust mi beatles prosim'"""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = re.sub(r"['’`]", "", text)
+    return " ".join(re.sub(r"[^\w]+", " ", text).split())
+
+
+def timer_command(text):
+    """Timer mode: "CANCEL" or "LIST" when the caller manages their timers, None for a duration."""
+    norm = normalize(text)
+    for pattern, command in TIMER_COMMANDS:
+        if pattern.search(norm):
+            return command
+    return None
+
+
+class IntentClassifier:
+    """
+    classify(text) -> IntentGuess. Rules first; otherwise the naive Bayes model over
+    words and word pairs (features not seen in training are ignored).
+    """
+    def __init__(self, examples=TRAINING_EXAMPLES, threshold=INTENT_CONFIDENCE):
+        self.threshold = threshold
+        self.counts = {"MUSIC": Counter(), "CHAT": Counter()}
+        docs = Counter()
+        for text, intent in examples:
+            self.counts[intent].update(self._features(normalize(text)))
+            docs[intent] += 1
+        self.priors = {intent: math.log((docs[intent] + 1) / (len(examples) + 2)) for intent in self.counts}
+        self.totals = {intent: sum(c.values()) for intent, c in self.counts.items()}
+        self.vocabulary = set(self.counts["MUSIC"]) | set(self.counts["CHAT"])
+
+    def classify(self, text):
+        norm = normalize(text)
+        if not norm:
+            return IntentGuess("CHAT", 0.0, "empty", False)
+        negated = NEGATION.search(norm)
+        for pattern, intent, confidence, generic in RULES:
+            if not negated and pattern.search(norm):
+                return IntentGuess(intent, confidence, "rules", generic)
+        if CHAT_RULE.search(norm) and not _PLAY_ANYWHERE.search(norm):
+            return IntentGuess("CHAT", CHAT_CONFIDENCE, "rules", False)
+        return self._model(norm)
+
+    def confident(self, guess, threshold=None):
+        """True if the guess can stand without asking the LLM (rule hits only)."""
+        return guess.source == "rules" and guess.confidence >= (self.threshold if threshold is None else threshold)
+
+    def _model(self, norm):
+        known = [f for f in self._features(norm) if f in self.vocabulary]
+        if not known:
+            return IntentGuess("CHAT", 0.5, "model", False)
+        size = len(self.vocabulary)
+        scores = {}
+        for intent, counts in self.counts.items():
+            scores[intent] = self.priors[intent] + sum(
+                math.log((counts[f] + 1) / (self.totals[intent] + size)) for f in known)
+        intent = max(scores, key=scores.get)
+        other = min(scores, key=scores.get)
+        confidence = 1 / (1 + math.exp(scores[other] - scores[intent]))
+        return IntentGuess(intent, min(confidence, MODEL_MAX_CONFIDENCE), "model", False)
+
+    def _features(self, norm):
+        words = norm.split()
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])] + [f"^{words[0]}"] if words else []
@@ -0,0 +1,224 @@
+import os
+import json
+import time
+import random
+import threading
+from collections import namedtuple, Counter
+from .config import DECADE_VOICES, INTRO_POOL_FILE, INTRO_POOL_PER_TOPIC, INTRO_POOL_MAX_BYTES
+from .config import INTRO_POOL_MEMORY_BYTES, INTRO_POOL_START_DELAY
+from .brain import INTRO_TOPICS
+
+# A ready intro: text plus its finished audio (voice + decade FX)
+PooledIntro = namedtuple("PooledIntro", "text pcm")
+
+
+class IntroPool(threading.Thread):
+    """
+    Keeps host intros ready for every decade x language x topic, so dialing a year
+    starts talking at once instead of waiting for the LLM and TTS.
+    Intros are written for the whole decade (Brain.generate_host_intro(decade=True)) and
+    rendered like phrase bank lines into the TTS cache; the index (INTRO_POOL_FILE) keeps
+    them across restarts. take() hands one out and forgets it; the thread refills while
+    the phone is idle: every decade x language gets one intro before any gets a second,
+    the current language first, until INTRO_POOL_MAX_BYTES of audio is ready.
+    Up to INTRO_POOL_MEMORY_BYTES of it is also pinned in memory.
+    """
+    def __init__(self, brain, audio, is_idle=None, language=None, languages=("EN", "CZ"),
+                 per_topic=INTRO_POOL_PER_TOPIC, max_bytes=INTRO_POOL_MAX_BYTES,
+                 memory_bytes=INTRO_POOL_MEMORY_BYTES, path=INTRO_POOL_FILE, start_delay=INTRO_POOL_START_DELAY):
+        super().__init__()
+        self.daemon = True
+        self.brain = brain
+        self.audio = audio
+        self.is_idle = is_idle or (lambda: True)
+        self.language = language or (lambda: languages[0]) # Filled first
+        self.languages = languages
+        self.decades = sorted(k for k in DECADE_VOICES if isinstance(k, int))
+        self.per_topic = per_topic
+        self.max_bytes = max_bytes
+        self.memory_bytes = memory_bytes
+        self.path = path
+        self.start_delay = start_delay
+        self.running = True
+        self.wake = threading.Event()
+
+        self.lock = threading.Lock()
+        self.entries = [] # {"decade", "language", "topic", "text", "key", "bytes", "pinned"}
+        self.total_bytes = 0
+        self.pinned_bytes = 0
+
+        # Stats
+        self.served = 0
+        self.empty = 0
+        self.rendered = 0
+        self.failed = 0
+
+    def _voice(self, decade):
+        return DECADE_VOICES.get(decade, DECADE_VOICES[1900])
+
+    def _key(self, decade, text):
+        voice = self._voice(decade)
+        return self.audio.cache_key(text, voice['id'], voice['settings'], voice['model'], decade)
+
+    def has(self, year, language):
+        """True if take() would return an intro for this year's decade."""
+        decade = (int(year) // 10) * 10
+        with self.lock:
+            return any(e["decade"] == decade and e["language"] == language for e in self.entries)
+
+    def take(self, year, language):
+        """A PooledIntro for the year's decade (removed from the pool), or None."""
+        decade = (int(year) // 10) * 10
+        with self.lock:
+            ready = [e for e in self.entries if e["decade"] == decade and e["language"] == language]
+            entry = random.choice(ready) if ready else None
+            if entry:
+                self._remove(entry)
+        if entry is None:
+            self.empty += 1
+            print(f"   (Intro pool: nothing ready for {decade}s {language} | served {self.served}, empty {self.empty})")
+            return None
+        pcm = self.audio.tts_cache.load(entry["key"])
+        self.audio.tts_cache.discard(entry["key"]) # Each intro is heard once
+        self._save()
+        self.wake.set()
+        if not pcm:
+            return None
+        self.served += 1
+        print(f"   (Intro pool: {decade}s {language} topic {entry['topic']} | served {self.served}, empty {self.empty}, "
+              f"{len(self.entries)} ready, {self.total_bytes / 1e6:.1f} MB)")
+        return PooledIntro(entry["text"], pcm)
+
+    def _remove(self, entry):
+        self.entries.remove(entry)
+        self.total_bytes -= entry["bytes"]
+        if entry["pinned"]:
+            self.pinned_bytes -= entry["bytes"]
+
+    def run(self):
+        time.sleep(self.start_delay) # After the phrase bank has started
+        self._load()
+        while self.running:
+            if not self.is_idle():
+                time.sleep(1.0) # A call is in progress; don't compete for bandwidth
+                continue
+            self._promote()
+            slot = self._next_slot()
+            if slot is None:
+                self.wake.wait(60.0) # Full (or over budget) until take() frees room
+                self.wake.clear()
+                continue
+            if not self._fill(*slot):
+                time.sleep(30.0) # Network trouble; try again later
+
+    def _next_slot(self):
+        """(decade, language, topic) to render next, or None when full or out of budget."""
+        with self.lock:
+            if self.entries and self.total_bytes + self.total_bytes / len(self.entries) > self.max_bytes:
+                return None
+            counts = Counter((e["decade"], e["language"], e["topic"]) for e in self.entries)
+            ready = Counter((e["decade"], e["language"]) for e in self.entries)
+        preferred = self.language()
+        best = None
+        for language in self.languages:
+            for decade in self.decades:
+                for topic in range(len(INTRO_TOPICS[language])):
+                    if counts.get((decade, language, topic), 0) >= self.per_topic:
+                        continue
+                    rank = (ready[(decade, language)], language != preferred, decade, topic)
+                    if best is None or rank < best[0]:
+                        best = (rank, (decade, language, topic))
+        return best[1] if best else None
+
+    def _fill(self, decade, language, topic):
+        start = time.monotonic()
+        text = self.brain.generate_host_intro(decade, language, topic=topic, decade=True)
+        if not text or not self.running:
+            self.failed += 1
+            return False
+        voice = self._voice(decade)
+        status = self.audio.render(text, voice_id=voice['id'], voice_settings=voice['settings'],
+                                   model_id=voice['model'], year=decade)
+        key = self._key(decade, text)
+        pcm = self.audio.tts_cache.load(key) if status else None
+        if not pcm:
+            self.failed += 1
+            return False
+        entry = {"decade": decade, "language": language, "topic": topic, "text": text, "key": key,
+                 "bytes": len(pcm), "pinned": False}
+        with self.lock:
+            self.entries.append(entry)
+            self.total_bytes += entry["bytes"]
+            self._pin(entry, pcm)
+        self._save()
+        self.rendered += 1
+        print(f"📻 Intro pool: {decade}s {language} topic {topic} ready in {time.monotonic() - start:.1f}s "
+              f"({len(self.entries)} ready, {self.total_bytes / 1e6:.1f} MB, {self.pinned_bytes / 1e6:.1f} MB in memory)")
+        return True
+
+    def _pin(self, entry, pcm):
+        """Keep in memory if the memory budget allows (call with the lock held)."""
+        if self.pinned_bytes + entry["bytes"] <= self.memory_bytes:
+            self.audio.tts_cache.pin(entry["key"], pcm)
+            entry["pinned"] = True
+            self.pinned_bytes += entry["bytes"]
+
+    def _promote(self):
+        """Pin intros that are only on disk once taken ones have freed memory."""
+        with self.lock:
+            waiting = [e for e in self.entries if not e["pinned"]]
+        for entry in waiting:
+            if self.pinned_bytes + entry["bytes"] > self.memory_bytes:
+                break
+            pcm = self.audio.tts_cache.load(entry["key"])
+            with self.lock:
+                if pcm and entry in self.entries and not entry["pinned"]:
+                    self._pin(entry, pcm)
+
+    def _load(self):
+        """Intros left from the last run whose audio is still cached and whose voice/FX is unchanged."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                saved = json.load(f).get("entries", [])
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"   ⚠️ Intro pool index unreadable ({e})")
+            return
+        kept = 0
+        for entry in saved:
+            try:
+                stale = entry["key"] != self._key(entry["decade"], entry["text"])
+            except Exception:
+                continue
+            pcm = None if stale else self.audio.tts_cache.load(entry["key"])
+            if not pcm:
+                self.audio.tts_cache.discard(entry["key"])
+                continue
+            entry.update(bytes=len(pcm), pinned=False)
+            with self.lock:
+                if self.total_bytes + entry["bytes"] > self.max_bytes:
+                    self.audio.tts_cache.discard(entry["key"])
+                    continue
+                self.entries.append(entry)
+                self.total_bytes += entry["bytes"]
+                self._pin(entry, pcm)
+            kept += 1
+        self._save()
+        print(f"📻 Intro pool: {kept} intros kept from the last run ({self.total_bytes / 1e6:.1f} MB)")
+
+    def _save(self):
+        with self.lock:
+            entries = [{k: e[k] for k in ("decade", "language", "topic", "text", "key")} for e in self.entries]
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = f"{self.path}.{threading.get_ident()}.tmp" # take() and the refill thread both save
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"entries": entries}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            print(f"   (Could not save intro pool: {e})")
+
+    def stop(self):
+        self.running = False
+        self.wake.set()
@@ -0,0 +1,313 @@
+import os
+import time
+import wave
+import threading
+import subprocess
+from collections import deque
+import numpy as np
+from .config import AUDIO_DEVICE_ID, TTS_SAMPLE_RATE, MIXER_PERIOD, MIXER_BUFFER_PERIODS
+
+try:
+    import alsaaudio # Optional (pyalsaaudio): direct ALSA writes, lowest latency
+except ImportError:
+    alsaaudio = None
+
+# Lower number = lower priority. While a channel plays, all lower ones are muted
+# (speech over dial tone would be unintelligible on a handset).
+CHANNELS = {"tone": 0, "fx": 1, "speech": 2}
+
+def load_wav(path, rate=TTS_SAMPLE_RATE):
+    """Decode a PCM wav (path or file object, e.g. io.BytesIO) into mono int16 at `rate`."""
+    with wave.open(path, "rb") as f:
+        if f.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit wav is supported")
+        channels, file_rate = f.getnchannels(), f.getframerate()
+        samples = np.frombuffer(f.readframes(f.getnframes()), dtype="<i2")
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    if file_rate != rate:
+        n = int(len(samples) * rate / file_rate)
+        samples = np.interp(np.arange(n) * file_rate / rate, np.arange(len(samples)), samples)
+    return samples.astype(np.int16)
+
+
+class Playback:
+    """
+    One sound (or an open stream, or a generator) on a channel. done is set when it finishes or is stopped.
+    A generator is any object whose read(n) returns up to n int16 samples, or None once it has ended
+    (see src/tone_synth.py); it is pulled one period at a time, so it can run forever.
+    """
+    def __init__(self, samples=None, loop=False, generator=None, exclusive=False):
+        self.chunks = deque([samples] if samples is not None and len(samples) else [])
+        self.pos = 0 # Offset into chunks[0]
+        self.loop = loop
+        self.source = samples # For looping
+        self.generator = generator
+        self.streaming = samples is None and generator is None # write() more until close()
+        self.stopped = False
+        self.started = False # Has produced sound (an empty stream doesn't mute anything yet)
+        self.exclusive = exclusive # Once started, lower channels are stopped instead of muted
+        self.done = threading.Event()
+
+    def write(self, pcm):
+        """Append raw S16_LE bytes (streams only). Never blocks."""
+        data = np.frombuffer(pcm[:len(pcm) - len(pcm) % 2], dtype="<i2")
+        if len(data):
+            self.chunks.append(data)
+
+    def close(self):
+        """No more data: finish once the buffered audio has played."""
+        self.streaming = False
+
+    def stop(self):
+        self.stopped = True
+        self.done.set()
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+    def read(self, n):
+        """Up to n samples, or None if nothing is available right now."""
+        if self.stopped:
+            return None
+        if self.generator:
+            data = self.generator.read(n)
+            if data is None:
+                self.generator = None # Ended
+            return data
+        out = []
+        need = n
+        while need and self.chunks:
+            chunk = self.chunks[0]
+            take = chunk[self.pos:self.pos + need]
+            out.append(take)
+            need -= len(take)
+            self.pos += len(take)
+            if self.pos >= len(chunk):
+                self.chunks.popleft()
+                self.pos = 0
+                if self.loop and not self.chunks:
+                    self.chunks.append(self.source) # Gapless: wrap inside the same period
+        if not out:
+            return None
+        return out[0] if len(out) == 1 else np.concatenate(out)
+
+    @property
+    def finished(self):
+        return self.stopped or (not self.chunks and not self.streaming and self.generator is None)
+
+
+class Mixer(threading.Thread):
+    """
+    One long-lived output stream on the handset device, fed in MIXER_PERIOD frames.
+    Sounds are played from memory on priority channels; starting or stopping one
+    takes effect at the next period (a few ms) instead of a process spawn/kill.
+    Output goes through pyalsaaudio if installed, else through a single persistent aplay.
+    """
+    def __init__(self, device=None, rate=TTS_SAMPLE_RATE, period=MIXER_PERIOD):
+        super().__init__()
+        self.daemon = True
+        self.device = device or f"plughw:{AUDIO_DEVICE_ID},0"
+        self.rate = rate
+        self.period = period
+
+        self.lock = threading.Lock()
+        self.playing = {} # channel -> Playback
+        self.sounds = {} # name -> int16 samples
+        self.running = True
+        self.out = None
+        self._proc = None
+        self.latency = period * MIXER_BUFFER_PERIODS / rate # Written -> audible (updated by _open)
+        self.last_sound_t = 0.0 # When the last non-silent period was written
+        self._sounding = False
+        self._level = -120.0 # dBFS of the last mixed period
+        self.levels = deque(maxlen=max(1, rate // period)) # (write time, dBFS) per period, last ~1 s
+
+        # Stats
+        self.underruns = 0 # Device buffer ran dry (the mix loop fell behind)
+        self.starved = 0 # Periods a started stream had no audio yet (waiting for TTS)
+
+    def preload(self, sounds_dir):
+        """Decode every wav in sounds_dir into memory."""
+        for name in sorted(os.listdir(sounds_dir)):
+            if name.endswith(".wav"):
+                try:
+                    self.sounds[name[:-4]] = load_wav(os.path.join(sounds_dir, name), self.rate)
+                except Exception as e:
+                    print(f"   ⚠️ Could not load sound {name}: {e}")
+        print(f"🔊 Mixer: {len(self.sounds)} sounds preloaded ({sum(len(s) for s in self.sounds.values()) * 2 / 1e6:.1f} MB)")
+
+    def play(self, channel, samples, loop=False):
+        """Start samples (int16 array or a preloaded sound name) on a channel, replacing what it played."""
+        if isinstance(samples, str):
+            samples = self.sounds[samples]
+        return self._start(channel, Playback(samples, loop=loop))
+
+    def play_generator(self, channel, generator):
+        """Start a generator (see Playback) on a channel, replacing what it played."""
+        return self._start(channel, Playback(generator=generator))
+
+    def open_stream(self, channel="speech", exclusive=False):
+        """
+        Playback fed incrementally with write(); call close() after the last chunk.
+        exclusive=True: whatever plays on lower channels (e.g. static covering a wait)
+        keeps playing until the stream's first sample, then stops.
+        """
+        return self._start(channel, Playback(exclusive=exclusive))
+
+    def _start(self, channel, playback):
+        with self.lock:
+            previous = self.playing.get(channel)
+            self.playing[channel] = playback
+        if previous:
+            self._finish(previous, stopped=True)
+        return playback
+
+    def stop(self, channel=None):
+        """Stop one channel, or all of them."""
+        with self.lock:
+            if channel is None:
+                stopped, self.playing = list(self.playing.values()), {}
+            else:
+                stopped = [p for p in [self.playing.pop(channel, None)] if p]
+        for playback in stopped:
+            self._finish(playback, stopped=True)
+
+    def is_playing(self, channel=None):
+        with self.lock:
+            if channel is None:
+                return bool(self.playing)
+            return channel in self.playing
+
+    def wait_drained(self, timeout=1.0):
+        """
+        Block until everything already written has left the speaker (nothing playing and
+        the device buffer played out). Returns the seconds actually waited.
+        """
+        start = time.monotonic()
+        while self.is_alive() and (self.is_playing() or time.monotonic() < self.last_sound_t + self.latency):
+            if time.monotonic() - start > timeout:
+                break
+            time.sleep(self.period / self.rate)
+        return time.monotonic() - start
+
+    def output_level_db(self, window=0.1, at=None):
+        """
+        Loudest period written in the `window` seconds before `at` (default: now) that is
+        audible by then, i.e. shifted by the device latency. -120 if silent.
+        """
+        end = (time.monotonic() if at is None else at) - self.latency
+        return max((db for t, db in list(self.levels) if end - window <= t <= end), default=-120.0)
+
+    def _finish(self, playback, stopped=False):
+        if stopped:
+            playback.stop()
+        else:
+            playback.done.set()
+
+    def _mix(self):
+        frame = np.zeros(self.period, dtype=np.int32)
+        replaced = []
+        with self.lock:
+            active = sorted(self.playing.items(), key=lambda item: CHANNELS.get(item[0], 0), reverse=True)
+            top = None
+            exclusive = False
+            for channel, playback in active:
+                if playback.finished:
+                    del self.playing[channel]
+                    self._finish(playback)
+                    continue
+                if top is not None and CHANNELS.get(channel, 0) < top:
+                    if exclusive:
+                        del self.playing[channel]
+                        replaced.append(playback)
+                    continue # Muted by a higher-priority channel
+                data = playback.read(self.period)
+                if data is None:
+                    if playback.streaming and playback.started:
+                        self.starved += 1 # Waiting for the network; the channel still holds priority
+                        top, exclusive = CHANNELS.get(channel, 0), playback.exclusive
+                    continue
+                playback.started = True
+                top, exclusive = CHANNELS.get(channel, 0), playback.exclusive
+                frame[:len(data)] += data
+        for playback in replaced:
+            self._finish(playback, stopped=True)
+        self._sounding = bool(frame.any())
+        power = np.mean(frame.astype(np.float64) ** 2) if self._sounding else 0.0
+        self._level = 10 * np.log10(max(power / 32768.0 ** 2, 1e-12))
+        return np.clip(frame, -32768, 32767).astype("<i2").tobytes()
+
+    def _open(self):
+        if alsaaudio:
+            try:
+                pcm = alsaaudio.PCM(alsaaudio.PCM_PLAYBACK, device=self.device, channels=1, rate=self.rate,
+                                    format=alsaaudio.PCM_FORMAT_S16_LE, periodsize=self.period,
+                                    periods=MIXER_BUFFER_PERIODS)
+                self.out = pcm.write
+                self.latency = self.period * MIXER_BUFFER_PERIODS / self.rate
+                print(f"🔊 Mixer: ALSA {self.device} @ {self.rate} Hz, {self.period * 1000 / self.rate:.1f} ms periods")
+                return True
+            except Exception as e:
+                print(f"   (ALSA open failed: {e}. Using aplay.)")
+        buffer_us = int(self.period * MIXER_BUFFER_PERIODS * 1e6 / self.rate)
+        self._proc = subprocess.Popen(["aplay", "-q", "-t", "raw", "-f", "S16_LE", "-r", str(self.rate), "-c", "1",
+                                       "-D", self.device, "-B", str(buffer_us)], stdin=subprocess.PIPE)
+        self.out = self._write_pipe
+        self.latency = 2 * buffer_us / 1e6 # aplay's buffer plus what we keep ahead of it
+        print(f"🔊 Mixer: aplay pipe {self.device} @ {self.rate} Hz")
+        return False
+
+    def _write_pipe(self, data):
+        self._proc.stdin.write(data)
+        self._proc.stdin.flush()
+
+    def run(self):
+        try:
+            paced_by_device = self._open()
+        except Exception as e:
+            print(f"❌ Mixer Error: {e}")
+            return
+        period_s = self.period / self.rate
+        buffer_s = period_s * MIXER_BUFFER_PERIODS
+        next_t = time.monotonic()
+        last_write = None
+        while self.running:
+            try:
+                self.out(self._mix()) # ALSA blocks until there is room: that is our clock
+                now = time.monotonic()
+                if last_write is not None and now - last_write > buffer_s:
+                    self.underruns += 1 # Longer than the buffer holds: the device played silence
+                last_write = now
+                self.levels.append((now, self._level))
+                if self._sounding:
+                    self.last_sound_t = now
+            except Exception as e:
+                print(f"❌ Mixer Write Error: {e}")
+                time.sleep(1.0)
+                try:
+                    paced_by_device = self._open()
+                except Exception:
+                    pass
+                next_t = time.monotonic()
+                last_write = None
+                continue
+            if not paced_by_device:
+                # A pipe would swallow seconds of audio: stay only a buffer ahead of real time
+                next_t += period_s
+                delay = next_t - time.monotonic() - period_s * MIXER_BUFFER_PERIODS
+                if delay > 0:
+                    time.sleep(delay)
+                elif delay < -1.0:
+                    next_t = time.monotonic() # Fell far behind (suspend?); resync
+                    last_write = None
+
+    def stop_mixer(self):
+        self.running = False
+        self.stop()
+        if self._proc:
+            try:
+                self._proc.stdin.close()
+                self._proc.terminate()
+            except Exception:
+                pass
@@ -3,7 +3,8 @@ import spotipy
 import os
 import subprocess
 from spotipy.oauth2 import SpotifyOAuth
-from .config import SPOTIPY_CLIENT_ID, SPOTIPY_CLIENT_SECRET, SPOTIPY_REDIRECT_URI
+from .config import SPOTIPY_CLIENT_ID, SPOTIPY_CLIENT_SECRET, SPOTIPY_REDIRECT_URI, DECADE_PLAYLISTS
+from .events import session_cancelled
 
 import random
 
@@ -20,6 +21,7 @@ class MusicEngine:
         ))
         self.device_id = None
         self.is_playing = False # Track state
+        self.playlist_cache = {} # "search:" query -> resolved playlist URI
 
     def start_embedded_player(self):
         """Starts the embedded librespot player as a subprocess."""
@@ -198,8 +200,17 @@ class MusicEngine:
             except:
                 pass
 
+    def _session_over(self, what):
+        """True if the dial session asking for music was pre-empted (its music must not replace the new one's)."""
+        if session_cancelled():
+            print(f"   (Dial session ended: not playing {what})")
+            return True
+        return False
+
     def play_track(self, uri, retry=True):
         if not self.device_id: self.find_device()
+        if self._session_over(uri):
+            return
         try:
             self.set_volume(100)
             self.sp.start_playback(device_id=self.device_id, uris=[uri])
@@ -212,6 +223,8 @@ class MusicEngine:
 
     def play_playlist(self, playlist_uri, retry=True):
         if not self.device_id: self.find_device()
+        if self._session_over(playlist_uri):
+            return
         try:
             self.set_volume(100)
             self.sp.start_playback(device_id=self.device_id, context_uri=playlist_uri)
@@ -222,6 +235,34 @@ class MusicEngine:
             if retry and self._handle_playback_error(e):
                  self.play_playlist(playlist_uri, retry=False)
 
+    def resolve_playlist(self, query):
+        """Resolve a playlist search to a URI once and cache it (safe to call from prefetch threads)."""
+        if query in self.playlist_cache:
+            return self.playlist_cache[query]
+        try:
+            results = self.sp.search(q=query, limit=1, type='playlist')
+            uri = results['playlists']['items'][0]['uri']
+        except Exception as e:
+            print(f"   (Playlist resolve failed for '{query}': {e})")
+            return None
+        self.playlist_cache[query] = uri
+        return uri
+
+    def get_decade_playlist(self, decade, language="EN"):
+        """
+        DECADE_PLAYLISTS entry for a decade as a playable URI.
+        'search:' entries are resolved (and cached). Returns (uri, query) where
+        uri is None if the search could not be resolved.
+        """
+        playlists = DECADE_PLAYLISTS.get(decade)
+        if not playlists:
+            return None, None
+        uri = playlists.get(language, playlists["EN"])
+        if uri.startswith("search:"):
+            query = uri.replace("search:", "").strip()
+            return self.resolve_playlist(query), query
+        return uri, None
+
     def search_and_play(self, query, type='playlist', retry=True):
         """Search Spotify and play the first result."""
         if not self.device_id: self.find_device()
@@ -259,6 +300,8 @@ class MusicEngine:
                  try: uri = results['artists']['items'][0]['uri']
                  except: pass
 
+            if uri and self._session_over(uri):
+                return False
             if uri:
                 self.set_volume(100) # This might fail if device is dead
                 if type == 'playlist' or type == 'album' or type == 'artist':
@@ -1,188 +1,218 @@
-import RPi.GPIO as GPIO
 import time
 import threading
-from .config import HOOK_PIN, DIAL_PIN, BELL_PINS, BELL_SPEED
+from .config import HOOK_PIN, DIAL_PIN, BELL_PINS, INPUT_BACKEND, DIAL_END_MAX
+from .gpio_backend import create_backend
+from .pulse_decoder import PulseDecoder, DecoderTimings, HOOK, DIAL
+from .events import EventDispatcher, HookEvent, DialEvent, PrefixEvent
+from .dial_plan import EndOfNumberPredictor, AMBIGUOUS, classify
+from .ringer import Ringer
 
 class PhoneInterface(threading.Thread):
-    def __init__(self, on_hook_change=None, on_dial_complete=None):
+    def __init__(self, on_hook_change=None, on_dial_complete=None, backend=None, timings=None, on_dial_prefix=None,
+                 dispatcher=None, on_preempt=None):
         super().__init__()
-        self.on_hook_change = on_hook_change
-        self.on_dial_complete = on_dial_complete
-        
+        # Callbacks never run on this thread: the sampling loop only posts events,
+        # the dispatcher runs them (and pre-empts a running dial session on hang-up/re-dial)
+        self.dispatcher = dispatcher or EventDispatcher(
+            on_hook_change=on_hook_change,
+            on_dial_complete=on_dial_complete,
+            on_dial_prefix=on_dial_prefix, # Partial number (str) after each digit, for prefetching
+            on_preempt=on_preempt
+        )
+
         # Daemon thread to ensure it dies with main program
         self.daemon = True
 
-        # Setup GPIO
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setup(HOOK_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-        GPIO.setup(DIAL_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-        
-        # Setup Bell (L298N)
-        GPIO.setup(BELL_PINS, GPIO.OUT)
-        GPIO.output(BELL_PINS, GPIO.LOW)
+        # Setup Input Backend (GPIO edges, polling or simulator)
+        self.backend = backend or create_backend(INPUT_BACKEND)
+        self.backend.setup((HOOK_PIN, DIAL_PIN), BELL_PINS)
+
+        # Setup Bell (L298N), driven by its own thread
+        self.backend.output(BELL_PINS, 0)
+        self.ringer = Ringer(self.backend)
 
         # State
-        self.last_hook_state = GPIO.input(HOOK_PIN)
+        self.last_hook_state = self.backend.read(HOOK_PIN)
+        self.initial_dial_val = self.backend.read(DIAL_PIN)
         self.is_off_hook = (self.last_hook_state == 0) # Public State
 
-        self.pulse_count = 0
-        self.last_pulse_time = 0
         self.dialing_active = False
         self.running = True
-        
-        # Debounce / Ghost Pulse filtering
-        self.off_hook_time = 0
-        
+
+        # Debounce / Pulse decoding (calibrated per phone if dial_calibration.json exists)
+        self.timings = timings or DecoderTimings.load()
+        self.decoder = None
+
         # Buffering State
         self.digit_buffer = []
         self.last_digit_time = 0
-        self.digit_timeout = 2.5 
+        self.predictor = EndOfNumberPredictor.load() # When to stop waiting for more digits
+        self.last_timed_flush = None # (prefix, last digit time) of the last ambiguous flush
+
+        # Loop Stats (CPU of the sampling thread, wakeups)
+        self.loop_wakeups = 0
+        self.loop_cpu_time = 0.0
+        self.loop_start_time = 0
 
     def run(self):
-        print("   (Phone Interface Thread Started: Debounced)")
-        
-        # Initial State
-        self.last_hook_state = GPIO.input(HOOK_PIN)
-        self.last_dial_val = GPIO.input(DIAL_PIN)
-        
-        # Hook Debounce State
-        self.hook_stable_start_time = 0
-        self.pending_hook_state = self.last_hook_state
-        
-        # Pulse Counting
-        self.pulse_count = 0
-        self.last_pulse_time = 0
-        # Sync local with public
-        self.is_off_hook = (self.last_hook_state == 0)
-        
-        # Lockout
-        self.off_hook_time = 0
-        if self.is_off_hook: self.off_hook_time = time.time()
-        
+        print(f"   (Phone Interface Thread Started: {self.backend.mode} backend)")
+        backend = self.backend
+
+        # Decoder starts from the levels read in __init__; edges queued since then are replayed below
+        self.decoder = PulseDecoder(self.timings, hook_level=self.last_hook_state,
+                                    dial_level=self.initial_dial_val, t=backend.now())
+        self.is_off_hook = self.decoder.is_off_hook
+
+        self.loop_start_time = backend.now()
+        cpu_start = time.thread_time()
+
         while self.running:
-            now = time.time()
-            
-            # --- 1. HOOK DEBOUNCE (Pin 22) ---
-            current_hook = GPIO.input(HOOK_PIN)
-            
-            if current_hook != self.pending_hook_state:
-                # State changed relative to pending? Reset timer.
-                self.pending_hook_state = current_hook
-                self.hook_stable_start_time = now
-            else:
-                # State is consistent with pending. Check duration.
-                if (now - self.hook_stable_start_time) > 0.2: # 200ms stable
-                    if current_hook != self.last_hook_state:
-                         # CONFIRMED CHANGE
-                         self.last_hook_state = current_hook
-                         self.is_off_hook = (current_hook == 0) # 0 = Lifted
-                         
-                         print(f"   (DEBUG: Hook={current_hook} -> OffHook={self.is_off_hook})")
-                         
-                         if self.is_off_hook:
-                             self.off_hook_time = now
-                             # print("\n📞 HANDSET LIFTED") # Handled by main.py
-                             if self.on_hook_change: self.on_hook_change(True)
-                         else:
-                             self.off_hook_time = 0
-                             # print("\n📞 HANDSET REPLACED") # Handled by main.py
-                             # FLUSH BUFFER ON HANGUP (Submit whatever we have)
-                             self._check_buffer_timeout(force=True)
-                             
-                             if self.on_hook_change: self.on_hook_change(False)
-                             self.digit_buffer = []
-                             self.pulse_count = 0
-
-            # --- 2. DIAL DETECTION (Pin 27) ---
-            if self.is_off_hook:
-                # Ghost Lockout (0.8s is enough with good debounce)
-                if (now - self.off_hook_time) < 0.8:
-                    self.pulse_count = 0
+            # Sleep until the next edge or the next debounce/timeout deadline
+            edge = backend.wait_edge(timeout=self._next_deadline(backend.now()))
+            self.loop_wakeups += 1
+
+            events = []
+            if edge:
+                pin, level, t = edge
+                channel = HOOK if pin == HOOK_PIN else DIAL
+                pulses_before = self.decoder.pulse_count
+                events += self.decoder.feed(channel, level, t)
+                if pulses_before == 0 and self.decoder.pulse_count > 0:
+                    self._on_digit_start(self.decoder.last_pulse_time)
+
+            now = backend.now()
+            self._verify_hook(now)
+            events += self.decoder.advance(now)
+
+            new_digit = False
+            for kind, value, t in events:
+                if kind == "hook":
+                    self._confirm_hook(value)
                 else:
-                    current_dial = GPIO.input(DIAL_PIN)
-                    
-                    # RISING EDGE (0 -> 1)
-                    if current_dial == 1 and self.last_dial_val == 0:
-                        # Debounce (25ms)
-                        if (now - self.last_pulse_time) > 0.025:
-                            self.pulse_count += 1
-                            self.last_pulse_time = now
-                            # print(f"      (Rise! {self.pulse_count})") # UNCOMMENTED
-                    
-                    self.last_dial_val = current_dial
-                    
-                    # Timeout (End of Digit) -> 0.7s
-                    if self.pulse_count > 0 and (now - self.last_pulse_time) > 0.7:
-                         final_number = self.pulse_count
-                         if final_number == 10: final_number = 0
-                         
-                         print(f"   (Digit Buffered: {final_number})")
-                         self.digit_buffer.append(final_number)
-                         self.pulse_count = 0
-                         self.last_digit_time = now
-
-            # --- 3. BUFFER ---
+                    print(f"   (Digit Buffered: {value})")
+                    self.digit_buffer.append(value)
+                    self.last_digit_time = t
+                    new_digit = True
+
+            # --- BUFFER ---
             self._check_buffer_timeout()
-            
-            time.sleep(0.001)
+
+            # Number still incomplete? Let listeners start work early.
+            if new_digit and self.digit_buffer:
+                self.dispatcher.post(PrefixEvent("".join(str(d) for d in self.digit_buffer), now))
+            self.loop_cpu_time = time.thread_time() - cpu_start
+
+    def _next_deadline(self, now):
+        """Seconds until something may need to fire. Caps the idle wait so `running` is re-checked."""
+        deadlines = [now + 0.5]
+        decoder_deadline = self.decoder.next_deadline()
+        if decoder_deadline is not None:
+            deadlines.append(decoder_deadline)
+        if self.digit_buffer and self.decoder.pulse_count == 0:
+            deadlines.append(self.last_digit_time + self.predictor.timeout_for(self._buffer_prefix()))
+        # Small margin so the strict '>' comparisons are already true on wake-up
+        return max(0.0, min(deadlines) - now + 0.001)
+
+    def _verify_hook(self, now):
+        """Before confirming a hook change, check the pin really is there (an edge may have been missed)."""
+        decoder = self.decoder
+        if decoder.hook_pending and now >= decoder.hook_stable_start_time + decoder.timings.hook_debounce:
+            current_hook = self.backend.read(HOOK_PIN)
+            if current_hook != decoder.pending_hook_state:
+                decoder.feed(HOOK, current_hook, now)
+
+    def _confirm_hook(self, is_off_hook):
+        # CONFIRMED CHANGE
+        self.last_hook_state = 0 if is_off_hook else 1
+        self.is_off_hook = is_off_hook # 0 = Lifted
+
+        print(f"   (DEBUG: Hook={self.last_hook_state} -> OffHook={self.is_off_hook})")
+
+        if self.is_off_hook:
+            self.ringer.silence() # Picked up: stop within one hammer stroke
+            self.dispatcher.post(HookEvent(True, self.backend.now()))
+        else:
+            # FLUSH BUFFER ON HANGUP (Submit whatever we have)
+            self._check_buffer_timeout(force=True)
+
+            self.dispatcher.post(HookEvent(False, self.backend.now()))
+            self.digit_buffer = []
 
     def start_interface(self):
+        self.dispatcher.start()
+        self.ringer.start()
         self.start()
 
+    def stats(self):
+        """Backend edge latency plus CPU share of the sampling thread."""
+        stats = self.backend.stats()
+        elapsed = self.backend.now() - self.loop_start_time if self.loop_start_time else 0
+        stats["loop_wakeups"] = self.loop_wakeups
+        stats["loop_cpu_s"] = self.loop_cpu_time
+        stats["loop_cpu_pct"] = (100.0 * self.loop_cpu_time / elapsed) if elapsed else 0.0
+        return stats
+
+    def _buffer_prefix(self):
+        return "".join(str(d) for d in self.digit_buffer)
+
+    def _on_digit_start(self, t):
+        """First pulse of a digit: learn this phone's inter-digit pause."""
+        if self.digit_buffer:
+            self.predictor.observe_gap(t - self.last_digit_time)
+        elif self.last_timed_flush and t - self.last_timed_flush[1] <= DIAL_END_MAX:
+            # We flushed an ambiguous prefix and the caller kept dialing: the timeout was too short.
+            prefix, digit_time = self.last_timed_flush
+            print(f"   ⚠️ Number '{prefix}' was flushed while still dialing. Learning a longer pause.")
+            self.predictor.observe_gap(t - digit_time)
+        self.last_timed_flush = None
+
     def _check_buffer_timeout(self, force=False):
         if not self.digit_buffer:
             return
 
-        time_since_digit = time.time() - self.last_digit_time
-        
+        prefix = self._buffer_prefix()
+        time_since_digit = self.backend.now() - self.last_digit_time
+
         should_flush = False
         if force:
             should_flush = True
         elif len(self.digit_buffer) >= 4:
-            should_flush = True 
-        elif time_since_digit > 4.0: 
-            should_flush = True 
-            
+            should_flush = True
+        elif self.decoder and self.decoder.pulse_count > 0:
+            should_flush = False # Next digit is being dialed right now
+        elif time_since_digit >= self.predictor.timeout_for(prefix):
+            # Immediate for numbers nothing longer can start with (0, 9, 666, 1965...)
+            should_flush = True
+            if classify(prefix) == AMBIGUOUS:
+                self.last_timed_flush = (prefix, self.last_digit_time)
+
         if should_flush:
             full_number = 0
             for digit in self.digit_buffer:
                 full_number = full_number * 10 + digit
-            
-            if self.on_dial_complete:
-                self.on_dial_complete(full_number)
-            
+
+            print(f"   (Number Complete: {prefix} after {time_since_digit:.2f}s)")
+            self.dispatcher.post(DialEvent(full_number, self.backend.now()))
+
             self.digit_buffer = []
 
     # Legacy Stubs
     def _check_hook(self): pass
     def _check_dial(self): pass
 
-    def ring_bell(self, duration=3.0):
+    def ring_bell(self, duration=3.0, cadence="BURST"):
         """
-        Rings the mechanical bell for the specified duration (blocking).
-        Run this in a separate thread if you don't want to freeze the app.
+        Rings the mechanical bell for the specified duration (non-blocking).
+        `cadence` is a RING_CADENCES name or a list of (on, off) seconds.
+        Overlapping rings are merged/queued by the Ringer; lifting the handset silences it.
         """
-        print(f"🔔 RINGING BELL for {duration}s...")
-        end_time = time.time() + duration
-        
-        try:
-            while time.time() < end_time and self.running:
-                # Hammer Strike
-                GPIO.output(BELL_PINS[0], GPIO.HIGH)
-                GPIO.output(BELL_PINS[1], GPIO.LOW)
-                time.sleep(BELL_SPEED)
-                
-                # Hammer Return
-                GPIO.output(BELL_PINS[0], GPIO.LOW)
-                GPIO.output(BELL_PINS[1], GPIO.HIGH)
-                time.sleep(BELL_SPEED)
-        except Exception as e:
-            print(f"❌ Bell Error: {e}")
-        finally:
-            # Silence
-            GPIO.output(BELL_PINS, GPIO.LOW)
-            print("🔕 Bell Silence")
+        self.ringer.ring(duration=duration, cadence=cadence)
+
+    def silence_bell(self):
+        self.ringer.silence()
 
     def cleanup(self):
         self.running = False
-        GPIO.cleanup()
+        self.dispatcher.stop()
+        self.ringer.stop()
+        self.backend.cleanup()
@@ -0,0 +1,93 @@
+import time
+import threading
+from .config import DECADE_VOICES, PHRASE_BANK_START_DELAY
+
+# Fixed lines spoken by main.py, by language. Use phrase() in main.py so the
+# spoken text always matches what was pre-rendered.
+# Operator lines: operator voice, no FX.
+OPERATOR_PHRASES = {
+    "operator_intro": {"EN": "Operator here. How may I help?", "CZ": "Tady centrála. Jak vám mohu pomoci?"},
+    "operator_apology": {"EN": "Apologies. Who did you want?", "CZ": "Omlouvám se. Koho?"},
+    "operator_no_input": {"EN": "I didn't hear anything. Disconnecting.", "CZ": "Nemohu vás momentálně spojit."},
+    "switch_language": {"EN": "Switching to Czech Mode.", "CZ": "Přepínám do angličtiny."}, # Keyed by the language being left
+    "timer_intro": {"EN": "Timer mode. How long should I set it for?", "CZ": "Časovač. Na jak dlouho ho mám nastavit?"},
+    "timer_no_input": {"EN": "I didn't hear a duration. Timer cancelled.", "CZ": "Bez zadané doby časovač nenastavím."},
+    "timer_none": {"EN": "You have no timers set.", "CZ": "Nemáte nastavený žádný časovač."},
+    "timer_not_understood": {"EN": "I couldn't understand the time. Please try again.",
+                             "CZ": "Té době nerozumím. Zkuste to prosím znovu."},
+}
+
+# Operator lines with numbers filled in (phrase(name, language, **fields)): not pre-rendered.
+OPERATOR_TEMPLATES = {
+    "timer_set": {"EN": "Setting timer for {seconds} seconds.", "CZ": "Nastavuji časovač na {seconds} sekund."},
+    "timers_cancelled": {"EN": "Cancelled {count} timers.", "CZ": "Zrušené časovače: {count}."},
+    "timers_pending": {"EN": "You have {count} timers. The next one rings in {seconds} seconds.",
+                       "CZ": "Nastavené časovače: {count}. Další zazvoní za {seconds} sekund."},
+}
+
+# Host lines: rendered for every decade voice with that decade's FX.
+HOST_PHRASES = {
+    "coming_up": {"EN": "Coming right up!", "CZ": "Už to hraje!"},
+    "host_apology": {"EN": "Apologies. Who did you want to hear?", "CZ": "Omlouvám se. Koho chcete slyšet?"},
+    "record_not_found": {"EN": "I couldn't find that specific record, so here is the radio instead.",
+                         "CZ": "Tu skladbu nemohu najít, ale pustím vám rádio."},
+}
+
+def phrase(name, language="EN", **fields):
+    table = OPERATOR_PHRASES.get(name) or HOST_PHRASES.get(name) or OPERATOR_TEMPLATES[name]
+    text = table.get(language) or table["EN"]
+    return text.format(**fields) if fields else text
+
+
+class PhraseBank(threading.Thread):
+    """
+    Renders every declared phrase into the TTS cache (and memory) after boot,
+    one line at a time and only while the phone is idle.
+    Cache keys include voice id, settings, model and FX preset, so editing a voice
+    in config.py simply makes its lines miss and get rendered again.
+    """
+    def __init__(self, audio, is_idle=None, start_delay=PHRASE_BANK_START_DELAY):
+        super().__init__()
+        self.daemon = True
+        self.audio = audio
+        self.is_idle = is_idle or (lambda: True)
+        self.start_delay = start_delay
+        self.running = True
+
+        # Stats
+        self.rendered = 0
+        self.cached = 0
+        self.failed = 0
+
+    def jobs(self):
+        """(text, voice, year) for every line: operator lines first, they are needed most."""
+        operator = DECADE_VOICES["OPERATOR"]
+        for table in OPERATOR_PHRASES.values():
+            for text in table.values():
+                yield text, operator, None
+        for decade, voice in sorted((k, v) for k, v in DECADE_VOICES.items() if isinstance(k, int)):
+            for table in HOST_PHRASES.values():
+                for text in table.values():
+                    yield text, voice, decade
+
+    def run(self):
+        time.sleep(self.start_delay) # Let boot-time network traffic settle
+        start = time.monotonic()
+        for text, voice, year in self.jobs():
+            while self.running and not self.is_idle():
+                time.sleep(1.0) # A call is in progress; don't compete for bandwidth
+            if not self.running:
+                return
+            status = self.audio.render(text, voice_id=voice['id'], voice_settings=voice['settings'],
+                                       model_id=voice['model'], year=year, pin=True)
+            if status == "rendered":
+                self.rendered += 1
+            elif status == "cached":
+                self.cached += 1
+            else:
+                self.failed += 1
+        print(f"📚 Phrase bank ready: {self.rendered} rendered, {self.cached} cached, {self.failed} failed "
+              f"({time.monotonic() - start:.1f}s)")
+
+    def stop(self):
+        self.running = False
@@ -0,0 +1,107 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .config import PREFETCH_WORKERS, PREFETCH_INTRO_WAIT, PREFETCH_MAX_PLAYLISTS
+
+# Dial plan (mirrors on_dial_complete in main.py)
+SHORTCUT_DIGITS = range(1, 9) # 1-8 -> decade shortcut (direct play)
+YEAR_RANGE = range(1900, 2031) # Exact year dial
+
+def candidate_decades(prefix):
+    """
+    Decades a partial dial can still end up in.
+    Returns (shortcut_decade or None, sorted list of year decades).
+    """
+    shortcut = None
+    if len(prefix) == 1 and int(prefix) in SHORTCUT_DIGITS:
+        shortcut = 1900 + int(prefix) * 10
+    decades = sorted({(y // 10) * 10 for y in YEAR_RANGE if str(y).startswith(prefix)})
+    return shortcut, decades
+
+
+class SpeculativePrefetcher:
+    """
+    Starts work for a number while it is still being dialed.
+    on_prefix("196") warms the 1960s playlist and writes the host intro (with a
+    year placeholder); prefixes open to more than PREFETCH_MAX_PLAYLISTS decades
+    ("1" could still be any of eleven) wait for the next digit. commit(1965) hands over whatever
+    is ready for that number and drops the rest; cancel() drops everything.
+    """
+    def __init__(self, brain, music, intro_pool=None):
+        self.brain = brain
+        self.music = music
+        self.intro_pool = intro_pool # Decades with a ready pooled intro need no speculative one
+        self.executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS)
+        self.lock = threading.Lock()
+        self.jobs = {} # (kind, decade, language) -> Future
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+
+    def on_prefix(self, prefix, language="EN"):
+        shortcut, decades = candidate_decades(prefix)
+        print(f"   (Prefetch: prefix {prefix} -> shortcut {shortcut}, decades {decades[:3]}{'...' if len(decades) > 3 else ''})")
+
+        playlists = sorted(set(decades) | ({shortcut} if shortcut else set()))
+        if len(playlists) > PREFETCH_MAX_PLAYLISTS:
+            return # Too early to guess: most of these resolves would be wasted
+        for decade in playlists:
+            self._submit(("playlist", decade, language), self.music.get_decade_playlist, decade, language)
+        if len(decades) == 1 and not (self.intro_pool and self.intro_pool.has(decades[0], language)):
+            # Only the last digit is missing: write the intro now
+            decade = decades[0]
+            self._submit(("intro", decade, language), self.brain.generate_host_intro, decade, language, True)
+
+    def _submit(self, key, fn, *args):
+        with self.lock:
+            if key not in self.jobs:
+                self.jobs[key] = self.executor.submit(fn, *args)
+
+    def commit(self, number, language="EN"):
+        """
+        Collect speculative results for the final number. Returns a dict with any of
+        'intro' (filled for the year), 'voice', 'playlist' (uri, query). Other jobs are dropped.
+        """
+        if number in YEAR_RANGE:
+            year = number
+        elif number in SHORTCUT_DIGITS:
+            year = 1900 + number * 10
+        else:
+            self.cancel()
+            return {}
+        decade = (year // 10) * 10
+
+        with self.lock:
+            intro_job = self.jobs.pop(("intro", decade, language), None)
+            playlist_job = self.jobs.pop(("playlist", decade, language), None)
+        self.cancel()
+
+        result = {"voice": self.brain.get_voice_for_year(year)}
+        if playlist_job and playlist_job.done() and not playlist_job.exception():
+            result["playlist"] = playlist_job.result()
+        elif playlist_job:
+            result["playlist_future"] = playlist_job # Still resolving; caller may wait later
+
+        if intro_job:
+            try:
+                # Already running: waiting is never slower than starting a fresh request
+                template = intro_job.result(timeout=PREFETCH_INTRO_WAIT)
+            except Exception as e:
+                print(f"   (Prefetch intro failed: {e})")
+                template = None
+            if template:
+                result["intro"] = self.brain.fill_intro_template(template, year)
+
+        if "intro" in result or "playlist" in result:
+            self.hits += 1
+        else:
+            self.misses += 1
+        print(f"   (Prefetch commit {number}: {sorted(k for k in result if k != 'voice')} | hits {self.hits} misses {self.misses})")
+        return result
+
+    def cancel(self):
+        """Drop all speculative work (queued jobs are cancelled, running ones are ignored)."""
+        with self.lock:
+            jobs, self.jobs = self.jobs, {}
+        for future in jobs.values():
+            future.cancel()
@@ -0,0 +1,258 @@
+import os
+import json
+from .config import HOOK_DEBOUNCE, PULSE_DEBOUNCE, DIGIT_GAP, GHOST_LOCKOUT, DIAL_CALIBRATION_FILE
+
+# Channels (trace files and decoder input)
+HOOK = 0
+DIAL = 1
+
+class DecoderTimings:
+    """Thresholds for PulseDecoder (seconds). Defaults come from config.py."""
+    FIELDS = ("hook_debounce", "pulse_debounce", "digit_gap", "ghost_lockout")
+
+    def __init__(self, hook_debounce=HOOK_DEBOUNCE, pulse_debounce=PULSE_DEBOUNCE,
+                 digit_gap=DIGIT_GAP, ghost_lockout=GHOST_LOCKOUT):
+        self.hook_debounce = hook_debounce
+        self.pulse_debounce = pulse_debounce
+        self.digit_gap = digit_gap
+        self.ghost_lockout = ghost_lockout
+
+    def to_dict(self):
+        return {f: getattr(self, f) for f in self.FIELDS}
+
+    def copy(self, **changes):
+        values = self.to_dict()
+        values.update(changes)
+        return DecoderTimings(**values)
+
+    def __repr__(self):
+        return "DecoderTimings(" + ", ".join(f"{f}={getattr(self, f) * 1000:.0f}ms" for f in self.FIELDS) + ")"
+
+    def save(self, path=DIAL_CALIBRATION_FILE):
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=DIAL_CALIBRATION_FILE):
+        """Calibrated timings if a calibration file exists, config defaults otherwise."""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            timings = cls(**{k: float(v) for k, v in data.items() if k in cls.FIELDS})
+            print(f"   (Loaded dial calibration: {timings})")
+            return timings
+        except FileNotFoundError:
+            return cls()
+        except Exception as e:
+            print(f"   ⚠️ Bad dial calibration ({e}). Using defaults.")
+            return cls()
+
+
+class PulseDecoder:
+    """
+    Deterministic rotary dial state machine.
+    Feed it timestamped edges and call advance(now); it returns events:
+      ("hook", is_off_hook, t)  - debounced hook change
+      ("digit", digit, t)       - a completed digit (10 pulses -> 0)
+    No clocks or I/O inside, so recorded traces decode identically (and fast).
+    """
+    def __init__(self, timings=None, hook_level=1, dial_level=0, t=0.0):
+        self.timings = timings or DecoderTimings()
+
+        self.hook_state = hook_level # Confirmed raw level (0 = Lifted)
+        self.pending_hook_state = hook_level
+        self.hook_stable_start_time = 0.0
+        self.is_off_hook = (hook_level == 0)
+        self.off_hook_time = t if self.is_off_hook else 0.0
+
+        self.last_dial_val = dial_level
+        self.pulse_count = 0
+        self.last_pulse_time = 0.0
+
+    @property
+    def hook_pending(self):
+        return self.pending_hook_state != self.hook_state
+
+    def feed(self, channel, level, t):
+        """Process one edge. Call advance(t) first so earlier deadlines fire in order."""
+        events = self.advance(t)
+        if channel == HOOK:
+            if level != self.pending_hook_state:
+                # State changed relative to pending? Reset timer.
+                self.pending_hook_state = level
+                self.hook_stable_start_time = t
+        else:
+            rising = (level == 1 and self.last_dial_val == 0)
+            self.last_dial_val = level
+
+            if not self.is_off_hook:
+                return events
+
+            # Ghost Lockout (pulses right after lifting are contact noise)
+            if (t - self.off_hook_time) < self.timings.ghost_lockout:
+                self.pulse_count = 0
+                return events
+
+            # RISING EDGE (0 -> 1) with pulse debounce
+            if rising and (t - self.last_pulse_time) > self.timings.pulse_debounce:
+                self.pulse_count += 1
+                self.last_pulse_time = t
+        return events
+
+    def next_deadline(self):
+        """Absolute time of the next timeout, or None if nothing is pending."""
+        deadlines = []
+        if self.hook_pending:
+            deadlines.append(self.hook_stable_start_time + self.timings.hook_debounce)
+        if self.pulse_count > 0:
+            deadlines.append(self.last_pulse_time + self.timings.digit_gap)
+        return min(deadlines) if deadlines else None
+
+    def advance(self, now):
+        """Fire every timeout that expired by `now`, in time order."""
+        events = []
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > now:
+                return events
+
+            if self.hook_pending and deadline == self.hook_stable_start_time + self.timings.hook_debounce:
+                # CONFIRMED CHANGE
+                self.hook_state = self.pending_hook_state
+                self.is_off_hook = (self.hook_state == 0)
+                if self.is_off_hook:
+                    self.off_hook_time = deadline
+                else:
+                    self.off_hook_time = 0.0
+                    self._flush_digit(deadline, events) # Submit a digit interrupted by hangup
+                    self.pulse_count = 0
+                events.append(("hook", self.is_off_hook, deadline))
+            else:
+                # End of Digit
+                self._flush_digit(deadline, events)
+
+    def _flush_digit(self, t, events):
+        if self.pulse_count > 0:
+            digit = self.pulse_count
+            if digit == 10: digit = 0
+            self.pulse_count = 0
+            events.append(("digit", digit, t))
+
+
+def decode_edges(edges, timings=None, hook_level=1, dial_level=0, tail=10.0):
+    """Decode a list of (channel, level, t) edges in virtual time. Returns the event list."""
+    decoder = PulseDecoder(timings, hook_level=hook_level, dial_level=dial_level)
+    events = []
+    last_t = 0.0
+    for channel, level, t in edges:
+        events.extend(decoder.feed(channel, level, t))
+        last_t = t
+    events.extend(decoder.advance(last_t + tail))
+    return events
+
+
+def digits_of(events):
+    """Concatenate decoded digits into the dialed string (hook events ignored)."""
+    return "".join(str(value) for kind, value, _ in events if kind == "digit")
+
+
+# =========================================
+# CALIBRATION
+# =========================================
+def _rising_intervals(edges):
+    """Intervals between consecutive rising dial edges of one trace (ghost window skipped)."""
+    lift = next((t for channel, level, t in edges if channel == HOOK and level == 0), 0.0)
+    start = lift + HOOK_DEBOUNCE + GHOST_LOCKOUT
+    rises = []
+    last = 0
+    for channel, level, t in edges:
+        if channel == DIAL:
+            if level == 1 and last == 0 and t >= start:
+                rises.append(t)
+            last = level
+    return [b - a for a, b in zip(rises, rises[1:])]
+
+def _trace_ok(label, edges, timings):
+    # Right digits AND exactly one lift (plus the final hangup, if recorded)
+    events = decode_edges(edges, timings)
+    hooks = [value for kind, value, _ in events if kind == "hook"]
+    return digits_of(events) == label and hooks in ([True], [True, False])
+
+def _all_correct(traces, timings):
+    return all(_trace_ok(label, edges, timings) for label, edges in traces)
+
+def calibrate(traces, safety=1.25):
+    """
+    Derive the tightest safe thresholds for one phone from labeled traces
+    [(label, edges), ...] where label is the dialed number as a string.
+    Returns (timings, report_dict); report["timings"] maps each field to
+    (milliseconds, "calibrated" or why the default was kept). Raises ValueError if no usable traces.
+    """
+    labeled = [(label, edges) for label, edges in traces if label and label.isdigit()]
+    if not labeled:
+        raise ValueError("Calibration needs traces labeled with the dialed number")
+
+    bounces, periods, gaps = [], [], []
+    for label, edges in labeled:
+        intervals = _rising_intervals(edges)
+        true_pulses = sum(int(ch) or 10 for ch in label)
+        n_bounce = (len(intervals) + 1) - true_pulses
+        n_gaps = len(label) - 1
+        if n_bounce < 0:
+            continue # Missing pulses (recording glitch). Skip the trace.
+
+        # The smallest intervals are contact bounces, the largest digit gaps
+        ordered = sorted(intervals)
+        bounces += ordered[:n_bounce]
+        gaps += ordered[len(ordered) - n_gaps:] if n_gaps else []
+        periods += ordered[n_bounce:len(ordered) - n_gaps]
+
+    if not periods:
+        raise ValueError("No pulse periods found in traces")
+
+    max_bounce = max(bounces) if bounces else 0.0
+    min_period = min(periods)
+    max_period = max(periods)
+    min_gap = min(gaps) if gaps else None
+
+    # Pulse debounce sits between the longest bounce and the shortest pulse
+    pulse_debounce = max(max_bounce * safety, 0.005)
+    pulse_debounce = min(pulse_debounce, min_period / 2)
+
+    # Digit gap: longest pulse period plus margin (this is the dial-to-action latency)
+    # (governors drift at the end of the return stroke, so this gets a wider margin)
+    digit_gap = max_period * (safety + 0.25) + 0.05
+    if min_gap is not None and digit_gap >= min_gap:
+        print(f"   ⚠️ Digit gap {digit_gap:.3f}s overlaps inter-digit pause {min_gap:.3f}s. Dial slower while recording.")
+
+    timings = DecoderTimings(pulse_debounce=pulse_debounce, digit_gap=digit_gap)
+
+    # Hook debounce and ghost lockout: sweep down while every trace still decodes.
+    # Only a sweep that some trace stops (a hook bounce or ghost pulse it must still
+    # filter) says how tight the value may be; reaching the floor just means the traces
+    # never exercised it, so the config default stays.
+    sources = {"pulse_debounce": "calibrated", "digit_gap": "calibrated"}
+    for field, floor, step in (("hook_debounce", 0.05, 0.01), ("ghost_lockout", 0.2, 0.05)):
+        default = getattr(timings, field)
+        value = default
+        while value - step >= floor and _all_correct(labeled, timings.copy(**{field: value - step})):
+            value -= step
+        if value - step < floor:
+            sources[field] = "default, not exercised by the traces"
+            continue
+        # Back off by the safety factor, but never looser than the default
+        setattr(timings, field, min(default, max(floor, value * safety)))
+        sources[field] = "calibrated"
+
+    correct = sum(1 for label, edges in labeled if _trace_ok(label, edges, timings))
+    report = {
+        "traces": len(labeled),
+        "correct": correct,
+        "max_bounce_ms": max_bounce * 1000,
+        "pulse_period_ms": (min_period * 1000, max_period * 1000),
+        "min_digit_pause_ms": min_gap * 1000 if min_gap is not None else None,
+        "timings": {f: (getattr(timings, f) * 1000, sources[f]) for f in DecoderTimings.FIELDS},
+    }
+    return timings, report
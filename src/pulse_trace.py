@@ -0,0 +1,67 @@
+import struct
+from .pulse_decoder import HOOK, DIAL
+
+# Compact binary trace file:
+#   magic b"RPT1"
+#   repeated records:
+#     uint16 label length + UTF-8 label (dialed number, may be empty)
+#     uint32 edge count
+#     per edge: uint8 flags (bit0 = level, bit1 = channel) + uint32 delta in microseconds
+# 5 bytes per edge, so a 4-digit dial with its hook edges is ~250 bytes.
+
+MAGIC = b"RPT1"
+_EDGE = struct.Struct("<BI")
+_HEADER = struct.Struct("<H")
+_COUNT = struct.Struct("<I")
+
+def encode_trace(label, edges):
+    """Encode one trace [(channel, level, t), ...] (t in seconds, any origin)."""
+    label_bytes = (label or "").encode("utf-8")
+    out = [_HEADER.pack(len(label_bytes)), label_bytes, _COUNT.pack(len(edges))]
+    last_us = None
+    for channel, level, t in edges:
+        t_us = int(round(t * 1_000_000))
+        delta = 0 if last_us is None else max(0, t_us - last_us)
+        last_us = t_us
+        out.append(_EDGE.pack((channel << 1) | (level & 1), delta))
+    return b"".join(out)
+
+def write_traces(path, traces, append=False):
+    """Write [(label, edges), ...]. Appending keeps existing records."""
+    mode = "ab" if append else "wb"
+    with open(path, mode) as f:
+        if not append or f.tell() == 0:
+            f.write(MAGIC)
+        for label, edges in traces:
+            f.write(encode_trace(label, edges))
+
+def read_traces(path):
+    """Read a trace file. Edge times are re-based so every trace starts at t=0."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != MAGIC:
+        raise ValueError(f"{path} is not a pulse trace file")
+
+    traces = []
+    pos = 4
+    while pos < len(data):
+        (label_len,) = _HEADER.unpack_from(data, pos)
+        pos += _HEADER.size
+        label = data[pos:pos + label_len].decode("utf-8")
+        pos += label_len
+        (count,) = _COUNT.unpack_from(data, pos)
+        pos += _COUNT.size
+
+        edges = []
+        t_us = 0
+        for flags, delta in _EDGE.iter_unpack(data[pos:pos + count * _EDGE.size]):
+            t_us += delta
+            edges.append(((flags >> 1) & 1, flags & 1, t_us / 1_000_000))
+        pos += count * _EDGE.size
+        traces.append((label, edges))
+    return traces
+
+def pins_to_channels(edges, hook_pin, dial_pin):
+    """Convert backend edges (pin, level, t) to trace edges (channel, level, t)."""
+    channels = {hook_pin: HOOK, dial_pin: DIAL}
+    return [(channels[pin], level, t) for pin, level, t in edges if pin in channels]
@@ -0,0 +1,122 @@
+import time
+import threading
+from .config import BELL_PINS, BELL_SPEED, RING_CADENCES, DEFAULT_RING_CADENCE
+
+class RingRequest:
+    def __init__(self, cadence, name, until):
+        self.cadence = cadence # [(on_seconds, off_seconds), ...] repeated until `until`
+        self.name = name
+        self.until = until
+
+
+class Ringer(threading.Thread):
+    """
+    Owns the bell. ring() only queues a request and returns immediately;
+    this thread drives the hammer through the cadence.
+    - A request for the cadence already ringing (or queued) extends it instead of stacking.
+    - Different cadences queue up and ring one after another.
+    - silence() (e.g. handset lifted) stops within one hammer stroke.
+    """
+    def __init__(self, backend, pins=BELL_PINS, stroke=BELL_SPEED):
+        super().__init__()
+        self.daemon = True
+        self.backend = backend
+        self.pins = pins
+        self.stroke = stroke
+
+        self.cond = threading.Condition()
+        self.queue = [] # Pending RingRequests (FIFO)
+        self.active = None
+        self.interrupt = threading.Event() # Set by silence()
+        self.running = True
+        self.strokes = 0
+
+    @property
+    def is_ringing(self):
+        return self.active is not None
+
+    def ring(self, duration=3.0, cadence=None):
+        """
+        Queue a ring. `cadence` is a RING_CADENCES name ("CZ", "UK"...) or a custom
+        list of (on, off) seconds. Never blocks.
+        """
+        if cadence is None:
+            cadence = DEFAULT_RING_CADENCE
+        if isinstance(cadence, str):
+            name = cadence
+            cadence = RING_CADENCES.get(name, RING_CADENCES[DEFAULT_RING_CADENCE])
+        else:
+            name = "custom"
+            cadence = list(cadence)
+
+        with self.cond:
+            until = time.monotonic() + duration
+            # Merge with an identical cadence (active first, then queued)
+            for req in ([self.active] if self.active else []) + self.queue:
+                if req.cadence == cadence:
+                    req.until = max(req.until, until)
+                    print(f"🔔 Ring merged ({name}, until +{until - time.monotonic():.1f}s)")
+                    return
+            self.queue.append(RingRequest(cadence, name, until))
+            self.cond.notify()
+        print(f"🔔 Ring queued ({name}, {duration}s)")
+
+    def silence(self):
+        """Stop now and drop anything queued."""
+        with self.cond:
+            dropped = len(self.queue) + (1 if self.active else 0)
+            self.queue = []
+            if self.active:
+                self.active.until = 0
+        self.interrupt.set()
+        if dropped:
+            print("🔕 Bell silenced")
+
+    def run(self):
+        while self.running:
+            with self.cond:
+                while self.running and not self.queue:
+                    self.cond.wait(timeout=1.0)
+                if not self.running:
+                    break
+                self.active = self.queue.pop(0)
+                self.interrupt.clear()
+
+            try:
+                self._ring(self.active)
+            except Exception as e:
+                print(f"❌ Bell Error: {e}")
+            finally:
+                # Silence (coils must never stay energised)
+                self.backend.output(self.pins, 0)
+                with self.cond:
+                    self.active = None
+
+    def _ring(self, req):
+        print(f"🔔 RINGING ({req.name})...")
+        while time.monotonic() < req.until:
+            for on_time, off_time in req.cadence:
+                # ON: alternate hammer polarity every stroke
+                on_end = min(time.monotonic() + on_time, req.until)
+                while time.monotonic() < on_end:
+                    self.backend.output(self.pins[0], 1)
+                    self.backend.output(self.pins[1], 0)
+                    if self.interrupt.wait(self.stroke): return
+                    self.backend.output(self.pins[0], 0)
+                    self.backend.output(self.pins[1], 1)
+                    if self.interrupt.wait(self.stroke): return
+                    self.strokes += 1
+
+                # OFF
+                self.backend.output(self.pins, 0)
+                remaining = req.until - time.monotonic()
+                if remaining <= 0:
+                    return
+                if off_time and self.interrupt.wait(min(off_time, remaining)): return
+        print("🔕 Bell Silence")
+
+    def stop(self):
+        self.running = False
+        self.silence()
+        with self.cond:
+            self.cond.notify()
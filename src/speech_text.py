@@ -0,0 +1,81 @@
+import re
+from .config import TTS_SENTENCE_MIN_CHARS, TTS_CLAUSE_FIRST_MIN, TTS_CLAUSE_MIN
+
+# Text handling for speech output: where a line can be cut into separately
+# synthesized pieces without changing how it sounds.
+
+# "Mr. Sinatra" is not two sentences (EN and CZ abbreviations seen in host lines)
+ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "st", "jr", "sr", "vs", "no", "mt", "např", "tj", "tzv", "resp", "p", "pí", "sv"}
+
+_SENTENCE_END = re.compile(r'[.!?…]+["\'”“)]*\s+')
+_CLAUSE_END = re.compile(r'[,;:—–]\s+|\s-\s')
+
+def _is_abbreviation(text, end):
+    """True if the '.' before `end` closes an abbreviation or an initial."""
+    word = re.search(r"(\w+)\.+[\"'”“)]*\s*$", text[:end])
+    return bool(word) and (word.group(1).lower() in ABBREVIATIONS or len(word.group(1)) == 1 and word.group(1).isalpha())
+
+def split_sentences(text, min_chars=TTS_SENTENCE_MIN_CHARS):
+    """
+    'Hello there. Welcome to 1965! What shall we play?' -> one string per sentence.
+    Pieces shorter than min_chars are joined to the next one (a lone "Well." sounds clipped).
+    """
+    sentences = []
+    start = 0
+    for match in _SENTENCE_END.finditer(text):
+        if _is_abbreviation(text, match.end()):
+            continue
+        sentences.append(text[start:match.end()].strip())
+        start = match.end()
+    if text[start:].strip():
+        sentences.append(text[start:].strip())
+
+    merged = []
+    for sentence in sentences:
+        if merged and len(merged[-1]) < min_chars:
+            merged[-1] = f"{merged[-1]} {sentence}"
+        else:
+            merged.append(sentence)
+    if len(merged) > 1 and len(merged[-1]) < min_chars:
+        merged[-2:] = [f"{merged[-2]} {merged[-1]}"]
+    return merged
+
+
+class TextChunker:
+    """
+    Cuts text that arrives in pieces (model tokens) into speakable chunks as soon as
+    they are complete: at a sentence end (same rules as split_sentences), or at a
+    clause break once the chunk is long enough. feed() returns the finished chunks,
+    flush() the rest when the text is complete.
+    """
+    def __init__(self, first_min=TTS_CLAUSE_FIRST_MIN, clause_min=TTS_CLAUSE_MIN, min_chars=TTS_SENTENCE_MIN_CHARS):
+        self.first_min = first_min
+        self.clause_min = clause_min
+        self.min_chars = min_chars
+        self.buffer = ""
+        self.chunks = 0
+
+    def feed(self, piece):
+        self.buffer += piece
+        chunks = []
+        cut = self._cut()
+        while cut:
+            chunks.append(self.buffer[:cut].strip())
+            self.buffer = self.buffer[cut:]
+            self.chunks += 1
+            cut = self._cut()
+        return chunks
+
+    def flush(self):
+        rest, self.buffer = self.buffer.strip(), ""
+        return rest or None
+
+    def _cut(self):
+        for match in _SENTENCE_END.finditer(self.buffer):
+            if len(self.buffer[:match.end()].strip()) >= self.min_chars and not _is_abbreviation(self.buffer, match.end()):
+                return match.end()
+        limit = self.clause_min if self.chunks else self.first_min
+        for match in _CLAUSE_END.finditer(self.buffer):
+            if match.end() >= limit:
+                return match.end()
+        return None
@@ -0,0 +1,183 @@
+import io
+import time
+import wave
+import threading
+import numpy as np
+from .config import VAD_SAMPLE_RATE, STT_UPLOAD_FORMAT, STT_UPLOAD_RATE, STT_FORCE_LANGUAGE
+from .config import STT_GATE_ENABLED, STT_GATE_MIN_PEAK_DB, STT_GATE_VOICED_DB, STT_GATE_MAX_ZCR
+from .config import STT_GATE_MIN_VOICED, STT_GATE_MIN_RATIO, STT_GATE_FLOOR_DB
+
+try:
+    import soundfile # Optional: FLAC/Opus encoding
+except ImportError:
+    soundfile = None
+
+STT_PROMPT = "User is speaking to a radio host about music, news, life, or the year. The language is likely English or Czech."
+# Whisper leans towards the language of the prompt: a soft hint for the current UI language
+STT_PROMPTS = {
+    "EN": STT_PROMPT,
+    "CZ": "Posluchač mluví s rozhlasovým moderátorem o hudbě, zprávách, životě nebo roce. Mluví nejspíš česky, případně anglicky.",
+}
+WHISPER_LANGUAGES = {"EN": "en", "CZ": "cs"}
+
+# Anti-Hallucination Filters (Whisper bugs on silence)
+HALLUCINATIONS = [
+    "ご視聴ありがとうございました",
+    "Thanks for watching",
+    "MBC",
+    "Amara.org"
+]
+
+def is_hallucination(text):
+    return any(h in text for h in HALLUCINATIONS) or len(text) < 2
+
+def speech_presence(samples, rate=VAD_SAMPLE_RATE, floor_db=None):
+    """
+    Local check whether a capture holds speech at all.
+    Returns (has_speech, reason) using peak energy, voiced-frame duration and ratio.
+    floor_db: the line's noise floor (StreamingVAD.noise_db). Without it, frames are
+    measured against STT_GATE_FLOOR_DB, not the capture's own quiet frames: a long
+    stretch of continuous speech has no quiet frames to measure against.
+    """
+    frame = max(1, rate // 50) # 20 ms
+    n = len(samples) // frame
+    if n < 1:
+        return False, "too short"
+    frames = samples[:n * frame].astype(np.float64).reshape(n, frame)
+    level = 20 * np.log10(np.maximum(np.sqrt(np.mean(frames ** 2, axis=1)) / 32768.0, 1e-6))
+    if level.max() < STT_GATE_MIN_PEAK_DB:
+        return False, f"peak {level.max():.0f} dBFS"
+    zcr = np.mean(np.abs(np.diff(np.signbit(frames), axis=1)), axis=1)
+    floor = STT_GATE_FLOOR_DB if floor_db is None else floor_db
+    voiced = (level > floor + STT_GATE_VOICED_DB) & (zcr < STT_GATE_MAX_ZCR)
+    seconds = voiced.sum() * frame / rate
+    if seconds < STT_GATE_MIN_VOICED:
+        return False, f"voiced {seconds:.2f}s"
+    if voiced.mean() < STT_GATE_MIN_RATIO:
+        return False, f"voiced ratio {voiced.mean():.2f}"
+    return True, f"voiced {seconds:.2f}s ({voiced.mean():.0%})"
+
+# Upload format -> (file extension, soundfile format, subtype)
+UPLOAD_CODECS = {"flac": ("flac", "FLAC", "PCM_16"), "opus": ("ogg", "OGG", "OPUS")}
+
+def trim_silence(samples, rate, pad=0.1, floor_db=-55, range_db=40):
+    """Cut leading/trailing frames quieter than (peak - range_db), keeping `pad` seconds each side."""
+    frame = max(1, rate // 100) # 10 ms
+    n = len(samples) // frame
+    if n < 2:
+        return samples
+    frames = samples[:n * frame].astype(np.float64).reshape(n, frame)
+    level = 20 * np.log10(np.maximum(np.sqrt(np.mean(frames ** 2, axis=1)) / 32768.0, 1e-6))
+    loud = np.nonzero(level > max(level.max() - range_db, floor_db))[0]
+    if not len(loud):
+        return samples
+    keep = int(pad * rate)
+    return samples[max(0, loud[0] * frame - keep):min(len(samples), (loud[-1] + 1) * frame + keep)]
+
+def prepare_upload(samples, rate=VAD_SAMPLE_RATE, channels=1):
+    """Downmix, resample to STT_UPLOAD_RATE and trim. Returns int16 mono."""
+    samples = np.asarray(samples)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    if rate != STT_UPLOAD_RATE:
+        n = int(len(samples) * STT_UPLOAD_RATE / rate)
+        samples = np.interp(np.arange(n) * rate / STT_UPLOAD_RATE, np.arange(len(samples)), samples)
+    return trim_silence(samples.astype(np.int16), STT_UPLOAD_RATE)
+
+def encode_upload(samples, fmt=STT_UPLOAD_FORMAT):
+    """int16 mono at STT_UPLOAD_RATE -> (file name, bytes). Falls back to wav."""
+    codec = UPLOAD_CODECS.get(fmt)
+    if codec and soundfile:
+        ext, container, subtype = codec
+        try:
+            buf = io.BytesIO()
+            soundfile.write(buf, samples, STT_UPLOAD_RATE, format=container, subtype=subtype)
+            return f"speech.{ext}", buf.getvalue()
+        except Exception as e:
+            print(f"   ({fmt} encode failed: {e}. Sending wav.)")
+    return "speech.wav", wav_bytes(samples, STT_UPLOAD_RATE)
+
+def wav_bytes(samples, rate=VAD_SAMPLE_RATE):
+    """int16 mono samples -> in-memory WAV file contents."""
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(samples.astype("<i2").tobytes())
+    return buf.getvalue()
+
+
+class SegmentedTranscriber:
+    """
+    Transcription of one listening turn, uploaded piece by piece.
+    submit() sends a finished segment to Whisper right away (on the shared executor),
+    so earlier segments are done by the time the caller stops talking.
+    result() waits for all of them and joins the texts in spoken order.
+    """
+    def __init__(self, client, executor, language=None):
+        self.client = client
+        self.executor = executor
+        self.prompt = STT_PROMPTS.get(language, STT_PROMPT)
+        self.language = WHISPER_LANGUAGES.get(language) if STT_FORCE_LANGUAGE else None # None = auto-detect
+        self.futures = []
+
+        # Upload stats for this turn (segments encode on several threads)
+        self.stats_lock = threading.Lock()
+        self.raw_bytes = 0
+        self.sent_bytes = 0
+        self.encode_time = 0.0
+        self.upload_name = None
+        self.skipped = 0 # Segments the speech-presence gate kept away from Whisper
+
+    def submit(self, samples, floor_db=None):
+        """floor_db: noise floor of the line while it was captured (StreamingVAD.noise_db), for the gate."""
+        if STT_GATE_ENABLED:
+            present, reason = speech_presence(samples, floor_db=floor_db)
+            if not present:
+                self.skipped += 1
+                print(f"   (STT skipped, no speech: {reason})")
+                return
+        index = len(self.futures)
+        self.futures.append(self.executor.submit(self._transcribe, index, samples))
+
+    def _transcribe(self, index, samples):
+        start = time.monotonic()
+        upload = prepare_upload(samples)
+        name, data = encode_upload(upload)
+        encoded = time.monotonic()
+        with self.stats_lock:
+            self.raw_bytes += len(samples) * 2
+            self.sent_bytes += len(data)
+            self.encode_time += encoded - start
+            self.upload_name = name
+
+        transcription = self.client.audio.transcriptions.create(
+            model="whisper-1",
+            file=(f"segment{index}_{name}", data),
+            prompt=self.prompt,
+            language=self.language
+        )
+        text = transcription.text.strip()
+        print(f"   (STT segment {index}: {len(upload) / STT_UPLOAD_RATE:.1f}s audio, {len(data) / 1024:.0f} KB, "
+              f"{(time.monotonic() - encoded) * 1000:.0f} ms: '{text}')")
+        return text
+
+    def result(self):
+        """Joined text of all segments ('' if none); failed or hallucinated segments are dropped."""
+        texts = []
+        for future in self.futures:
+            try:
+                text = future.result()
+            except Exception as e:
+                print(f"❌ STT Error: {e}")
+                continue
+            if is_hallucination(text):
+                print(f"   (Filtered Hallucination: '{text}')")
+                continue
+            texts.append(text)
+        if self.sent_bytes:
+            print(f"   (Upload: {len(self.futures)} segment(s), {self.raw_bytes / 1024:.0f} KB raw -> "
+                  f"{self.sent_bytes / 1024:.0f} KB {self.upload_name.rsplit('.', 1)[-1]}, "
+                  f"encode {self.encode_time * 1000:.0f} ms)")
+        return " ".join(texts)
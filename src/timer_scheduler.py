@@ -0,0 +1,162 @@
+import os
+import json
+import time
+import heapq
+import itertools
+import threading
+from .config import TIMER_STATE_FILE, TIMER_LATE_GRACE
+
+class TimerScheduler(threading.Thread):
+    """
+    One thread for all pending timers (timer mode, 666).
+    Timers live in a min-heap keyed by time.monotonic() deadline, so clock jumps
+    (NTP syncing the Pi's clock after boot) don't move them. They are saved to
+    disk with a wall-clock due time on every change, so they survive service
+    restarts (the only place the wall clock is used). Actions are
+    referenced by name (register()) because callables can't be persisted.
+    Cancelled entries are dropped from the index and skipped lazily in the heap.
+    """
+    def __init__(self, path=TIMER_STATE_FILE, late_grace=TIMER_LATE_GRACE):
+        super().__init__()
+        self.daemon = True
+        self.path = path
+        self.late_grace = late_grace
+
+        self.cond = threading.Condition()
+        self.heap = [] # (deadline, id)
+        self.timers = {} # id -> {"id", "deadline", "action", "label", "created"}; "due" only on disk
+        self.actions = {}
+        self.running = True
+        self._ids = itertools.count(1)
+
+        self._load()
+
+    def register(self, action, fn):
+        """fn(timer_dict) is called on the scheduler thread when a timer with `action` fires."""
+        self.actions[action] = fn
+
+    def add(self, seconds, action="ring", label=""):
+        with self.cond:
+            timer_id = next(self._ids)
+            entry = {"id": timer_id, "deadline": time.monotonic() + seconds, "action": action,
+                     "label": label, "created": time.time()}
+            self.timers[timer_id] = entry
+            heapq.heappush(self.heap, (entry["deadline"], timer_id))
+            self._save()
+            self.cond.notify()
+        print(f"⏰ Timer #{timer_id} set: {seconds}s ({len(self.timers)} pending)")
+        return timer_id
+
+    def cancel(self, timer_id):
+        with self.cond:
+            if self.timers.pop(timer_id, None) is None:
+                return False
+            self._compact()
+            self._save()
+            self.cond.notify()
+        print(f"⏰ Timer #{timer_id} cancelled")
+        return True
+
+    def cancel_all(self):
+        with self.cond:
+            count = len(self.timers)
+            self.timers = {}
+            self.heap = []
+            self._save()
+            self.cond.notify()
+        return count
+
+    def list(self):
+        """Pending timers sorted by due time, with 'remaining' seconds added."""
+        now = time.monotonic()
+        with self.cond:
+            entries = sorted(self.timers.values(), key=lambda e: e["deadline"])
+            return [dict(e, remaining=max(0.0, e["deadline"] - now)) for e in entries]
+
+    def run(self):
+        while self.running:
+            with self.cond:
+                # Skip cancelled heap entries
+                while self.heap and self.heap[0][1] not in self.timers:
+                    heapq.heappop(self.heap)
+                if not self.heap:
+                    self.cond.wait(timeout=60)
+                    continue
+                delay = self.heap[0][0] - time.monotonic()
+                if delay > 0:
+                    self.cond.wait(timeout=min(delay, 60))
+                    continue
+                # Pop everything that is due, then persist once
+                due_entries = []
+                now = time.monotonic()
+                while self.heap and self.heap[0][0] <= now:
+                    _, timer_id = heapq.heappop(self.heap)
+                    entry = self.timers.pop(timer_id, None)
+                    if entry:
+                        due_entries.append(entry)
+                self._save()
+            for entry in due_entries:
+                self._fire(entry)
+
+    def _fire(self, entry):
+        fn = self.actions.get(entry["action"])
+        print(f"⏰ TIMER EXPIRED (#{entry['id']} {entry['label']})")
+        if not fn:
+            print(f"   (No handler for timer action '{entry['action']}')")
+            return
+        try:
+            fn(entry)
+        except Exception as e:
+            print(f"❌ Timer Action Error: {e}")
+
+    def _compact(self):
+        # Rebuild when most heap entries are stale, so cancels stay O(log n) amortized
+        if len(self.heap) > 2 * len(self.timers) + 16:
+            self.heap = [(e["deadline"], i) for i, e in self.timers.items()]
+            heapq.heapify(self.heap)
+
+    def _save(self):
+        # Deadlines are only meaningful in this process: store wall-clock due times
+        offset = time.time() - time.monotonic()
+        entries = [dict({k: v for k, v in e.items() if k != "deadline"}, due=e["deadline"] + offset)
+                   for e in self.timers.values()]
+        try:
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump({"timers": entries}, f)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            print(f"   (Could not save timers: {e})")
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                entries = json.load(f).get("timers", [])
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"   ⚠️ Bad timer file ({e}). Starting empty.")
+            return
+
+        now = time.time()
+        offset = time.monotonic() - now
+        max_id = 0
+        for entry in entries:
+            max_id = max(max_id, entry["id"])
+            due = entry.pop("due")
+            if now - due > self.late_grace:
+                print(f"   (Dropping timer #{entry['id']}: expired {int(now - due)}s ago while offline)")
+                continue
+            # Overdue within the grace period: fires right after start
+            entry["deadline"] = due + offset
+            self.timers[entry["id"]] = entry
+            self.heap.append((entry["deadline"], entry["id"]))
+        heapq.heapify(self.heap)
+        self._ids = itertools.count(max_id + 1)
+        if self.timers:
+            print(f"⏰ Restored {len(self.timers)} timers")
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify()
@@ -0,0 +1,200 @@
+import math
+import numpy as np
+from .config import TONE_PLANS, DEFAULT_TONE_PLAN, TTS_SAMPLE_RATE
+
+# Handset sounds generated on demand instead of played from fixed wav files.
+# Every source is computed from its absolute sample index (tones, cadences) or
+# carries its filter state across reads (static), so it can be read in mixer
+# periods for any length of time without a seam, and rendered in one call for
+# tools/sound_generator.py. Tones with whole-Hz frequencies repeat exactly every
+# rate/gcd samples, so tone plus cadence is one precomputed int16 cycle and
+# reading is just copying slices of it.
+
+TONE_LEVEL = 0.5 # Full scale fraction (same as the old generated wavs)
+STATIC_LEVEL = 0.3
+CLICK_LEVEL = 0.8
+CLICK_PULSE = 100 / 44100 # Seconds at full level (100 samples of the old 44.1 kHz click)
+TONE_RAMP = 0.004 # Seconds of fade at each cadence edge (hard edges click)
+CRACKLE_RATE = 6.0 # Pops per second in static
+CRACKLE_DECAY = 0.003 # Seconds
+MAX_CYCLE = 30.0 # Seconds; longer tone+cadence cycles are computed per read instead
+
+# name -> (kind, tone in the plan, default length in seconds when not looping)
+SOUNDS = {
+    "dial_tone": ("tone", "dial", 10.0),
+    "busy_tone": ("tone", "busy", 10.0),
+    "ringback": ("tone", "ringback", 10.0),
+    "static_long": ("static", None, 2.0),
+    "static_short": ("static", None, 0.5),
+    "click": ("click", None, 0.05),
+}
+
+def cadence_envelope(cadence, rate, ramp=TONE_RAMP):
+    """Gain for one full cadence cycle ([(on, off), ...] seconds), or None for a continuous tone."""
+    if not cadence or not any(off for _, off in cadence):
+        return None
+    fade_n = max(1, int(ramp * rate))
+    parts = []
+    for on, off in cadence:
+        seg = np.ones(int(round(on * rate)))
+        k = min(fade_n, len(seg) // 2)
+        if k:
+            fade = 0.5 - 0.5 * np.cos(np.pi * np.arange(k) / k)
+            seg[:k] = fade
+            seg[-k:] = fade[::-1]
+        parts += [seg, np.zeros(int(round(off * rate)))]
+    return np.concatenate(parts)
+
+
+class Source:
+    """Endless (duration=None) or fixed-length sound; read(n) continues where the last read ended."""
+    def __init__(self, rate, duration=None):
+        self.rate = rate
+        self.pos = 0
+        self.end = None if duration is None else int(round(duration * rate))
+
+    def read(self, n):
+        """Next n int16 samples (fewer at the end), or None when finished."""
+        if self.end is not None:
+            n = min(n, self.end - self.pos)
+        if n <= 0:
+            return None
+        idx = np.arange(self.pos, self.pos + n)
+        self.pos += n
+        return np.clip(self._generate(idx) * 32767, -32768, 32767).astype(np.int16)
+
+    def render(self):
+        """The whole (fixed-length) sound in one array."""
+        return self.read(self.end - self.pos)
+
+    def _generate(self, idx):
+        raise NotImplementedError
+
+
+def tone_period(freqs, rate):
+    """One exact period of a sum of sines at `rate` (whole-Hz frequencies only), or None."""
+    if not all(float(f).is_integer() for f in freqs):
+        return None
+    step = rate
+    for f in freqs:
+        step = math.gcd(step, int(f))
+    n = np.arange(rate // step)
+    return np.sin(np.outer(n, 2 * np.pi * np.asarray(freqs, dtype=np.float64) / rate)).sum(axis=1)
+
+
+def tone_cycle(freqs, envelope, rate, level=TONE_LEVEL):
+    """int16 samples of one full tone + cadence cycle (see tone_period), or None if too long/not periodic."""
+    period = tone_period(freqs, rate)
+    if period is None:
+        return None
+    if envelope is None:
+        n = len(period)
+    else:
+        n = math.lcm(len(period), len(envelope))
+        if n > MAX_CYCLE * rate:
+            # Stretch the last pause to whole tone periods (< 1 period, a few ms longer)
+            envelope = np.concatenate((envelope, np.zeros(-len(envelope) % len(period))))
+            n = len(envelope)
+    return ToneSource(freqs, envelope, rate, level, duration=n / rate).render()
+
+
+class ToneSource(Source):
+    """Sum of sines, gated by a repeating cadence."""
+    def __init__(self, freqs, envelope, rate, level=TONE_LEVEL, duration=None, cycle=None):
+        super().__init__(rate, duration)
+        self.omegas = 2 * np.pi * np.asarray(freqs, dtype=np.float64) / rate
+        self.envelope = envelope
+        self.level = level / len(freqs)
+        self.cycle = cycle # From tone_cycle(); None = compute the sines per read
+
+    def read(self, n):
+        if self.cycle is None:
+            return super().read(n)
+        if self.end is not None:
+            n = min(n, self.end - self.pos)
+        if n <= 0:
+            return None
+        start = self.pos % len(self.cycle)
+        self.pos += n
+        if start + n <= len(self.cycle):
+            return self.cycle[start:start + n].copy()
+        return np.resize(np.roll(self.cycle, -start), n) # Wraps (repeats) as often as needed
+
+    def _generate(self, idx):
+        x = np.sin(np.outer(idx, self.omegas)).sum(axis=1) * self.level
+        if self.envelope is not None:
+            x *= self.envelope[idx % len(self.envelope)]
+        return x
+
+
+class StaticSource(Source):
+    """Softened white noise with sparse crackle; the filter tails carry across reads."""
+    def __init__(self, rate, level=STATIC_LEVEL, duration=None, seed=None):
+        super().__init__(rate, duration)
+        self.level = level
+        self.rng = np.random.default_rng(seed)
+        self.prev = 0.0
+        self.kernel = np.exp(-np.arange(max(2, int(CRACKLE_DECAY * rate * 4))) / (CRACKLE_DECAY * rate))
+        self.tail = np.zeros(len(self.kernel), dtype=np.float32)
+
+    def _generate(self, idx):
+        n = len(idx)
+        noise = self.rng.random(n + 1, dtype=np.float32) * 2 - 1
+        noise[0] = self.prev
+        self.prev = noise[-1]
+        hiss = 0.5 * (noise[1:] + noise[:-1]) # Gentle lowpass
+
+        # Crackle: a decaying burst at each (sparse, random) pop, overlap-added across reads
+        crackle = np.zeros(n + len(self.tail), dtype=np.float32)
+        crackle[:len(self.tail)] = self.tail
+        at = self.rng.integers(0, n, self.rng.poisson(CRACKLE_RATE * n / self.rate))
+        if len(at):
+            bursts = self.rng.uniform(-1, 1, (len(at), 1)) * self.kernel
+            crackle += np.bincount((at[:, None] + np.arange(len(self.kernel))).ravel(), bursts.ravel(),
+                                   minlength=len(crackle))
+        self.tail = crackle[n:]
+        return (hiss + crackle[:n]) * self.level
+
+
+class ClickSource(Source):
+    """Relay click: a short full-level pulse, repeated every `period` seconds if endless."""
+    def __init__(self, rate, level=CLICK_LEVEL, period=0.05, duration=None):
+        super().__init__(rate, duration)
+        self.level = level
+        self.pulse = max(1, int(round(CLICK_PULSE * rate)))
+        self.period = max(self.pulse + 1, int(round(period * rate)))
+
+    def _generate(self, idx):
+        return (idx % self.period < self.pulse) * self.level
+
+
+class ToneSynth:
+    """Makes SOUNDS for one tone plan (TONE_PLANS) at the mixer rate."""
+    def __init__(self, rate=TTS_SAMPLE_RATE, plan=DEFAULT_TONE_PLAN):
+        if plan not in TONE_PLANS:
+            print(f"   ⚠️ Unknown tone plan '{plan}', using CLASSIC")
+            plan = "CLASSIC"
+        self.rate = rate
+        self.plan = plan
+        self.tones = {}
+        for tone, (freqs, cadence) in TONE_PLANS[plan].items():
+            envelope = cadence_envelope(cadence, rate)
+            self.tones[tone] = (freqs, envelope, tone_cycle(freqs, envelope, rate))
+
+    def __contains__(self, name):
+        return name in SOUNDS
+
+    def source(self, name, loop=False, duration=None):
+        """A fresh Source for a sound name: endless if loop, else `duration` (default per sound)."""
+        kind, tone, default = SOUNDS[name]
+        length = None if loop else (duration or default)
+        if kind == "tone":
+            freqs, envelope, cycle = self.tones[tone]
+            return ToneSource(freqs, envelope, self.rate, duration=length, cycle=cycle)
+        if kind == "static":
+            return StaticSource(self.rate, duration=length)
+        return ClickSource(self.rate, period=default, duration=length)
+
+    def render(self, name, duration=None):
+        """int16 samples of a sound (default length)."""
+        return self.source(name, duration=duration).render()
@@ -0,0 +1,146 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from .config import TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES
+
+class TTSCache:
+    """
+    Final (FX-processed) speech audio on disk, keyed by everything that shapes it:
+    text, voice, voice settings, model, FX preset and audio format.
+    Files are raw PCM named by the key's sha256. Least recently used entries are
+    evicted once the total passes max_bytes; file mtimes keep the LRU order across restarts.
+    pin() also keeps an entry in memory (phrase bank lines), so it plays without disk I/O;
+    pinned entries are never evicted.
+    """
+    def __init__(self, path=TTS_CACHE_DIR, max_bytes=TTS_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict() # key -> size, oldest first
+        self.total_bytes = 0
+        self.pinned = {} # key -> bytes, held in memory
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+
+        self._scan()
+
+    @staticmethod
+    def key(text, voice_id, voice_settings, model_id, fx_spec, audio_format):
+        blob = json.dumps([text, voice_id, voice_settings or {}, model_id, fx_spec or "", audio_format],
+                          sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _file(self, key):
+        return os.path.join(self.path, key + ".pcm")
+
+    def _scan(self):
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            files = []
+            for name in os.listdir(self.path):
+                full = os.path.join(self.path, name)
+                if name.endswith(".tmp"):
+                    os.remove(full) # Interrupted write
+                elif name.endswith(".pcm"):
+                    st = os.stat(full)
+                    files.append((st.st_mtime, name[:-4], st.st_size))
+        except Exception as e:
+            print(f"   ⚠️ TTS cache unavailable ({e})")
+            return
+        for _, key, size in sorted(files):
+            self.entries[key] = size
+            self.total_bytes += size
+        if self.entries:
+            print(f"💾 TTS cache: {len(self.entries)} lines, {self.total_bytes / 1e6:.1f} MB")
+
+    def get(self, key):
+        """Cached audio bytes, or None."""
+        data = self.load(key)
+        with self.lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def load(self, key):
+        """Like get(), without touching the hit/miss counters (background renderers)."""
+        data = self.pinned.get(key)
+        with self.lock:
+            if key not in self.entries:
+                return data
+            self.entries.move_to_end(key)
+        if data is not None:
+            return data
+        try:
+            with open(self._file(key), "rb") as f:
+                data = f.read()
+            os.utime(self._file(key)) # Mark as recently used
+        except Exception:
+            with self.lock:
+                self.total_bytes -= self.entries.pop(key, 0)
+            return None
+        return data
+
+    def pin(self, key, data):
+        self.pinned[key] = data
+
+    def discard(self, key):
+        """Forget an entry (memory and disk), e.g. audio that must not be reused."""
+        self.pinned.pop(key, None)
+        with self.lock:
+            size = self.entries.pop(key, None)
+            if size is None:
+                return
+            self.total_bytes -= size
+        try:
+            os.remove(self._file(key))
+        except OSError:
+            pass
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.entries or key in self.pinned
+
+    def put(self, key, data):
+        if not data or len(data) > self.max_bytes:
+            return
+        tmp = f"{self._file(key)}.{threading.get_ident()}.tmp" # Own file per writer thread
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._file(key))
+        except Exception as e:
+            print(f"   (Could not cache TTS: {e})")
+            return
+        with self.lock:
+            self.total_bytes += len(data) - self.entries.pop(key, 0)
+            self.entries[key] = len(data)
+            self._evict()
+
+    def _evict(self):
+        # Oldest first, but pinned lines keep their file too (they are meant to survive restarts)
+        if self.total_bytes <= self.max_bytes:
+            return
+        for key in list(self.entries):
+            if self.total_bytes <= self.max_bytes:
+                break
+            if key in self.pinned:
+                continue
+            self.total_bytes -= self.entries.pop(key)
+            try:
+                os.remove(self._file(key))
+            except OSError:
+                pass
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses,
+                    "hit_rate": self.hits / lookups if lookups else 0.0,
+                    "entries": len(self.entries), "bytes": self.total_bytes,
+                    "pinned": len(self.pinned), "pinned_bytes": sum(len(d) for d in self.pinned.values())}
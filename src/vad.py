@@ -0,0 +1,211 @@
+import time
+import subprocess
+from collections import deque
+import numpy as np
+from .config import AUDIO_DEVICE_ID, VAD_SAMPLE_RATE, VAD_FRAME_MS, VAD_THRESHOLD_DB, VAD_MIN_THRESHOLD_DB
+from .config import VAD_START_FRAMES, VAD_HANGOVER, VAD_ONSET_TIMEOUT, VAD_PREROLL, VAD_TRAIL
+from .config import STT_SEGMENT_MIN, STT_SEGMENT_PAUSE
+
+try:
+    import alsaaudio # Optional (pyalsaaudio)
+except ImportError:
+    alsaaudio = None
+
+def frame_level_db(frame):
+    """RMS level of an int16 frame in dBFS."""
+    rms = np.sqrt(np.mean(frame.astype(np.float64) ** 2)) / 32768.0
+    return 20 * np.log10(max(rms, 1e-6))
+
+
+def capture_busy(card=AUDIO_DEVICE_ID):
+    """True while the card's capture substream is open (e.g. an arecord still exiting)."""
+    try:
+        with open(f"/proc/asound/card{card}/pcm0c/sub0/status") as f:
+            return f.readline().strip() != "closed"
+    except OSError:
+        return False # No procfs info (not ALSA / not Linux): assume free
+
+def wait_capture_free(timeout=1.0, poll=0.005):
+    """Wait until the capture device is free. Returns the seconds actually waited."""
+    start = time.monotonic()
+    while capture_busy() and time.monotonic() - start < timeout:
+        time.sleep(poll)
+    return time.monotonic() - start
+
+
+class StreamingVAD:
+    """
+    Frame-by-frame speech endpointing.
+    - Noise floor tracks the quiet frames (falls fast, rises slowly), so a noisy
+      room raises the bar instead of triggering a fixed 1% threshold.
+    - Speech starts after VAD_START_FRAMES voiced frames in a row (short clicks don't count).
+    - Speech ends after `hangover` seconds without a voiced frame.
+    - If nothing starts within `onset_timeout`, the turn is given up early.
+    feed() returns None while undecided, else "end" or "no_onset".
+    For segmented transcription, take_segment() hands out finished stretches of
+    speech at shorter pauses while the turn is still going.
+    """
+    def __init__(self, rate=VAD_SAMPLE_RATE, frame_ms=VAD_FRAME_MS, hangover=VAD_HANGOVER,
+                 onset_timeout=VAD_ONSET_TIMEOUT, threshold_db=VAD_THRESHOLD_DB,
+                 start_frames=VAD_START_FRAMES, preroll=VAD_PREROLL):
+        self.rate = rate
+        self.frame_s = frame_ms / 1000
+        self.hangover_frames = max(1, int(hangover / self.frame_s))
+        self.onset_frames = max(1, int(onset_timeout / self.frame_s))
+        self.threshold_db = threshold_db
+        self.start_frames = start_frames
+
+        self.noise_db = None
+        self.last_level = None
+        self.frames_seen = 0
+        self.run = 0 # Consecutive voiced frames (before onset)
+        self.silent_frames = 0 # Unvoiced frames since the last voiced one (after onset)
+        self.started = False
+        self.result = None
+
+        self.preroll = deque(maxlen=max(1, int(preroll / self.frame_s)))
+        self.speech = [] # Frames from onset (incl. preroll) to the last voiced frame
+        self.pending = [] # Unvoiced frames after speech; kept if speech resumes
+        self.trail_frames = int(VAD_TRAIL / self.frame_s)
+        self.cut = 0 # self.speech index where the next segment starts
+        self.segment_min_frames = int(STT_SEGMENT_MIN / self.frame_s)
+        self.segment_pause_frames = max(1, int(STT_SEGMENT_PAUSE / self.frame_s))
+
+    @property
+    def threshold(self):
+        return max(self.noise_db + self.threshold_db, VAD_MIN_THRESHOLD_DB)
+
+    def feed(self, frame, echo_db=None):
+        """
+        echo_db: estimated level of our own playback in this frame (barge-in). Speech must
+        be louder than it, and frames at or under it (echo, not room noise) can't raise the noise floor.
+        """
+        if self.result:
+            return self.result
+        level = frame_level_db(frame)
+        self.last_level = level
+        self.frames_seen += 1
+        if self.noise_db is None:
+            self.noise_db = level
+
+        # Hysteresis: once talking, stay "voiced" down to 3 dB under the start threshold
+        threshold = self.threshold if echo_db is None else max(self.threshold, echo_db)
+        voiced = level > threshold - (3 if self.started else 0)
+        if not voiced and (echo_db is None or level > echo_db or level < self.noise_db):
+            rate = 0.3 if level < self.noise_db else 0.03
+            self.noise_db += (level - self.noise_db) * rate
+
+        if not self.started:
+            self.preroll.append(frame)
+            self.run = self.run + 1 if voiced else 0
+            if self.run >= self.start_frames:
+                self.started = True
+                self.speech = list(self.preroll)
+                self.preroll.clear()
+            elif self.frames_seen >= self.onset_frames:
+                self.result = "no_onset"
+            return self.result
+
+        if voiced:
+            self.speech.extend(self.pending)
+            self.pending = []
+            self.speech.append(frame)
+            self.silent_frames = 0
+        else:
+            self.pending.append(frame)
+            self.silent_frames += 1
+            if self.silent_frames >= self.hangover_frames:
+                self.result = "end"
+        return self.result
+
+    def audio(self):
+        """int16 speech (with pre-roll and a short natural tail), or None if no speech started."""
+        if not self.started:
+            return None
+        return np.concatenate(self.speech + self.pending[:self.trail_frames])
+
+    def take_segment(self):
+        """
+        Speech since the last cut, if the caller is pausing (STT_SEGMENT_PAUSE) and it
+        is long enough (STT_SEGMENT_MIN) to transcribe on its own. Else None.
+        """
+        if (not self.started or self.result or self.silent_frames < self.segment_pause_frames
+                or len(self.speech) - self.cut < self.segment_min_frames):
+            return None
+        segment = np.concatenate(self.speech[self.cut:] + self.pending[:self.trail_frames])
+        self.cut = len(self.speech)
+        return segment
+
+    def remainder(self):
+        """Speech after the last take_segment() (the whole turn if none was taken), or None."""
+        if not self.started or self.cut >= len(self.speech):
+            return None
+        return np.concatenate(self.speech[self.cut:] + self.pending[:self.trail_frames])
+
+    @property
+    def speech_seconds(self):
+        return len(self.speech) * self.frame_s
+
+
+class MicCapture:
+    """
+    Live mono S16_LE capture in fixed frames from the handset mic.
+    pyalsaaudio if installed, else one arecord process read frame by frame.
+    terminate() (from another thread) ends read() within one frame.
+    """
+    def __init__(self, device=None, rate=VAD_SAMPLE_RATE, frame_ms=VAD_FRAME_MS):
+        self.device = device or f"plughw:{AUDIO_DEVICE_ID},0"
+        self.rate = rate
+        self.frame_samples = int(rate * frame_ms / 1000)
+        self.pcm = None
+        self.proc = None
+        self.closed = False
+        self._buf = b""
+
+    def start(self):
+        if alsaaudio:
+            try:
+                self.pcm = alsaaudio.PCM(alsaaudio.PCM_CAPTURE, device=self.device, channels=1, rate=self.rate,
+                                         format=alsaaudio.PCM_FORMAT_S16_LE, periodsize=self.frame_samples)
+                return
+            except Exception as e:
+                print(f"   (ALSA capture failed: {e}. Using arecord.)")
+        self.proc = subprocess.Popen(["arecord", "-q", "-t", "raw", "-f", "S16_LE", "-r", str(self.rate), "-c", "1",
+                                      "-D", self.device], stdout=subprocess.PIPE)
+
+    def read(self):
+        """Next frame as int16 array, or None when closed/ended."""
+        need = self.frame_samples * 2
+        while len(self._buf) < need:
+            if self.closed:
+                return None
+            if self.pcm:
+                length, data = self.pcm.read()
+                if length < 0:
+                    continue # Overrun; ALSA recovers on the next read
+            else:
+                data = self.proc.stdout.read(need - len(self._buf))
+                if not data:
+                    return None
+            self._buf += data
+        frame, self._buf = self._buf[:need], self._buf[need:]
+        return np.frombuffer(frame, dtype="<i2")
+
+    def terminate(self):
+        self.closed = True
+        if self.proc:
+            self.proc.terminate()
+
+    def close(self):
+        self.terminate()
+        if self.proc:
+            try:
+                self.proc.wait(timeout=1)
+            except Exception:
+                self.proc.kill()
+        if self.pcm:
+            try:
+                self.pcm.close()
+            except Exception:
+                pass
+            self.pcm = None
@@ -0,0 +1,351 @@
+import numpy as np
+from .config import DECADE_EFFECTS, TTS_SAMPLE_RATE
+
+# In-process replacement for the SoX chains in DECADE_EFFECTS.
+# Understands the effects those strings use (same syntax and defaults as SoX):
+#   highpass F, lowpass F          2-pole Butterworth
+#   bass G, treble G               shelving EQ at 100 Hz / 3 kHz (slope 0.5)
+#   overdrive [gain [colour]]      cubic soft clip + DC blocker
+#   reverb [rev [damp [room [depth [predelay [wet]]]]]]   synthetic impulse response
+#   compand att,dec [knee:]in,out,... [gain [init [delay]]]   block envelope (no knee, no lookahead)
+#   silence 1 dur thr%             drops leading silence
+# Consecutive linear stages (EQ, DC blocker, reverb) are merged into one FIR kernel
+# at preset build time, so a chain like "highpass lowpass reverb" is a single
+# FFT convolution per chunk.
+
+IR_GRID = 8192 # FFT grid used to turn IIR sections into impulse responses
+IR_ENERGY_CUTOFF = 1e-7 # Trim kernel tails below this fraction of total energy
+COMPAND_BLOCK = 64 # Samples per envelope step
+
+def decade_preset(year):
+    """Decade key of DECADE_EFFECTS for any year (1965 -> 1960), clamped to the table."""
+    if year is None:
+        return None
+    decades = sorted(DECADE_EFFECTS)
+    decade = (int(year) // 10) * 10
+    if decade <= decades[0]:
+        return decades[0]
+    return max(d for d in decades if d <= decade)
+
+def parse_effects(spec):
+    """'highpass 300 overdrive 5' -> [('highpass', ['300']), ('overdrive', ['5'])]"""
+    effects = []
+    for token in spec.split():
+        if token in _PARSERS:
+            effects.append((token, []))
+        elif effects:
+            effects[-1][1].append(token)
+        else:
+            raise ValueError(f"Unsupported effect '{token}'")
+    return effects
+
+
+# --- Linear sections (as impulse responses) ---
+
+def _biquad_response(sections, n=IR_GRID):
+    """Impulse response of cascaded (b, a) biquads, evaluated on an FFT grid."""
+    z = np.exp(-1j * np.pi * np.arange(n // 2 + 1) / (n // 2))
+    h = np.ones_like(z)
+    for b, a in sections:
+        h *= (b[0] + b[1] * z + b[2] * z * z) / (a[0] + a[1] * z + a[2] * z * z)
+    return np.fft.irfft(h, n)
+
+def _pass_filter(kind, freq, rate, q=0.7071):
+    if freq >= rate / 2:
+        return None # Above Nyquist: nothing to filter at this rate
+    w0 = 2 * np.pi * freq / rate
+    cos, alpha = np.cos(w0), np.sin(w0) / (2 * q)
+    if kind == "lowpass":
+        b = ((1 - cos) / 2, 1 - cos, (1 - cos) / 2)
+    else:
+        b = ((1 + cos) / 2, -(1 + cos), (1 + cos) / 2)
+    return b, (1 + alpha, -2 * cos, 1 - alpha)
+
+def _shelf(kind, gain_db, freq, rate, slope=0.5):
+    a_ = 10 ** (gain_db / 40)
+    w0 = 2 * np.pi * min(freq, rate * 0.45) / rate
+    cos = np.cos(w0)
+    alpha = np.sin(w0) / 2 * np.sqrt((a_ + 1 / a_) * (1 / slope - 1) + 2)
+    k = 2 * np.sqrt(a_) * alpha
+    if kind == "bass":
+        b = (a_ * ((a_ + 1) - (a_ - 1) * cos + k), 2 * a_ * ((a_ - 1) - (a_ + 1) * cos), a_ * ((a_ + 1) - (a_ - 1) * cos - k))
+        a = ((a_ + 1) + (a_ - 1) * cos + k, -2 * ((a_ - 1) + (a_ + 1) * cos), (a_ + 1) + (a_ - 1) * cos - k)
+    else:
+        b = (a_ * ((a_ + 1) + (a_ - 1) * cos + k), -2 * a_ * ((a_ - 1) + (a_ + 1) * cos), a_ * ((a_ + 1) + (a_ - 1) * cos - k))
+        a = ((a_ + 1) - (a_ - 1) * cos + k, 2 * ((a_ - 1) - (a_ + 1) * cos), (a_ + 1) - (a_ - 1) * cos - k)
+    return b, a
+
+def _reverb_ir(args, rate):
+    """Exponentially decaying noise tail (fixed seed, so every run sounds the same)."""
+    rev, damp, room, _depth, predelay, wet = (list(map(float, args)) + [50, 50, 100, 100, 0, 0][len(args):])[:6]
+    rt60 = 0.25 + 1.5 * (rev / 100) * (room / 100)
+    n = max(1, int(rt60 * rate))
+    t = np.arange(n) / rate
+    noise = np.random.default_rng(0).standard_normal(n)
+    width = max(1, rate // 2000)
+    low = np.convolve(noise, np.ones(width) / width, mode="same")
+    high = noise - low
+    tail = low * 10 ** (-3 * t / rt60) + high * 10 ** (-3 * t / (rt60 * (1 - 0.8 * damp / 100)))
+    tail *= 10 ** (wet / 20) * (0.15 + 0.5 * rev / 100) / np.sqrt(np.sum(tail ** 2))
+    start = max(int(predelay / 1000 * rate), int(0.005 * rate)) # First reflection
+    ir = np.zeros(start + n)
+    ir[0] = 1.0 # Dry signal
+    ir[start:] += tail
+    return ir
+
+def _trim(kernel):
+    energy = np.cumsum(kernel[::-1] ** 2)[::-1] # Energy from each tap to the end
+    keep = np.nonzero(energy > energy[0] * IR_ENERGY_CUTOFF)[0]
+    return kernel[:keep[-1] + 1] if len(keep) else kernel[:1]
+
+def _convolve(a, b):
+    n = len(a) + len(b) - 1
+    size = 1 << (n - 1).bit_length()
+    return np.fft.irfft(np.fft.rfft(a, size) * np.fft.rfft(b, size), size)[:n]
+
+
+# --- Stages (precomputed, shared) and their per-stream state ---
+
+class _FIRStage:
+    def __init__(self, kernel):
+        self.kernel = kernel
+        self._spectra = {} # FFT size -> rfft(kernel)
+
+    def spectrum(self, size):
+        spec = self._spectra.get(size)
+        if spec is None:
+            spec = self._spectra[size] = np.fft.rfft(self.kernel, size)
+        return spec
+
+    def start(self):
+        return _FIRState(self)
+
+
+class _FIRState:
+    """Overlap-add convolution over arbitrary chunk sizes (no added latency)."""
+    def __init__(self, stage):
+        self.stage = stage
+        self.tail = np.zeros(len(stage.kernel) - 1)
+
+    def process(self, x):
+        if not len(x):
+            return x
+        n = len(x) + len(self.stage.kernel) - 1
+        size = 1 << (n - 1).bit_length()
+        y = np.fft.irfft(np.fft.rfft(x, size) * self.stage.spectrum(size), size)[:n]
+        y[:len(self.tail)] += self.tail
+        out, self.tail = y[:len(x)], y[len(x):]
+        return out
+
+    def flush(self):
+        out, self.tail = self.tail, np.zeros(len(self.tail))
+        return out
+
+
+class _Overdrive:
+    linear_tail = ((1.0, -1.0, 0.0), (1.0, -0.995, 0.0)) # DC blocker, merged into the next FIR
+
+    def __init__(self, args, rate):
+        gain, colour = (list(map(float, args)) + [20, 20][len(args):])[:2]
+        self.gain = 10 ** (gain / 20)
+        self.offset = colour / 200 # Asymmetry (even harmonics)
+        self.rest = self._curve(np.array(self.offset)) # Output for silence, removed so there is no click
+
+    def start(self):
+        return self
+
+    @staticmethod
+    def _curve(d):
+        d = np.clip(d, -1, 1)
+        return d - d ** 3 / 3
+
+    def process(self, x):
+        return self._curve(x * self.gain + self.offset) - self.rest
+
+    def flush(self):
+        return np.zeros(0)
+
+
+class _Compand:
+    def __init__(self, args, rate):
+        times = args[0].split(",")
+        self.attack, self.decay = float(times[0]), float(times[1] if len(times) > 1 else times[0])
+        points = args[1].split(":")[-1] # Soft knee is not modelled
+        values = [float(v) for v in points.split(",")]
+        if len(values) % 2:
+            values.append(values[-1]) # Lone in-dB maps to itself
+        ins, outs = values[0::2], values[1::2]
+        # Unit slope outside the given points (as SoX)
+        self.xp = np.array([-200.0] + ins + [max(ins[-1], 0.0)])
+        self.fp = np.array([outs[0] - (ins[0] + 200)] + outs + [outs[-1] + max(0.0, -ins[-1])])
+        self.out_gain = float(args[2]) if len(args) > 2 else 0.0
+        self.init_volume = 10 ** ((float(args[3]) if len(args) > 3 else 0.0) / 20)
+        self.attack_k = 1 - np.exp(-COMPAND_BLOCK / (max(self.attack, 1e-4) * rate))
+        self.decay_k = 1 - np.exp(-COMPAND_BLOCK / (max(self.decay, 1e-4) * rate))
+
+    def start(self):
+        return _CompandState(self)
+
+
+class _CompandState:
+    def __init__(self, stage):
+        self.stage = stage
+        self.volume = stage.init_volume
+        self.gain = None # Last applied gain (linear), for continuity across chunks
+
+    def process(self, x):
+        if not len(x):
+            return x
+        s = self.stage
+        starts = np.arange(0, len(x), COMPAND_BLOCK)
+        peaks = np.maximum.reduceat(np.abs(x), starts)
+
+        levels = np.empty(len(peaks))
+        volume = self.volume
+        for i, peak in enumerate(peaks): # Envelope is recursive; one step per block
+            volume += (peak - volume) * (s.attack_k if peak > volume else s.decay_k)
+            levels[i] = volume
+        self.volume = volume
+
+        level_db = 20 * np.log10(np.maximum(levels, 1e-10))
+        gains = 10 ** ((np.interp(level_db, s.xp, s.fp) - level_db + s.out_gain) / 20)
+        ends = np.minimum(starts + COMPAND_BLOCK, len(x)) - 1
+        first = self.gain if self.gain is not None else gains[0]
+        curve = np.interp(np.arange(len(x)), np.concatenate(([-1], ends)), np.concatenate(([first], gains)))
+        self.gain = gains[-1]
+        return x * curve
+
+    def flush(self):
+        return np.zeros(0)
+
+
+class _SilenceGate:
+    """'silence 1 dur thr%': drop everything before the first sample above the threshold."""
+    def __init__(self, args, rate):
+        threshold = args[2] if len(args) > 2 else "1%"
+        self.threshold = float(threshold.rstrip("%")) / 100 if threshold.endswith("%") else float(threshold)
+
+    def start(self):
+        return _SilenceState(self.threshold)
+
+
+class _SilenceState:
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.open = False
+
+    def process(self, x):
+        if self.open:
+            return x
+        loud = np.nonzero(np.abs(x) > self.threshold)[0]
+        if not len(loud):
+            return x[:0]
+        self.open = True
+        return x[loud[0]:]
+
+    def flush(self):
+        return np.zeros(0)
+
+
+_PARSERS = {
+    "highpass": "linear", "lowpass": "linear", "bass": "linear", "treble": "linear", "reverb": "linear",
+    "overdrive": _Overdrive, "compand": _Compand, "silence": _SilenceGate,
+}
+
+
+class VintageFX:
+    """
+    One decade's effect chain, built once. stream() gives an independent
+    processor for one utterance; apply() runs a whole buffer.
+    Samples are float in [-1, 1]; the pcm16 helpers take/return raw S16_LE bytes.
+    """
+    def __init__(self, spec, rate=TTS_SAMPLE_RATE):
+        self.spec = spec
+        self.rate = rate
+        self.stages = []
+
+        sections = [] # Pending biquads
+        kernel = None # Pending merged impulse response
+        def close_linear():
+            nonlocal sections, kernel
+            if sections:
+                ir = _biquad_response(sections)
+                kernel = ir if kernel is None else _convolve(kernel, ir)
+                sections = []
+            if kernel is not None:
+                self.stages.append(_FIRStage(_trim(kernel)))
+                kernel = None
+
+        for name, args in parse_effects(spec):
+            if name in ("highpass", "lowpass"):
+                section = _pass_filter(name, float(args[0]), rate)
+                if section: sections.append(section)
+            elif name in ("bass", "treble"):
+                sections.append(_shelf(name, float(args[0]), 100 if name == "bass" else 3000, rate))
+            elif name == "reverb":
+                ir = _reverb_ir(args, rate)
+                if sections:
+                    ir = _convolve(_biquad_response(sections), ir)
+                    sections = []
+                kernel = ir if kernel is None else _convolve(kernel, ir)
+            else:
+                close_linear()
+                stage = _PARSERS[name](args, rate)
+                self.stages.append(stage)
+                if hasattr(stage, "linear_tail"):
+                    sections.append(stage.linear_tail)
+        close_linear()
+
+    def __repr__(self):
+        return f"VintageFX({self.spec!r}, {len(self.stages)} stages)"
+
+    def stream(self):
+        return FXStream(self)
+
+    def apply(self, samples):
+        stream = self.stream()
+        return np.concatenate((stream.process(samples), stream.flush()))
+
+
+class FXStream:
+    def __init__(self, fx):
+        self.states = [stage.start() for stage in fx.stages]
+        self._odd = b"" # Half a sample left over from the last pcm16 chunk
+
+    def process(self, x):
+        x = np.asarray(x, dtype=np.float64)
+        for state in self.states:
+            x = state.process(x)
+        return x
+
+    def flush(self):
+        """Tails (reverb, filter ringing) still owed after the last chunk."""
+        x = np.zeros(0)
+        for state in self.states:
+            x = np.concatenate((state.process(x), state.flush()))
+        return x
+
+    def process_pcm16(self, data):
+        data = self._odd + data
+        usable = len(data) - len(data) % 2
+        self._odd = data[usable:]
+        samples = np.frombuffer(data[:usable], dtype="<i2") / 32768.0
+        return to_pcm16(self.process(samples))
+
+    def flush_pcm16(self):
+        return to_pcm16(self.flush())
+
+
+def to_pcm16(samples):
+    return (np.clip(samples, -1.0, 32767 / 32768) * 32768).astype("<i2").tobytes()
+
+def build_presets(rate=TTS_SAMPLE_RATE):
+    """{decade: VintageFX or None} for every DECADE_EFFECTS entry (None = no processing)."""
+    presets = {}
+    for decade, spec in DECADE_EFFECTS.items():
+        try:
+            presets[decade] = VintageFX(spec, rate) if spec.strip() else None
+        except Exception as e:
+            print(f"   ⚠️ FX preset {decade} not built ({e}). Playing raw.")
+            presets[decade] = None
+    return presets
@@ -0,0 +1,49 @@
+import pytest
+from src.config import DIAL_END_DEFAULT, DIAL_END_MIN, DIAL_END_MAX
+from src.dial_plan import classify, EndOfNumberPredictor, COMPLETE, AMBIGUOUS, PARTIAL, INVALID
+
+
+@pytest.mark.parametrize("prefix, kind", [
+    # Single digits: decade shortcuts that are also the start of a year or 666
+    ("1", AMBIGUOUS), ("2", AMBIGUOUS), ("6", AMBIGUOUS),
+    ("0", COMPLETE), ("3", COMPLETE), ("5", COMPLETE), ("7", COMPLETE), ("8", COMPLETE), ("9", COMPLETE),
+    # Years 1900-2030
+    ("19", PARTIAL), ("190", PARTIAL), ("1900", COMPLETE), ("1999", COMPLETE),
+    ("20", PARTIAL), ("203", PARTIAL), ("2030", COMPLETE), ("2031", INVALID), ("204", INVALID),
+    ("18", INVALID), ("1899", INVALID), ("19655", INVALID),
+    # Timer
+    ("66", PARTIAL), ("666", COMPLETE), ("667", INVALID), ("6666", INVALID),
+])
+def test_classify(prefix, kind):
+    assert classify(prefix) == kind
+
+
+def predictor(gaps, tmp_path):
+    return EndOfNumberPredictor(gaps, path=str(tmp_path / "dial_timing.json"))
+
+
+def test_timeouts_by_prefix(tmp_path):
+    p = predictor([], tmp_path)
+    assert p.timeout_for("1965") == 0.0
+    assert p.timeout_for("0") == 0.0
+    assert p.timeout_for("2031") == 0.0
+    assert p.timeout_for("19") == DIAL_END_MAX
+    assert p.timeout_for("1") == DIAL_END_DEFAULT # Too few gaps observed yet
+
+
+def test_ambiguous_timeout_learns_from_gaps(tmp_path):
+    p = predictor([0.5] * 19 + [1.0], tmp_path)
+    assert p.timeout_for("6") == pytest.approx(1.0 * EndOfNumberPredictor.MARGIN)
+
+
+def test_ambiguous_timeout_is_clamped(tmp_path):
+    assert predictor([0.1] * 10, tmp_path).ambiguous_timeout() == DIAL_END_MIN
+    assert predictor([3.9] * 10, tmp_path).ambiguous_timeout() == DIAL_END_MAX
+
+
+def test_observed_gaps_are_saved(tmp_path):
+    p = predictor([], tmp_path)
+    for gap in (0.6, 0.7, 0.8, 0.9, 1.0, 0.0, DIAL_END_MAX + 1):
+        p.observe_gap(gap)
+    assert p.gaps == [0.6, 0.7, 0.8, 0.9, 1.0] # Zero and over-long pauses are not inter-digit gaps
+    assert EndOfNumberPredictor.load(p.path).gaps == p.gaps
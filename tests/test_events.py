@@ -0,0 +1,75 @@
+import threading
+import time
+from src.events import EventDispatcher, DialEvent, session_cancelled, bind_session
+
+
+def test_redial_starts_while_old_session_is_blocked():
+    release = threading.Event()
+    started = {}
+
+    def on_dial(number):
+        started[number] = time.monotonic()
+        if number == "1965":
+            release.wait(5.0) # A network call that ignores cancellation
+
+    dispatcher = EventDispatcher(on_dial_complete=on_dial, handoff_timeout=0.2)
+    dispatcher._dispatch(DialEvent("1965", 0.0))
+    time.sleep(0.05)
+    redial = time.monotonic()
+    dispatcher._dispatch(DialEvent("0", 0.1))
+    time.sleep(0.5)
+    release.set()
+    assert "0" in started
+    assert 0.15 < started["0"] - redial < 0.45
+
+
+def test_redial_waits_for_a_session_that_winds_down():
+    seen = []
+
+    def on_dial(number):
+        if number == "1965":
+            while not session_cancelled():
+                time.sleep(0.01)
+            time.sleep(0.05)
+            seen.append("1965 done")
+        else:
+            seen.append(number)
+
+    dispatcher = EventDispatcher(on_dial_complete=on_dial, handoff_timeout=2.0)
+    dispatcher._dispatch(DialEvent("1965", 0.0))
+    time.sleep(0.05)
+    dispatcher._dispatch(DialEvent("0", 0.1))
+    time.sleep(0.5)
+    assert seen == ["1965 done", "0"]
+
+
+def test_stale_session_does_not_act_after_handoff():
+    release = threading.Event()
+    acted = []
+    finished = threading.Event()
+
+    def act(number):
+        # What main.py does before starting music or writing chat history
+        if not session_cancelled():
+            acted.append(number)
+
+    def on_dial(number):
+        if number == "1965":
+            release.wait(5.0) # Blocked in a network call past the handoff
+            act(number)
+            # Helper threads the session starts (streamed reply producer) see it too
+            helper = threading.Thread(target=bind_session(lambda: act(number + " helper")))
+            helper.start()
+            helper.join()
+            finished.set()
+        else:
+            act(number)
+
+    dispatcher = EventDispatcher(on_dial_complete=on_dial, handoff_timeout=0.1)
+    dispatcher._dispatch(DialEvent("1965", 0.0))
+    time.sleep(0.05)
+    dispatcher._dispatch(DialEvent("0", 0.1))
+    time.sleep(0.3)
+    release.set()
+    assert finished.wait(2.0)
+    assert acted == ["0"]
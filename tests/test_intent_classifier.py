@@ -0,0 +1,44 @@
+import pytest
+from src.intent_classifier import IntentClassifier, timer_command
+
+classifier = IntentClassifier()
+
+
+@pytest.mark.parametrize("text", [
+    "don't play that", "please don't play anything", "stop the music", "no more music please",
+    "I don't want to hear Elvis", "nehraj to", "vypni tu hudbu", "nepouštějte mi to",
+])
+def test_negations_never_decide_music(text):
+    guess = classifier.classify(text)
+    assert not (guess.intent == "MUSIC" and classifier.confident(guess))
+
+
+@pytest.mark.parametrize("text", [
+    "I want to chat", "I'd rather talk for a while", "that song reminds me of my grandmother",
+    "how about some Motown", "chci si povídat",
+])
+def test_model_guesses_go_to_the_llm(text):
+    guess = classifier.classify(text)
+    assert guess.source == "model"
+    assert not classifier.confident(guess)
+
+
+@pytest.mark.parametrize("text, intent, generic", [
+    ("Play Hound Dog by Elvis", "MUSIC", False), ("Pusť mi Beatles, prosím", "MUSIC", False),
+    ("yes please", "MUSIC", True), ("play some music", "MUSIC", True),
+    ("Who is the president?", "CHAT", False), ("Co je nového?", "CHAT", False),
+])
+def test_rule_hits_decide_locally(text, intent, generic):
+    guess = classifier.classify(text)
+    assert (guess.intent, guess.generic) == (intent, generic)
+    assert classifier.confident(guess)
+
+
+@pytest.mark.parametrize("text, command", [
+    ("Cancel my timers.", "CANCEL"), ("Please stop all timers", "CANCEL"), ("Zruš to.", "CANCEL"),
+    ("How many timers do I have?", "LIST"), ("Which ones are set?", "LIST"), ("Kolik mám časovačů?", "LIST"),
+    ("Ten minutes, which is when the pasta is done.", None), ("Five minutes, then stop.", None),
+    ("Set one for a nonstop minute", None), ("Dvacet minut", None),
+])
+def test_timer_commands_open_the_sentence(text, command):
+    assert timer_command(text) == command
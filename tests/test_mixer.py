@@ -0,0 +1,40 @@
+import time
+import numpy as np
+from src.config import MIXER_BUFFER_PERIODS
+from src.mixer import Mixer
+
+
+class FakeDevice:
+    """Blocks like an ALSA write for one period; write number `stall_at` takes longer than the buffer."""
+    def __init__(self, mixer, stall_at=None, writes=20):
+        self.mixer = mixer
+        self.stall_at = stall_at
+        self.limit = writes
+        self.writes = 0
+
+    def __call__(self, data):
+        self.writes += 1
+        period_s = self.mixer.period / self.mixer.rate
+        time.sleep(period_s * (MIXER_BUFFER_PERIODS + 2) if self.writes == self.stall_at else period_s)
+        if self.writes >= self.limit:
+            self.mixer.running = False
+
+
+def run_mixer(**device_args):
+    mixer = Mixer()
+    device = FakeDevice(mixer, **device_args)
+    def open_device():
+        mixer.out = device
+        return True
+    mixer._open = open_device
+    mixer.play("speech", np.zeros(mixer.rate, dtype=np.int16))
+    mixer.run()
+    return mixer
+
+
+def test_stalled_write_counts_an_underrun():
+    assert run_mixer(stall_at=5).underruns == 1
+
+
+def test_steady_writes_count_none():
+    assert run_mixer().underruns == 0
@@ -0,0 +1,34 @@
+from src.prefetch import SpeculativePrefetcher
+
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+
+    def get_decade_playlist(self, decade, language):
+        self.calls.append(("playlist", decade))
+
+    def generate_host_intro(self, decade, language, template):
+        self.calls.append(("intro", decade))
+
+
+def dial(prefixes):
+    recorder = Recorder()
+    prefetcher = SpeculativePrefetcher(recorder, recorder)
+    for prefix in prefixes:
+        prefetcher.on_prefix(prefix)
+    prefetcher.executor.shutdown(wait=True)
+    return sorted(recorder.calls)
+
+
+def test_first_digits_of_a_year_prefetch_nothing():
+    assert dial(["1", "19"]) == []
+    assert dial(["2", "20"]) == []
+
+
+def test_third_digit_prefetches_one_decade():
+    assert dial(["1", "19", "196"]) == [("intro", 1960), ("playlist", 1960)]
+
+
+def test_shortcut_digit_prefetches_its_decade():
+    assert dial(["6"]) == [("playlist", 1960)]
@@ -0,0 +1,80 @@
+from src.config import HOOK_DEBOUNCE, GHOST_LOCKOUT
+from src.pulse_decoder import HOOK, DIAL, DecoderTimings, decode_edges, digits_of, calibrate
+
+
+def dial(number, at, period=0.1, break_ratio=0.6, gap=1.0, bounce=0.0):
+    """Dial edges for `number` starting at `at`; bounce adds a contact chatter after each rise."""
+    edges = []
+    t = at
+    for ch in number:
+        for _ in range(int(ch) or 10):
+            edges.append((DIAL, 1, t))
+            if bounce:
+                edges += [(DIAL, 0, t + bounce / 2), (DIAL, 1, t + bounce)]
+            edges.append((DIAL, 0, t + period * break_ratio))
+            t += period
+        t += gap
+    return edges, t
+
+
+def trace(number, lift_edges=(), ghost=(), bounce=0.002):
+    edges = [(HOOK, 0, 0.0)] + list(lift_edges) + list(ghost)
+    digits, end = dial(number, at=1.5, bounce=bounce)
+    return number, sorted(edges + digits + [(HOOK, 1, end + 1.0)], key=lambda e: e[2])
+
+
+def test_decodes_clean_dial():
+    label, edges = trace("1965", bounce=0)
+    events = decode_edges(edges)
+    assert digits_of(events) == "1965"
+    assert [value for kind, value, _ in events if kind == "hook"] == [True, False]
+
+
+def test_contact_bounce_is_not_counted():
+    label, edges = trace("2024", bounce=0.004)
+    assert digits_of(decode_edges(edges)) == "2024"
+    # Without the debounce every bounce would be a pulse
+    assert digits_of(decode_edges(edges, DecoderTimings(pulse_debounce=0.001))) != "2024"
+
+
+def test_ghost_pulses_after_lift_are_ignored():
+    ghost = [(DIAL, 1, 0.4), (DIAL, 0, 0.41), (DIAL, 1, 0.45), (DIAL, 0, 0.46)]
+    label, edges = trace("0", ghost=ghost)
+    assert digits_of(decode_edges(edges)) == "0"
+    assert digits_of(decode_edges(edges, DecoderTimings(ghost_lockout=0.1))) == "20"
+
+
+def test_hook_chatter_is_one_lift():
+    chatter = [(HOOK, 1, 0.004), (HOOK, 0, 0.007)]
+    label, edges = trace("9", lift_edges=chatter)
+    events = decode_edges(edges)
+    assert [value for kind, value, _ in events if kind == "hook"] == [True, False]
+
+
+def test_hangup_mid_digit_submits_pulses_so_far():
+    edges, end = dial("5", at=1.5, bounce=0)
+    edges = [(HOOK, 0, 0.0)] + edges + [(HOOK, 1, end - 1.0 + 0.05)]
+    events = decode_edges(edges)
+    assert digits_of(events) == "5"
+    assert [kind for kind, _, _ in events] == ["hook", "digit", "hook"]
+
+
+def test_calibrate_keeps_hook_defaults_without_hook_evidence():
+    traces = [trace(n) for n in ("1965", "0", "666", "2024")]
+    timings, report = calibrate(traces)
+    assert report["correct"] == report["traces"]
+    assert timings.hook_debounce == HOOK_DEBOUNCE
+    assert timings.ghost_lockout == GHOST_LOCKOUT
+    assert report["timings"]["hook_debounce"][1].startswith("default")
+    assert report["timings"]["ghost_lockout"][1].startswith("default")
+    assert report["timings"]["digit_gap"][1] == "calibrated"
+
+
+def test_calibrate_tightens_hook_debounce_only_as_far_as_bounces_allow():
+    # The handset chatters for 120 ms on lift: the debounce must stay above that
+    chatter = [(HOOK, 1, 0.06), (HOOK, 0, 0.12)]
+    traces = [trace(n, lift_edges=chatter) for n in ("1965", "0", "666")]
+    timings, report = calibrate(traces)
+    assert report["correct"] == report["traces"]
+    assert report["timings"]["hook_debounce"][1] == "calibrated"
+    assert 0.06 < timings.hook_debounce <= HOOK_DEBOUNCE
@@ -0,0 +1,56 @@
+from src.speech_text import split_sentences, TextChunker
+
+
+def test_split_sentences():
+    assert split_sentences("Hello there, caller. Welcome to 1965! What shall we play?") == [
+        "Hello there, caller.", "Welcome to 1965!", "What shall we play?"]
+
+
+def test_abbreviations_do_not_end_a_sentence():
+    text = "Mr. Sinatra is in town with Dr. Martin. St. Louis loved him."
+    assert split_sentences(text) == ["Mr. Sinatra is in town with Dr. Martin.", "St. Louis loved him."]
+
+
+def test_initials_do_not_end_a_sentence():
+    assert split_sentences("President J. F. Kennedy spoke today. The crowd cheered.") == [
+        "President J. F. Kennedy spoke today.", "The crowd cheered."]
+
+
+def test_czech_abbreviations():
+    text = "Hrají např. Olympic nebo sv. Václav. To je ale zpráva!"
+    assert split_sentences(text) == ["Hrají např. Olympic nebo sv. Václav.", "To je ale zpráva!"]
+
+
+def test_short_sentences_are_joined():
+    assert split_sentences("Well. It is a fine day in Prague. Yes.") == ["Well. It is a fine day in Prague. Yes."]
+
+
+def feed_tokens(chunker, text, size=3):
+    chunks = []
+    for i in range(0, len(text), size):
+        chunks += chunker.feed(text[i:i + size])
+    rest = chunker.flush()
+    return chunks + ([rest] if rest else [])
+
+
+def test_chunker_matches_split_sentences_on_streamed_text():
+    text = "Mr. Presley just left the building. Dr. Hook is on next! Stay tuned, folks."
+    assert feed_tokens(TextChunker(), text) == split_sentences(text)
+
+
+def test_chunker_waits_past_abbreviations():
+    chunker = TextChunker()
+    assert chunker.feed("Here is Mr. ") == []
+    assert chunker.feed("Sinatra with a new song. ") == ["Here is Mr. Sinatra with a new song."]
+
+
+def test_chunker_cuts_long_first_clause():
+    chunks = feed_tokens(TextChunker(first_min=24), "Well now, ladies and gentlemen, here comes the big one")
+    assert chunks == ["Well now, ladies and gentlemen,", "here comes the big one"]
+
+
+def test_flush_returns_rest_once():
+    chunker = TextChunker()
+    chunker.feed("No full stop")
+    assert chunker.flush() == "No full stop"
+    assert chunker.flush() is None
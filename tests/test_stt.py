@@ -0,0 +1,71 @@
+import numpy as np
+from src.config import VAD_SAMPLE_RATE
+from src.stt import speech_presence, SegmentedTranscriber, STT_PROMPTS
+
+RATE = VAD_SAMPLE_RATE
+
+
+def tone(seconds, db, freq=220.0):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return 32768.0 * 10 ** (db / 20) * np.sqrt(2) * np.sin(2 * np.pi * freq * t)
+
+
+def silence(seconds, db=-70):
+    rng = np.random.default_rng(0)
+    return rng.normal(0, 32768.0 * 10 ** (db / 20), int(seconds * RATE))
+
+
+def to_int16(x):
+    return np.clip(x, -32768, 32767).astype(np.int16)
+
+
+def continuous_speech(seconds=3.0):
+    """Voiced signal with 6-10 dB syllable dips and no pauses."""
+    pieces = []
+    for i in range(int(seconds / 0.1)):
+        pieces.append(tone(0.1, -20 - (6, 10, 0, 8)[i % 4], freq=150 + 10 * (i % 5)))
+    return np.concatenate(pieces)
+
+
+def test_long_continuous_speech_passes():
+    samples = to_int16(np.concatenate([continuous_speech(3.0), silence(0.2)]))
+    present, reason = speech_presence(samples)
+    assert present, reason
+    assert float(reason.split()[1].rstrip("s")) > 2.5
+
+
+def test_long_continuous_speech_passes_with_vad_floor():
+    samples = to_int16(np.concatenate([silence(0.2), continuous_speech(3.0)]))
+    present, reason = speech_presence(samples, floor_db=-60)
+    assert present, reason
+
+
+def test_short_word_passes():
+    samples = to_int16(np.concatenate([silence(0.5), tone(0.4, -25), silence(0.5)]))
+    assert speech_presence(samples)[0]
+
+
+def test_quiet_line_is_rejected():
+    present, reason = speech_presence(to_int16(silence(2.0, db=-50)))
+    assert not present
+    assert reason.startswith("peak")
+
+
+def test_hiss_is_rejected():
+    rng = np.random.default_rng(1)
+    hiss = to_int16(rng.normal(0, 32768.0 * 10 ** (-25 / 20), 2 * RATE))
+    present, reason = speech_presence(hiss)
+    assert not present
+    assert reason.startswith("voiced")
+
+
+def test_noise_at_floor_is_rejected():
+    # Loud but steady line hum at the VAD's floor: never 12 dB above it
+    hum = to_int16(tone(2.0, -35, freq=50.0))
+    assert not speech_presence(hum, floor_db=-36)[0]
+
+
+def test_ui_language_is_a_prompt_hint_not_forced():
+    transcriber = SegmentedTranscriber(None, None, "CZ")
+    assert transcriber.language is None # Whisper still detects an English answer
+    assert transcriber.prompt == STT_PROMPTS["CZ"]
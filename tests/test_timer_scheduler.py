@@ -0,0 +1,60 @@
+import json
+import time
+from src.timer_scheduler import TimerScheduler
+
+
+def test_wall_clock_jump_does_not_move_timers(tmp_path, monkeypatch):
+    timers = TimerScheduler(path=str(tmp_path / "timers.json"))
+    timers.add(300, label="tea")
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + 3600) # NTP sync an hour ahead
+    assert 299 < timers.list()[0]["remaining"] <= 300
+
+
+def test_saved_due_time_is_wall_clock(tmp_path):
+    path = tmp_path / "timers.json"
+    timers = TimerScheduler(path=str(path))
+    timers.add(120, label="eggs")
+    saved = json.loads(path.read_text())["timers"][0]
+    assert "deadline" not in saved
+    assert abs(saved["due"] - (time.time() + 120)) < 1.0
+
+
+def test_pending_timers_survive_a_restart(tmp_path):
+    path = str(tmp_path / "timers.json")
+    timers = TimerScheduler(path=path)
+    first = timers.add(600, label="pasta")
+    second = timers.add(60, label="eggs")
+    timers.cancel(first)
+    restored = TimerScheduler(path=path)
+    assert [(e["id"], e["label"]) for e in restored.list()] == [(second, "eggs")]
+    assert 59 < restored.list()[0]["remaining"] <= 60
+    assert restored.add(30) > second # Ids keep counting
+
+
+def test_timers_expired_while_offline(tmp_path):
+    path = tmp_path / "timers.json"
+    now = time.time()
+    path.write_text(json.dumps({"timers": [
+        {"id": 1, "due": now - 60, "action": "ring", "label": "recent", "created": now - 120},
+        {"id": 2, "due": now - 3600, "action": "ring", "label": "stale", "created": now - 4000},
+    ]}))
+    timers = TimerScheduler(path=str(path), late_grace=600)
+    assert [e["label"] for e in timers.list()] == ["recent"] # Rings right after start
+
+
+def test_timer_fires_once_and_is_forgotten(tmp_path):
+    path = tmp_path / "timers.json"
+    timers = TimerScheduler(path=str(path))
+    fired = []
+    timers.register("ring", lambda entry: fired.append(entry["label"]))
+    timers.add(0.05, label="soon")
+    timers.add(60, label="later")
+    timers.start()
+    deadline = time.monotonic() + 2.0
+    while not fired and time.monotonic() < deadline:
+        time.sleep(0.01)
+    timers.stop()
+    assert fired == ["soon"]
+    assert [e["label"] for e in timers.list()] == ["later"]
+    assert [e["label"] for e in json.loads(path.read_text())["timers"]] == ["later"]
@@ -0,0 +1,53 @@
+import os
+import time
+from src.tts_cache import TTSCache
+
+
+def make_cache(tmp_path, max_bytes=300):
+    return TTSCache(path=str(tmp_path / "tts_cache"), max_bytes=max_bytes)
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = make_cache(tmp_path)
+    for key in ("a", "b", "c"):
+        cache.put(key, key.encode() * 100)
+    assert cache.load("a") # "b" is now the oldest
+    cache.put("d", b"d" * 100)
+    assert "b" not in cache
+    assert all(key in cache for key in ("a", "c", "d"))
+    assert cache.total_bytes == 300
+
+
+def test_pinned_entries_are_not_evicted(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("a", b"a" * 100)
+    cache.pin("a", b"a" * 100)
+    cache.put("b", b"b" * 100)
+    cache.put("c", b"c" * 100)
+    cache.put("d", b"d" * 100)
+    assert "b" not in cache
+    assert cache.load("a") == b"a" * 100
+    # Still on disk: a restarted cache has it
+    assert "a" in make_cache(tmp_path)
+
+
+def test_lru_order_survives_restart(tmp_path):
+    cache = make_cache(tmp_path)
+    for i, key in enumerate(("a", "b", "c")):
+        cache.put(key, key.encode() * 100)
+        os.utime(cache._file(key), (time.time() - 100 + i, time.time() - 100 + i))
+    os.utime(cache._file("a")) # Most recently used
+    cache = make_cache(tmp_path)
+    cache.put("d", b"d" * 100)
+    assert "b" not in cache
+    assert "a" in cache
+
+
+def test_discard_forgets_memory_and_disk(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("a", b"a" * 100)
+    cache.pin("a", b"a" * 100)
+    cache.discard("a")
+    assert "a" not in cache
+    assert cache.load("a") is None
+    assert cache.total_bytes == 0
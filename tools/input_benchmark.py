@@ -0,0 +1,63 @@
+import sys
+import os
+import time
+import argparse
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.phone_interface import PhoneInterface
+from src.gpio_backend import create_backend, SimulatedBackend
+
+def run_backend(name, number, idle):
+    """Run PhoneInterface on one backend and report CPU + edge latency."""
+    dialed = []
+    hooks = []
+    backend = create_backend(name)
+    phone = PhoneInterface(
+        on_hook_change=lambda off: hooks.append(off),
+        on_dial_complete=lambda n: dialed.append(n),
+        backend=backend
+    )
+    phone.start_interface()
+    cpu_start = time.process_time()
+    wall_start = time.time()
+
+    if isinstance(backend, SimulatedBackend):
+        # Lift, wait out the ghost lockout, dial, hang up
+        edges = backend.lift_edges(0.0)
+        edges += backend.dial_edges(number, at=1.5)
+        end = max(t for t, _, _ in edges) + 5.0
+        edges += backend.hangup_edges(end)
+        backend.play(edges, block=True)
+        time.sleep(0.5)
+    else:
+        print(f"   (Hardware backend: lift the handset and dial {number} within {idle}s...)")
+
+    time.sleep(idle)
+    stats = phone.stats()
+    # Whole-process CPU also covers the backend's own threads (poll loop, callbacks)
+    stats["process_cpu_pct"] = 100.0 * (time.process_time() - cpu_start) / (time.time() - wall_start)
+    phone.cleanup()
+    return stats, dialed, hooks
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CPU and edge jitter of PhoneInterface backends.")
+    parser.add_argument("--backends", default="sim,sim-poll", help="Comma list: edge,poll,sim,sim-poll")
+    parser.add_argument("--number", default="1965")
+    parser.add_argument("--idle", type=float, default=5.0, help="Extra idle seconds to include in CPU share")
+    args = parser.parse_args()
+
+    print("========================================")
+    print("      INPUT BACKEND BENCHMARK")
+    print("========================================")
+
+    for name in args.backends.split(","):
+        stats, dialed, hooks = run_backend(name.strip(), args.number, args.idle)
+        print(f"[{name}] dialed={dialed} hooks={hooks}")
+        print(f"   CPU: {stats['process_cpu_pct']:.2f}% of a core total | sampling thread {stats['loop_cpu_pct']:.2f}%")
+        print(f"   Wakeups: {stats['loop_wakeups']} | poll cycles: {stats['poll_cycles']}")
+        print(f"   Edge latency: avg {stats['latency_avg_ms']:.3f} ms | max {stats['latency_max_ms']:.3f} ms ({stats['edges']} edges)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import sys
+import os
+import json
+import time
+import argparse
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import INTENT_CONFIDENCE
+from src.intent_classifier import IntentClassifier
+
+# Scores the on-device intent check (src/intent_classifier.py) against a labelled set:
+# how often it decides alone (= LLM intent calls saved), how often it is right when it
+# does, and how that trades off with the confidence threshold.
+# --llm also asks Brain.classify_intent for the rest (needs OPENAI_API_KEY).
+
+EVAL_SET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "intent_eval.jsonl")
+
+def load_set(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def evaluate(classifier, rows, threshold):
+    """(decided locally, correct among those, guesses) at one threshold."""
+    local = correct = 0
+    guesses = []
+    for row in rows:
+        guess = classifier.classify(row["text"])
+        guesses.append(guess)
+        if classifier.confident(guess, threshold):
+            local += 1
+            correct += guess.intent == row["intent"]
+    return local, correct, guesses
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the local MUSIC/CHAT intent classifier.")
+    parser.add_argument("--set", default=EVAL_SET, help="JSONL with text, intent, language")
+    parser.add_argument("--threshold", type=float, default=INTENT_CONFIDENCE)
+    parser.add_argument("--llm", action="store_true", help="Classify the undecided rows with the LLM too")
+    parser.add_argument("-v", "--verbose", action="store_true", help="List every row")
+    args = parser.parse_args()
+
+    rows = load_set(args.set)
+    classifier = IntentClassifier(threshold=args.threshold)
+
+    print("========================================")
+    print("      INTENT CLASSIFIER EVALUATION")
+    print("========================================")
+
+    start = time.perf_counter()
+    local, correct, guesses = evaluate(classifier, rows, args.threshold)
+    elapsed = (time.perf_counter() - start) / len(rows)
+
+    brain = None
+    if args.llm:
+        from src.brain import Brain
+        brain = Brain()
+
+    final_correct = 0
+    llm_time = 0.0
+    for row, guess in zip(rows, guesses):
+        decided = classifier.confident(guess)
+        intent = guess.intent
+        if not decided and brain:
+            t = time.perf_counter()
+            intent = brain.classify_intent(row["text"], local=False)
+            llm_time += time.perf_counter() - t
+        final_correct += intent == row["intent"]
+        if args.verbose or (decided and guess.intent != row["intent"]):
+            mark = "  " if intent == row["intent"] else "✗ "
+            how = f"{guess.source} {guess.confidence:.2f}" if decided else f"LLM ({guess.source} {guess.confidence:.2f})"
+            print(f"{mark}[{row['language']}] {row['text']!r}: {intent} (want {row['intent']}, {how})")
+
+    print(f"Rows: {len(rows)} | threshold {args.threshold:.2f} | {elapsed * 1e6:.0f} µs per utterance")
+    for language in sorted({row["language"] for row in rows}):
+        subset = [(r, g) for r, g in zip(rows, guesses) if r["language"] == language]
+        sure = [(r, g) for r, g in subset if classifier.confident(g)]
+        right = sum(g.intent == r["intent"] for r, g in sure)
+        print(f"   {language}: decided locally {len(sure)}/{len(subset)}, correct {right}/{len(sure)}")
+    by_source = {}
+    for guess in guesses:
+        if classifier.confident(guess):
+            by_source[guess.source] = by_source.get(guess.source, 0) + 1
+    print(f"Local decisions: {local}/{len(rows)} ({100 * local / len(rows):.0f}%) "
+          f"- {', '.join(f'{s} {n}' for s, n in sorted(by_source.items()))}")
+    print(f"Accuracy when deciding locally: {correct}/{local} ({100 * correct / max(local, 1):.1f}%)")
+    print(f"LLM intent calls saved: {local} of {len(rows)} (only {len(rows) - local} still go to the network)")
+    if brain:
+        print(f"Overall accuracy with LLM fallback: {final_correct}/{len(rows)} | LLM time {llm_time:.1f}s")
+
+    print("\nThreshold sweep (local share / accuracy when local):")
+    for threshold in (0.6, 0.7, 0.8, 0.85, 0.9, 0.95):
+        n, ok, _ = evaluate(classifier, rows, threshold)
+        print(f"   {threshold:.2f}: {100 * n / len(rows):5.1f}% local, {100 * ok / max(n, 1):5.1f}% correct")
+
+if __name__ == "__main__":
+    main()
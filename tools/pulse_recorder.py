@@ -0,0 +1,95 @@
+import sys
+import os
+import time
+import random
+import argparse
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import HOOK_PIN, DIAL_PIN
+from src.gpio_backend import create_backend, SimulatedBackend
+from src.pulse_trace import write_traces, pins_to_channels
+
+def record_one(backend, settle=1.0):
+    """Record raw edges from handset lift until it has been back on hook for `settle` seconds."""
+    edges = []
+    on_hook_since = None
+    lifted = False
+
+    while True:
+        edge = backend.wait_edge(timeout=0.1)
+        now = backend.now()
+        if edge:
+            pin, level, t = edge
+            if pin == HOOK_PIN and level == 0:
+                lifted = True
+            if lifted:
+                edges.append(edge)
+            if pin == HOOK_PIN:
+                on_hook_since = t if level == 1 else None
+
+        if lifted and on_hook_since is not None and now - on_hook_since > settle:
+            return edges
+
+def synthetic_trace(sim, number, rng):
+    """A lift/dial/hangup trace with realistic jitter and contact bounce."""
+    pps = rng.uniform(9.0, 11.0)
+    period_ms = 1000.0 / pps
+    break_ms = period_ms * rng.uniform(0.58, 0.66)
+    lift = [(0.0, HOOK_PIN, 0)]
+    # Lift bounce and a couple of ghost pulses from the dial contacts
+    lift += [(0.004, HOOK_PIN, 1), (0.007, HOOK_PIN, 0)]
+    lift += [(0.15, DIAL_PIN, 1), (0.16, DIAL_PIN, 0)]
+
+    t = rng.uniform(1.2, 2.0)
+    edges = list(lift)
+    for ch in str(number):
+        edges += sim.dial_edges(ch, at=t, break_ms=break_ms, make_ms=period_ms - break_ms,
+                                gap=0, bounce_ms=rng.uniform(0.5, 4.0))
+        pulses = int(ch) or 10
+        t += pulses * period_ms / 1000 + rng.uniform(0.8, 1.6)
+    edges.append((t + 1.0, HOOK_PIN, 1))
+    return pins_to_channels([(pin, level, at) for at, pin, level in sorted(edges)], HOOK_PIN, DIAL_PIN)
+
+def main():
+    parser = argparse.ArgumentParser(description="Record rotary dial pulse trains to a compact trace file.")
+    parser.add_argument("--out", default="dial_traces.rpt")
+    parser.add_argument("--label", default="", help="Number you will dial (needed for calibration)")
+    parser.add_argument("--count", type=int, default=10, help="How many dials to record")
+    parser.add_argument("--synthetic", action="store_true", help="Generate simulated traces instead (no Pi)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        rng = random.Random(args.seed)
+        sim = SimulatedBackend()
+        numbers = [args.label] if args.label else ["1965", "0", "9", "666", "2024", "1", "1939"]
+        traces = []
+        for i in range(args.count):
+            number = numbers[i % len(numbers)]
+            traces.append((number, synthetic_trace(sim, number, rng)))
+        write_traces(args.out, traces, append=os.path.exists(args.out))
+        print(f"✅ Wrote {len(traces)} synthetic traces to {args.out}")
+        return
+
+    backend = create_backend("edge")
+    backend.setup((HOOK_PIN, DIAL_PIN))
+
+    print("========================================")
+    print("      ROTARY PULSE RECORDER")
+    print("========================================")
+    try:
+        for i in range(args.count):
+            print(f"[{i + 1}/{args.count}] Lift the handset, dial {args.label or 'a number'}, hang up.")
+            raw = record_one(backend)
+            edges = pins_to_channels(raw, HOOK_PIN, DIAL_PIN)
+            write_traces(args.out, [(args.label, edges)], append=os.path.exists(args.out))
+            print(f"   💾 Saved {len(edges)} edges")
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    finally:
+        backend.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import sys
+import os
+import time
+import argparse
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import DIAL_CALIBRATION_FILE
+from src.pulse_decoder import DecoderTimings, decode_edges, digits_of, calibrate
+from src.pulse_trace import read_traces
+
+def replay(traces, timings):
+    """Decode every trace in virtual time. Returns (correct, labeled, misdials, seconds)."""
+    start = time.perf_counter()
+    correct = labeled = 0
+    misdials = []
+    for label, edges in traces:
+        dialed = digits_of(decode_edges(edges, timings))
+        if label:
+            labeled += 1
+            if dialed == label:
+                correct += 1
+            else:
+                misdials.append((label, dialed))
+    return correct, labeled, misdials, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Decode recorded dial traces and calibrate decoder timings.")
+    parser.add_argument("traces", nargs="+", help="Trace files from tools/pulse_recorder.py")
+    parser.add_argument("--calibrate", action="store_true", help="Derive the tightest safe timings")
+    parser.add_argument("--write", action="store_true", help=f"Save calibration to {DIAL_CALIBRATION_FILE}")
+    parser.add_argument("--repeat", type=int, default=1, help="Replay N times (throughput test)")
+    args = parser.parse_args()
+
+    traces = []
+    for path in args.traces:
+        traces += read_traces(path)
+    print(f"📼 Loaded {len(traces)} traces")
+
+    timings = DecoderTimings.load()
+    correct, labeled, misdials, elapsed = replay(traces * args.repeat, timings)
+    print(f"   Current {timings}")
+    print(f"   {correct}/{labeled} correct | {len(traces) * args.repeat / elapsed:.0f} dials/s")
+    for label, dialed in misdials[:10]:
+        print(f"   ❌ dialed {label} -> decoded {dialed or '(nothing)'}")
+
+    if args.calibrate:
+        new_timings, report = calibrate(traces)
+        print(f"🎛️ Calibrated {new_timings}")
+        print(f"   Max bounce {report['max_bounce_ms']:.1f}ms | pulse period {report['pulse_period_ms'][0]:.0f}-{report['pulse_period_ms'][1]:.0f}ms")
+        for field, (ms, source) in report["timings"].items():
+            print(f"   {field}: {ms:.0f}ms ({source})")
+        print(f"   {report['correct']}/{report['traces']} correct with calibrated timings")
+        saved_ms = (timings.digit_gap - new_timings.digit_gap) * 1000
+        print(f"   Dial-to-action latency: {saved_ms:.0f}ms faster per digit than current")
+
+        if args.write:
+            if report["correct"] != report["traces"]:
+                print("   ⚠️ Not saving: calibrated timings misdial some traces.")
+            else:
+                new_timings.save()
+                print(f"   💾 Saved to {DIAL_CALIBRATION_FILE}")
+
+if __name__ == "__main__":
+    main()
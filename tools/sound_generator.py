@@ -1,86 +1,45 @@
-import wave
-import math
-import struct
-import random
+import sys
 import os
+import time
+import wave
+import argparse
 
-def generate_tone(filename, frequency=440, duration=10.0, volume=0.5, rate=44100, interrupted=False):
-    print(f"Generating {filename} ({frequency}Hz, Interrupted={interrupted})...")
-    with wave.open(filename, 'w') as wav_file:
-        wav_file.setnchannels(1)
-        wav_file.setsampwidth(2)
-        wav_file.setframerate(rate)
-        
-        data = []
-        # Generate full duration
-        total_samples = int(rate * duration)
-        
-        # Interrupted Pattern: 0.5s ON, 0.5s OFF (Total 1s cycle)
-        period_samples = int(rate * 1.0) 
-        on_samples = int(rate * 0.5) 
-        
-        for i in range(total_samples):
-            # If interrupted, check cycle
-            is_silence = False
-            if interrupted:
-                cycle_pos = i % period_samples
-                if cycle_pos > on_samples:
-                    is_silence = True
-            
-            if is_silence:
-                value = 0
-            else:
-                # Sine wave
-                value = int(volume * 32767.0 * math.sin(2.0 * math.pi * frequency * i / rate))
-                
-            data.append(struct.pack('<h', value))
-            
-        wav_file.writeframes(b''.join(data))
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def generate_static(filename, duration=2.0, volume=0.3, rate=44100):
-    print(f"Generating {filename} (Static)...")
-    with wave.open(filename, 'w') as wav_file:
-        wav_file.setnchannels(1)
-        wav_file.setsampwidth(2)
-        wav_file.setframerate(rate)
-        
-        data = []
-        for i in range(int(rate * duration)):
-            # White noise
-            value = int(random.uniform(-1, 1) * volume * 32767.0)
-            data.append(struct.pack('<h', value))
-            
-        wav_file.writeframes(b''.join(data))
+from src.config import TONE_PLANS, DEFAULT_TONE_PLAN
+from src.tone_synth import ToneSynth, SOUNDS
 
-def generate_click(filename, duration=0.05, volume=0.8, rate=44100):
-    print(f"Generating {filename} (Click)...")
+# The phone synthesizes these sounds live (src/tone_synth.py); the wav files are
+# only a fallback/preview. Same generator, so a file sounds exactly like the live tone.
+
+def write_wav(filename, samples, rate):
     with wave.open(filename, 'w') as wav_file:
         wav_file.setnchannels(1)
         wav_file.setsampwidth(2)
         wav_file.setframerate(rate)
-        
-        data = []
-        # Short burst
-        for i in range(int(rate * duration)):
-            if i < 100: # intense start
-                value = int(volume * 32767.0)
-            else:
-                value = 0
-            data.append(struct.pack('<h', value))
-        wav_file.writeframes(b''.join(data))
+        wav_file.writeframes(samples.astype("<i2").tobytes())
 
 def main():
-    sounds_dir = "sounds"
-    if not os.path.exists(sounds_dir):
-        os.makedirs(sounds_dir)
-    
-    # Generate Files
-    # 425Hz Interrupted (0.5s ON, 0.5s OFF) for 10 seconds
-    generate_tone(os.path.join(sounds_dir, "dial_tone.wav"), frequency=425, duration=10.0, interrupted=True) 
-    generate_static(os.path.join(sounds_dir, "static_short.wav"), duration=0.5)
-    generate_static(os.path.join(sounds_dir, "static_long.wav"), duration=2.0)
-    generate_click(os.path.join(sounds_dir, "click.wav"))
-    
+    parser = argparse.ArgumentParser(description="Render the handset sounds (dial/busy/ringback tones, static, click) to wav.")
+    parser.add_argument("--plan", default=DEFAULT_TONE_PLAN, choices=sorted(TONE_PLANS), help="National tone plan")
+    parser.add_argument("--rate", type=int, default=44100)
+    parser.add_argument("--out", default="sounds", help="Output directory")
+    parser.add_argument("--duration", type=float, help="Override every sound's length (seconds)")
+    parser.add_argument("--all", action="store_true", help="Also write busy_tone and ringback")
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    synth = ToneSynth(args.rate, args.plan)
+    for name in SOUNDS:
+        if name in ("busy_tone", "ringback") and not args.all:
+            continue
+        start = time.perf_counter()
+        samples = synth.render(name, args.duration)
+        elapsed = time.perf_counter() - start
+        write_wav(os.path.join(args.out, name + ".wav"), samples, args.rate)
+        print(f"Generated {name}.wav ({len(samples) / args.rate:.2f}s, {args.plan}) in {elapsed * 1000:.1f} ms")
+
     print("Done generating sounds.")
 
 if __name__ == "__main__":